@@ -5,9 +5,10 @@ import PyPDF2
 import json
 
 class CVParser:
-    def __init__(self):
+    def __init__(self, client=None):
         load_dotenv()
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        # Reuse an injected (pooled) client when embedded in the secretary app
+        self.client = client if client is not None else OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
         self.cv_data = {}
 
     def parse_cv(self, file_path):
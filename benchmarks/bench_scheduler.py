@@ -0,0 +1,284 @@
+"""Scaling micro-benchmarks for the Scheduler's calendar scans.
+
+Generates seeded synthetic calendars (meetings between a pool of participants over a year) from 10^2
+to 10^6 entries and times the Scheduler methods that walk brain.calendar:
+
+  - conflict_check    _check_time_with_attendees() for random participants and slots (per query)
+  - local_transform   get_upcoming_meetings() on local meetings: ISO parsing, GCal-shaped dicts, past filter
+  - merge_sort        get_upcoming_meetings() on Google events: de-duplication and the start-time sort
+  - date_filter       _get_local_meetings_on_date() for a random day
+
+For each operation it reports the time per call at every size and the fitted scaling exponent k in
+t ~ n^k (1 = linear scan), so index or vectorization work in the scheduler can be measured against it:
+
+    python -m benchmarks.bench_scheduler
+    python -m benchmarks.bench_scheduler --sizes 100,1000,10000 --participants 50 --ops conflict_check
+
+Logging is silenced while timing (pass --with-logging to include it); the 10^6 calendar needs a few GB.
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import math
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from secretary.scheduler import Scheduler
+from secretary.utilities.calendar_index import IndexedCalendar
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def generate_calendar(size: int, participants: int = 200, days: int = 365, seed: int = 0,
+                      start: datetime = None) -> list:
+    """
+    Build local calendar entries shaped like the ones the Scheduler stores in brain.calendar.
+
+    Args:
+        size (int): Number of meetings.
+        participants (int): Size of the participant pool (user000, user001, ...).
+        days (int): Span of the calendar; one month of it lies in the past.
+        seed (int): Random seed.
+        start (datetime, optional): First day (default: 30 days ago, midnight).
+
+    Returns:
+        list: Meeting dicts with ISO start_time/end_time strings.
+    """
+    rng = random.Random(seed)
+    start = start or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=30)
+    people = [f"user{i:03d}" for i in range(participants)]
+    calendar = []
+    for i in range(size):
+        begin = start + timedelta(days=rng.randrange(days), hours=rng.randint(8, 17), minutes=15 * rng.randrange(4))
+        end = begin + timedelta(minutes=rng.choice((15, 30, 45, 60, 90, 120)))
+        calendar.append({
+            "meeting_id": f"meeting_{i}",
+            "event_id": f"evt{i:07d}",
+            "project_id": f"project{i % 50}",
+            "title": f"Sync {i}",
+            "meeting_info": f"Sync {i}",
+            "participants": rng.sample(people, rng.randint(2, min(5, len(people)))),
+            "start_time": begin.isoformat(),
+            "end_time": end.isoformat(),
+        })
+    return calendar
+
+
+def to_google_events(calendar: list) -> list:
+    """The same meetings shaped like Google Calendar events."""
+    return [{
+        "id": m["event_id"],
+        "summary": m["title"],
+        "start": {"dateTime": m["start_time"] + "+00:00"},
+        "end": {"dateTime": m["end_time"] + "+00:00"},
+        "attendees": [{"email": f"{p}@example.com"} for p in m["participants"]],
+    } for m in calendar]
+
+
+class _Brain:
+    def __init__(self, calendar):
+        # Like Brain.calendar; indexing happens here, outside the timed calls
+        self.calendar = IndexedCalendar(calendar)
+
+
+class _EventsList:
+    def __init__(self, items):
+        self._result = {"items": items}
+
+    def execute(self):
+        return self._result
+
+
+class _CalendarService:
+    """Returns a fixed event list, without copying it, for every events().list()."""
+
+    def __init__(self, items):
+        self._items = items
+
+    def events(self):
+        return self
+
+    def list(self, **kwargs):
+        return _EventsList(self._items)
+
+
+def make_scheduler(calendar: list, google_events: list = None) -> Scheduler:
+    """A Scheduler with no network whose brain holds `calendar` (and optionally a fake Google calendar)."""
+    service = _CalendarService(google_events) if google_events is not None else None
+    return Scheduler(node_id="bench", calendar_service=service, network=None, brain=_Brain(calendar))
+
+
+def _conflict_check(calendar, rng, participants):
+    scheduler = make_scheduler(calendar)
+    people = [f"user{i:03d}" for i in range(participants)]
+    first = datetime.fromisoformat(min(calendar, key=lambda m: m["start_time"])["start_time"]) if calendar else datetime.now()
+    queries = []
+    for _ in range(20):
+        begin = first + timedelta(days=rng.randrange(365), hours=rng.randint(8, 17))
+        queries.append((rng.choice(people), begin, begin + timedelta(minutes=30)))
+
+    def run():
+        for participant, begin, end in queries:
+            scheduler._check_time_with_attendees(participant, begin, end)
+    return run, len(queries)
+
+
+def _local_transform(calendar, rng, participants):
+    scheduler = make_scheduler(calendar)
+    return scheduler.get_upcoming_meetings, 1
+
+
+def _merge_sort(calendar, rng, participants):
+    scheduler = make_scheduler([], google_events=to_google_events(calendar))
+    return scheduler.get_upcoming_meetings, 1
+
+
+def _date_filter(calendar, rng, participants):
+    scheduler = make_scheduler(calendar)
+    day = rng.choice(calendar)["start_time"][:10] if calendar else datetime.now().strftime("%Y-%m-%d")
+    return (lambda: scheduler._get_local_meetings_on_date(day)), 1
+
+
+# name -> setup(calendar, rng, participants) returning (callable, operations per call)
+OPERATIONS = {
+    "conflict_check": _conflict_check,
+    "local_transform": _local_transform,
+    "merge_sort": _merge_sort,
+    "date_filter": _date_filter,
+}
+
+
+def time_call(fn, per_call: int = 1, min_time: float = 0.2, max_repeats: int = 50) -> float:
+    """
+    Best time per operation over repeated calls, repeating until min_time has elapsed.
+
+    Args:
+        fn (Callable): Zero-argument function to time.
+        per_call (int): Operations performed by one call of fn.
+        min_time (float): Total time budget in seconds (at least one call is made).
+        max_repeats (int): Upper bound on calls.
+
+    Returns:
+        float: Seconds per operation (minimum over repeats).
+    """
+    best = math.inf
+    spent = 0.0
+    repeats = 0
+    while repeats < max_repeats and (repeats == 0 or spent < min_time):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        repeats += 1
+    return best / per_call
+
+
+def fit_exponent(points: list) -> float:
+    """
+    Least-squares slope of log(t) against log(n).
+
+    Args:
+        points (list): (n, seconds) pairs.
+
+    Returns:
+        float: The exponent k in t ~ n^k (0.0 with fewer than two usable points).
+    """
+    logs = [(math.log(n), math.log(t)) for n, t in points if n > 0 and t > 0]
+    if len(logs) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    var = sum((x - mean_x) ** 2 for x, _ in logs)
+    if var == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in logs) / var
+
+
+@contextlib.contextmanager
+def _quiet(enabled: bool):
+    """Silence the AgentAI logger and stdout (the scheduler prints per match)."""
+    if not enabled:
+        yield
+        return
+    logger = logging.getLogger("AgentAI")
+    level = logger.level
+    logger.setLevel(logging.CRITICAL)
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        logger.setLevel(level)
+
+
+def run(sizes=DEFAULT_SIZES, ops=None, participants: int = 200, seed: int = 0, min_time: float = 0.2,
+        quiet: bool = True, progress=None) -> dict:
+    """
+    Time every operation at every calendar size.
+
+    Returns:
+        dict: {"config", "results": {op: {"points": [{"n", "seconds", "us_per_item"}], "exponent"}}}.
+    """
+    ops = list(ops or OPERATIONS)
+    results = {op: {"points": []} for op in ops}
+    for size in sizes:
+        calendar = generate_calendar(size, participants=participants, seed=seed)
+        for op in ops:
+            rng = random.Random(seed)
+            with _quiet(quiet):
+                fn, per_call = OPERATIONS[op](calendar, rng, participants)
+                seconds = time_call(fn, per_call, min_time=min_time)
+            results[op]["points"].append({"n": size, "seconds": seconds, "us_per_item": seconds / size * 1e6})
+            if progress:
+                progress(op, size, seconds)
+        del calendar
+    for op in ops:
+        results[op]["exponent"] = round(fit_exponent([(p["n"], p["seconds"]) for p in results[op]["points"]]), 3)
+    return {
+        "config": {"sizes": list(sizes), "participants": participants, "seed": seed, "min_time": min_time,
+                   "logging": not quiet},
+        "results": results,
+    }
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Scaling curves of the Scheduler's calendar scans.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated calendar sizes")
+    parser.add_argument("--ops", default=",".join(OPERATIONS), help="Comma-separated operations")
+    parser.add_argument("--participants", type=int, default=200)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Time budget per measurement (s)")
+    parser.add_argument("--with-logging", action="store_true", help="Keep scheduler logging while timing")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="JSON output path (default benchmarks/results/...)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(float(s)) for s in args.sizes.split(",") if s]
+    ops = [o for o in args.ops.split(",") if o]
+    unknown = set(ops) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"unknown operations: {', '.join(sorted(unknown))}")
+
+    report = run(sizes, ops, participants=args.participants, seed=args.seed, min_time=args.min_time,
+                 quiet=not args.with_logging,
+                 progress=lambda op, n, s: print(f"  {op:<16} n={n:<9} {s * 1e3:>12.3f} ms"))
+    out = args.out or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "results",
+        f"scheduler_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for op, data in report["results"].items():
+        curve = "  ".join(f"{p['n']}: {p['seconds'] * 1e3:.3f} ms" for p in data["points"])
+        print(f"{op:<16} t ~ n^{data['exponent']:<6} {curve}")
+    print(f"Report written to {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,363 @@
+"""End-to-end benchmark of POST /send_message.
+
+Boots the Flask app from main.py against the offline OpenAI fake (benchmarks/fake_openai.py) and the
+in-memory Google services (benchmarks/fake_google.py), replays a seeded mix of messages over HTTP and
+reports throughput, latency percentiles and a per-stage breakdown as JSON:
+
+    python -m benchmarks.bench_send_message --requests 300 --concurrency 4 --llm-latency lognormal:0.4,0.3
+
+Message mix: quick commands, calendar scheduling, email search, project planning and free chat.
+Requests to the same node are serialized (one conversation at a time, like the UI), and the node's
+multi-turn state is reset before each request so every sample takes the same path.
+
+Stage times are inclusive: "llm" time spent inside "chat" is counted in both.
+"""
+
+import argparse
+import contextvars
+import functools
+import json
+import logging
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from werkzeug.serving import make_server
+
+from benchmarks.fake_openai import FakeOpenAI, create_app as create_fake_openai
+from benchmarks.fake_google import fake_calendar_service, fake_gmail_service
+
+CATEGORIES = {
+    "quick_command": ["tasks", "list tasks", "show tasks"],
+    "calendar": [
+        "Schedule a meeting with {other} tomorrow at {hour}:00 for 30 minutes about {topic}",
+        "Schedule a call with {other} on Friday at {hour}:30 to discuss {topic}",
+    ],
+    "email_search": [
+        "Show my unread emails from {other}",
+        "Search my inbox for emails about {topic}",
+    ],
+    "planning": ["plan bench-{n} = {objective}"],
+    "chat": [
+        "What are good practices for {topic}?",
+        "Can you explain how to prioritise {topic} this quarter?",
+    ],
+}
+DEFAULT_MIX = {"quick_command": 0.15, "calendar": 0.25, "email_search": 0.2, "planning": 0.1, "chat": 0.3}
+TOPICS = ["the budget review", "onboarding", "the product launch", "hiring", "the customer survey"]
+OBJECTIVES = ["Launch a customer feedback portal", "Migrate reporting to the new data warehouse",
+              "Organise the annual offsite"]
+
+# Canned routing answers so calendar / email messages take their real code paths
+ROUTE_RULES = [
+    (r"Schedule a (meeting|call)", {
+        "calendar": {"is_calendar_command": True, "action": "schedule_meeting", "missing_info": []},
+        "email": {"action": "none", "criteria": {}, "summary_type": "concise"},
+        "send_email": {"is_send_email": False, "recipient": "", "subject": "", "body": ""},
+    }, "message_route"),
+    (r"unread emails|Search my inbox", {
+        "calendar": {"is_calendar_command": False, "action": None, "missing_info": []},
+        "email": {"action": "search", "criteria": {"keywords": ["update"], "max_results": 5}, "summary_type": "concise"},
+        "send_email": {"is_send_email": False, "recipient": "", "subject": "", "body": ""},
+    }, "message_route"),
+]
+
+# Methods timed as pipeline stages: stage -> (module, class, method)
+STAGES = {
+    "quick_command": ("secretary.communication", "Communication", "_handle_quick_command"),
+    "preclassify": ("secretary.utilities.intent_classifier", "IntentClassifier", "should_skip_router"),
+    "route": ("secretary.brain", "Brain", "route_message"),
+    "calendar": ("secretary.scheduler", "Scheduler", "handle_calendar"),
+    "email": ("secretary.brain", "Brain", "process_advanced_email_command"),
+    "planning": ("secretary.brain", "Brain", "initiate_project_planning"),
+    "chat": ("secretary.communication", "Communication", "_chat_with_llm"),
+    "llm": ("secretary.brain", "LLMClient", "complete"),
+    "llm_stream": ("secretary.brain", "Brain", "_stream_to_room"),
+}
+
+_stage_times: contextvars.ContextVar = contextvars.ContextVar("bench_stage_times", default=None)
+
+
+def add_stage_time(stage: str, seconds: float):
+    """Add time to the current request's stage totals (no-op outside a benchmarked request)."""
+    times = _stage_times.get()
+    if times is not None:
+        times[stage] = times.get(stage, 0.0) + seconds
+
+
+def instrument_stages():
+    """Wrap the STAGES methods with timers."""
+    import importlib
+
+    def timer(stage, original):
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                add_stage_time(stage, time.perf_counter() - start)
+        return timed
+
+    for stage, (module_name, class_name, method_name) in STAGES.items():
+        cls = getattr(importlib.import_module(module_name), class_name)
+        setattr(cls, method_name, timer(stage, getattr(cls, method_name)))
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a list (0.0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(values: list) -> dict:
+    """Count, mean and p50/p95/p99/max of latencies, in milliseconds."""
+    return {
+        "count": len(values),
+        "mean_ms": round(1000 * sum(values) / len(values), 3) if values else 0.0,
+        "p50_ms": round(1000 * percentile(values, 50), 3),
+        "p95_ms": round(1000 * percentile(values, 95), 3),
+        "p99_ms": round(1000 * percentile(values, 99), 3),
+        "max_ms": round(1000 * max(values), 3) if values else 0.0,
+    }
+
+
+def build_workload(n: int, node_ids: list, mix: dict, seed: int) -> list:
+    """
+    Generate the replayed messages.
+
+    Returns:
+        list: (category, node_id, message) tuples.
+    """
+    rng = random.Random(seed)
+    categories = list(mix)
+    weights = [mix[c] for c in categories]
+    workload = []
+    for i in range(n):
+        category = rng.choices(categories, weights)[0]
+        node_id = rng.choice(node_ids)
+        template = rng.choice(CATEGORIES[category])
+        message = template.format(
+            other=rng.choice([x for x in node_ids if x != node_id] or node_ids),
+            hour=rng.randint(9, 16),
+            topic=rng.choice(TOPICS),
+            objective=rng.choice(OBJECTIVES),
+            n=i,
+        )
+        workload.append((category, node_id, message))
+    return workload
+
+
+def start_server(app) -> tuple:
+    """Serve a WSGI app on a free local port in a daemon thread; returns (server, base_url)."""
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def boot_app(args):
+    """
+    Import main.py wired to the fakes and register one node per configured agent.
+
+    Returns:
+        tuple: (main module, google services per node)
+    """
+    fake = FakeOpenAI(latency=args.llm_latency, token_latency=args.token_latency, rules=ROUTE_RULES, seed=args.seed)
+    _, fake_url = start_server(create_fake_openai(fake))
+
+    os.environ["OPENAI_API_KEY"] = "fake-key"
+    os.environ["OPENAI_BASE_URL"] = f"{fake_url}/v1"
+    # The fake has no rate limits; keep the dispatcher from becoming the bottleneck unless asked to
+    os.environ.setdefault("OPENAI_RPM", "1000000")
+    os.environ.setdefault("OPENAI_TPM", "1000000000")
+    if args.no_cache:
+        os.environ["LLM_CACHE_TTL"] = "0"
+
+    import main
+    from config.agents import AGENT_CONFIG
+    from network.internal_communication import Intercom
+
+    services = {}
+
+    def google_services(node_id=None):
+        calendar = fake_calendar_service(args.google_latency, seed=args.seed)
+        gmail = fake_gmail_service(args.google_latency, seed=args.seed)
+        for service in (calendar, gmail):
+            service.on_execute = lambda method, seconds: add_stage_time("google", seconds)
+        services[node_id] = {"calendar": calendar, "gmail": gmail}
+        return services[node_id]
+
+    main.initialize_google_services = google_services
+    main.network = Intercom(log_file=os.path.join(tempfile.mkdtemp(), "communication_log.txt"))
+    for agent in AGENT_CONFIG[: args.nodes]:
+        node = main.LLMNode(node_id=agent["id"], node_name=agent["name"], knowledge=agent["knowledge"],
+                            network=main.network, llm_api_key_override="fake-key")
+        main.network.register_node(node.node_id, node)
+
+    instrument_stages()
+    results = {}
+
+    @main.app.before_request
+    def start_stage_timer():
+        _stage_times.set({})
+
+    @main.app.after_request
+    def collect_stage_times(response):
+        bench_id = main.flask_request.headers.get("X-Bench-Id")
+        if bench_id:
+            results[bench_id] = _stage_times.get() or {}
+        return response
+
+    main.app.config["bench_stage_results"] = results
+    return main, services
+
+
+def reset_node(node):
+    """Drop multi-turn state so every request starts from the same place."""
+    brain = node.brain
+    brain.confirmation_context['active'] = False
+    brain.meeting_context['active'] = False
+    if hasattr(brain, 'email_context'):
+        brain.email_context['active'] = False
+
+
+def run(args) -> dict:
+    """Run the benchmark and return the report."""
+    main, _ = boot_app(args)
+    _, base_url = start_server(main.app)
+    stage_results = main.app.config["bench_stage_results"]
+
+    node_ids = list(main.network.nodes)
+    workload = build_workload(args.requests, node_ids, args.mix, args.seed)
+    node_locks = {node_id: threading.Lock() for node_id in node_ids}
+    samples = []
+    samples_lock = threading.Lock()
+
+    def send(index, category, node_id, message):
+        body = json.dumps({"node_id": node_id, "message": message, "sender_id": node_id}).encode("utf-8")
+        req = urllib.request.Request(f"{base_url}/send_message", data=body, method="POST", headers={
+            "Content-Type": "application/json", "X-Bench-Id": str(index)})
+        with node_locks[node_id]:
+            reset_node(main.network.nodes[node_id])
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(req, timeout=args.timeout) as resp:
+                    resp.read()
+                    ok = resp.status == 200
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - start
+        with samples_lock:
+            samples.append({"category": category, "latency": elapsed, "ok": ok,
+                            "stages": stage_results.pop(str(index), {})})
+
+    # Warm-up (not measured): first requests pay for imports, connection setup, etc.
+    for i, (category, node_id, message) in enumerate(workload[: args.warmup]):
+        send(f"warmup-{i}", category, node_id, message)
+    samples.clear()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for i, item in enumerate(workload):
+            pool.submit(send, i, *item)
+    wall = time.perf_counter() - started
+
+    latencies = [s["latency"] for s in samples]
+    report = {
+        "meta": {
+            "benchmark": "send_message",
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "config": {k: v for k, v in vars(args).items() if k != "out"},
+        },
+        "overall": {
+            **summarize(latencies),
+            "errors": sum(1 for s in samples if not s["ok"]),
+            "wall_s": round(wall, 3),
+            "throughput_rps": round(len(samples) / wall, 3) if wall else 0.0,
+        },
+        "by_category": {},
+        "stages": {},
+    }
+    for category in sorted({s["category"] for s in samples}):
+        subset = [s for s in samples if s["category"] == category]
+        stages = {}
+        for stage in sorted({name for s in subset for name in s["stages"]}):
+            stages[stage] = summarize([s["stages"][stage] for s in subset if stage in s["stages"]])
+        report["by_category"][category] = {
+            **summarize([s["latency"] for s in subset]),
+            "errors": sum(1 for s in subset if not s["ok"]),
+            "stages": stages,
+        }
+    for stage in sorted({name for s in samples for name in s["stages"]}):
+        report["stages"][stage] = summarize([s["stages"][stage] for s in samples if stage in s["stages"]])
+    return report
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return ""
+
+
+def parse_mix(spec: str) -> dict:
+    """Parse "chat=0.5,calendar=0.5" into weights (unknown categories are rejected)."""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in CATEGORIES:
+            raise argparse.ArgumentTypeError(f"Unknown category: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a synthetic message mix through /send_message.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--nodes", type=int, default=5, help="Number of agents from AGENT_CONFIG to boot")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="e.g. chat=0.5,calendar=0.5")
+    parser.add_argument("--llm-latency", default="lognormal:0.3,0.3")
+    parser.add_argument("--token-latency", type=float, default=0.0)
+    parser.add_argument("--google-latency", default="lognormal:0.08,0.3")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the LLM response cache")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="JSON output path (default benchmarks/results/...)")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # no access log line per request
+    report = run(args)
+    out = args.out or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "results",
+        f"send_message_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    overall = report["overall"]
+    print(f"{overall['count']} requests, {overall['errors']} errors, {overall['throughput_rps']} req/s, "
+          f"p50 {overall['p50_ms']} ms, p95 {overall['p95_ms']} ms, p99 {overall['p99_ms']} ms")
+    for category, stats in report["by_category"].items():
+        print(f"  {category:<14} p50 {stats['p50_ms']:>9} ms  p95 {stats['p95_ms']:>9} ms  (n={stats['count']})")
+    print(f"Report written to {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main_cli()
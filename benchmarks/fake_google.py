@@ -0,0 +1,146 @@
+"""In-memory stand-ins for the Google Calendar and Gmail discovery clients.
+
+They accept the same call chains as googleapiclient (``service.events().list(...).execute()``,
+``service.users().messages().get(...).execute()``, ...) and answer from a small in-memory store
+after an optional latency, so benchmarks can run the real Scheduler/Brain code paths offline.
+"""
+
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from benchmarks.fake_openai import LatencyModel
+
+
+class _Request:
+    """A pending API call; execute() runs it (http= is accepted and ignored)."""
+
+    def __init__(self, service: "FakeGoogleService", method: str, kwargs: dict):
+        self._service = service
+        self._method = method
+        self._kwargs = kwargs
+
+    def execute(self, http=None, num_retries=0):
+        return self._service._execute(self._method, self._kwargs)
+
+
+class _Resource:
+    """Collects the resource path (e.g. users.messages) until a method is called."""
+
+    def __init__(self, service: "FakeGoogleService", path: str):
+        self._service = service
+        self._path = path
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        path = f"{self._path}.{name}" if self._path else name
+
+        def call(**kwargs):
+            if path in self._service.handlers:
+                return _Request(self._service, path, kwargs)
+            return _Resource(self._service, path)
+        return call
+
+
+class FakeGoogleService(_Resource):
+    """
+    Generic fake service. Calls whose path is not in `handlers` return an empty dict.
+
+    Attributes:
+        name (str): "calendar" or "gmail".
+        calls (Dict[str, int]): Number of executed calls per method path.
+    """
+
+    def __init__(self, name: str, handlers: Dict[str, Callable[[dict], dict]], latency: str = "fixed:0", seed: int = 0):
+        super().__init__(self, "")
+        self.name = name
+        self.handlers = handlers
+        self.latency = LatencyModel(latency, seed)
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.on_execute: Optional[Callable[[str, float], None]] = None  # hook(method, seconds) for timing
+
+    def _execute(self, method: str, kwargs: dict):
+        start = time.perf_counter()
+        time.sleep(self.latency.sample())
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            result = self.handlers[method](kwargs)
+        if self.on_execute:
+            self.on_execute(f"{self.name}.{method}", time.perf_counter() - start)
+        return result
+
+
+def fake_calendar_service(latency: str = "fixed:0", seed: int = 0) -> FakeGoogleService:
+    """Calendar service backed by an in-memory event dict."""
+    events: Dict[str, dict] = {}
+
+    def insert(kwargs):
+        event = dict(kwargs.get("body", {}))
+        event["id"] = event.get("id") or uuid.uuid4().hex[:16]
+        event["htmlLink"] = f"https://calendar.example/{event['id']}"
+        events[event["id"]] = event
+        return event
+
+    def list_events(kwargs):
+        items = sorted(events.values(), key=lambda e: e.get("start", {}).get("dateTime", ""))
+        return {"items": items[: kwargs.get("maxResults", 250)]}
+
+    def get(kwargs):
+        return events.get(kwargs.get("eventId"), {})
+
+    def update(kwargs):
+        event = dict(kwargs.get("body", {}))
+        event["id"] = kwargs.get("eventId")
+        events[event["id"]] = event
+        return event
+
+    def delete(kwargs):
+        events.pop(kwargs.get("eventId"), None)
+        return {}
+
+    def freebusy(kwargs):
+        return {"calendars": {item["id"]: {"busy": []} for item in kwargs.get("body", {}).get("items", [])}}
+
+    return FakeGoogleService("calendar", {
+        "events.insert": insert,
+        "events.list": list_events,
+        "events.get": get,
+        "events.update": update,
+        "events.delete": delete,
+        "freebusy.query": freebusy,
+    }, latency, seed)
+
+
+def fake_gmail_service(latency: str = "fixed:0", seed: int = 0, inbox_size: int = 5) -> FakeGoogleService:
+    """Gmail service with a fixed synthetic inbox."""
+    now = datetime.now()
+    inbox = {
+        f"msg{i}": {
+            "id": f"msg{i}",
+            "snippet": f"Status update {i} about the quarterly plan",
+            "labelIds": ["INBOX", "UNREAD"] if i % 2 else ["INBOX"],
+            "payload": {
+                "headers": [
+                    {"name": "Subject", "value": f"Update {i}"},
+                    {"name": "From", "value": f"colleague{i}@example.com"},
+                    {"name": "Date", "value": (now - timedelta(hours=i)).strftime("%a, %d %b %Y %H:%M:%S")},
+                ],
+                "mimeType": "text/plain",
+                "body": {"data": ""},
+            },
+        }
+        for i in range(inbox_size)
+    }
+
+    return FakeGoogleService("gmail", {
+        "users.messages.list": lambda kwargs: {
+            "messages": [{"id": m} for m in list(inbox)[: kwargs.get("maxResults", 10)]]
+        },
+        "users.messages.get": lambda kwargs: inbox.get(kwargs.get("id"), {}),
+        "users.messages.send": lambda kwargs: {"id": uuid.uuid4().hex[:16]},
+        "users.labels.list": lambda kwargs: {"labels": [{"id": "INBOX", "name": "INBOX"}, {"id": "UNREAD", "name": "UNREAD"}]},
+    }, latency, seed)
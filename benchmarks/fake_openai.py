@@ -0,0 +1,302 @@
+"""Offline stand-in for the subset of the OpenAI API this project uses.
+
+Serves deterministic answers with a configurable latency so the secretary pipeline can be load
+tested without paying for completions:
+  - POST /v1/chat/completions   plain text, tools/tool_choice, response_format json_object/json_schema, stream
+  - POST /v1/audio/transcriptions
+  - POST /v1/audio/speech
+  - GET  /v1/models
+  - GET  /_fake/stats           request counters of this server
+
+Point the app at it with OPENAI_BASE_URL (picked up by the client registry, the module-level
+openai client used by Brain and the OpenAI() client in CVParser):
+
+    python -m benchmarks.fake_openai --port 8010 --latency lognormal:0.6,0.35
+    OPENAI_BASE_URL=http://127.0.0.1:8010/v1 OPENAI_API_KEY=fake python main.py
+
+Latency specs (seconds): fixed:X, uniform:LOW,HIGH, normal:MEAN,STD, lognormal:MEDIAN,SIGMA.
+Custom canned answers can be given with --responses rules.json, a list of
+{"match": "<regex on the last user message>", "response": <text or JSON object>, "schema": "<name>"}.
+Rules with a "schema" only answer json_schema requests of that schema name; the others answer
+plain and json_object requests.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from flask import Flask, Response, jsonify, request
+
+
+class LatencyModel:
+    """
+    Seeded latency distribution parsed from a spec string.
+
+    Attributes:
+        spec (str): The spec, e.g. "lognormal:0.6,0.35".
+    """
+
+    def __init__(self, spec: str = "fixed:0", seed: int = 0):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p]
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        """Draw one latency in seconds (never negative)."""
+        with self._lock:
+            if self.kind == "fixed":
+                value = self.params[0] if self.params else 0.0
+            elif self.kind == "uniform":
+                value = self._rng.uniform(self.params[0], self.params[1])
+            elif self.kind == "normal":
+                value = self._rng.gauss(self.params[0], self.params[1])
+            else:
+                median, sigma = self.params
+                value = self._rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        return max(0.0, value)
+
+
+def _stable_int(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _fill_schema(schema: dict, name: str, context: str):
+    """
+    Build a deterministic value that satisfies a JSON schema.
+
+    Enums prefer null / "none" so the fake never triggers side effects (emails, meetings) by accident.
+    """
+    if "enum" in schema:
+        options = schema["enum"]
+        if None in options:
+            return None
+        if "none" in options:
+            return "none"
+        return options[_stable_int(context + name) % len(options)] if name in ("assigned_to", "priority") else options[0]
+
+    kind = schema.get("type", "string")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+
+    if kind == "object":
+        props = schema.get("properties", {})
+        keys = schema.get("required") or list(props)
+        return {key: _fill_schema(props.get(key, {}), key, context) for key in keys}
+    if kind == "array":
+        item = _fill_schema(schema.get("items", {}), name.rstrip("s"), context)
+        return [item] if name in ("participants", "steps", "keywords") else []
+    if kind == "boolean":
+        return False
+    if kind == "integer":
+        return 1 + _stable_int(context + name) % 5
+    if kind == "number":
+        return float(1 + _stable_int(context + name) % 5)
+    if kind == "null":
+        return None
+    if "date" in name:
+        return (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+    return f"{name.replace('_', ' ')} {_stable_int(context + name) % 1000}"
+
+
+# Rule-based answers for the prompts that expect JSON inside plain text / json_object responses
+DEFAULT_RULES = [
+    (r"calendar-related command", {"is_calendar_command": False, "action": None, "missing_info": []}),
+    (r"requesting to send an email", {"is_send_email": False, "recipient": "", "subject": "", "body": ""}),
+    (r"email-related command", {"action": "none", "criteria": {}, "summary_type": "concise"}),
+    (r"extract (complete )?meeting details", {"title": "Sync", "participants": [], "date": "", "time": "", "duration": 30}),
+]
+
+
+class FakeOpenAI:
+    """
+    Deterministic responder behind the Flask routes.
+
+    Attributes:
+        latency (LatencyModel): Time to first byte for chat completions.
+        token_latency (float): Delay between streamed chunks.
+        audio_latency (LatencyModel): Latency of the audio endpoints.
+    """
+
+    def __init__(self, latency: str = "fixed:0", token_latency: float = 0.0, audio_latency: str = "fixed:0",
+                 rules: list = None, seed: int = 0):
+        self.latency = LatencyModel(latency, seed)
+        self.audio_latency = LatencyModel(audio_latency, seed + 1)
+        self.token_latency = token_latency
+        # (regex, answer, schema name or None)
+        self.rules = [(re.compile(rule[0], re.IGNORECASE), rule[1], rule[2] if len(rule) > 2 else None)
+                      for rule in (rules or [])]
+        self.rules += [(re.compile(pattern, re.IGNORECASE), answer, None) for pattern, answer in DEFAULT_RULES]
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def _count(self, endpoint: str):
+        with self._lock:
+            self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+
+    def _rule_answer(self, text: str, schema_name: str = None):
+        for pattern, answer, rule_schema in self.rules:
+            if rule_schema == schema_name and pattern.search(text):
+                return answer
+        return None
+
+    def chat(self, body: dict) -> dict:
+        """Build a chat.completion object for a request body."""
+        self._count("chat.completions")
+        messages = body.get("messages", [])
+        last_user = next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+        if not isinstance(last_user, str):
+            last_user = json.dumps(last_user)
+        prompt = "\n".join(str(m.get("content") or "") for m in messages)
+
+        message = {"role": "assistant", "content": None}
+        finish_reason = "stop"
+        tools = body.get("tools") or []
+        response_format = body.get("response_format") or {}
+
+        if tools and body.get("tool_choice") != "none":
+            choice = body.get("tool_choice")
+            wanted = choice.get("function", {}).get("name") if isinstance(choice, dict) else None
+            tool = next((t for t in tools if t.get("function", {}).get("name") == wanted), tools[0])
+            function = tool["function"]
+            arguments = _fill_schema(function.get("parameters", {}), function["name"], last_user)
+            message["tool_calls"] = [{
+                "id": f"call_{_stable_int(prompt) % 10**8}",
+                "type": "function",
+                "function": {"name": function["name"], "arguments": json.dumps(arguments)},
+            }]
+            finish_reason = "tool_calls"
+        elif response_format.get("type") == "json_schema":
+            json_schema = response_format.get("json_schema", {})
+            answer = self._rule_answer(last_user, json_schema.get("name"))
+            if answer is None:
+                answer = _fill_schema(json_schema.get("schema", {}), "root", last_user)
+            message["content"] = json.dumps(answer)
+        else:
+            answer = self._rule_answer(last_user)
+            if answer is None:
+                answer = {} if response_format.get("type") == "json_object" else f"Fake answer to: {last_user[:80]}"
+            message["content"] = answer if isinstance(answer, str) else json.dumps(answer)
+
+        prompt_tokens = len(prompt) // 4 + 1
+        completion_tokens = len(message["content"] or json.dumps(message.get("tool_calls"))) // 4 + 1
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake-model"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason, "logprobs": None}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def stream_chunks(self, completion: dict):
+        """Yield SSE lines for a completion, one word per chunk."""
+        base = {k: completion[k] for k in ("id", "created", "model")}
+        base["object"] = "chat.completion.chunk"
+        content = completion["choices"][0]["message"]["content"] or ""
+        words = re.findall(r"\S+\s*", content) or [""]
+        for i, word in enumerate(words):
+            delta = {"role": "assistant", "content": word} if i == 0 else {"content": word}
+            yield f"data: {json.dumps({**base, 'choices': [{'index': 0, 'delta': delta, 'finish_reason': None}]})}\n\n"
+            if self.token_latency:
+                time.sleep(self.token_latency)
+        yield f"data: {json.dumps({**base, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})}\n\n"
+        yield "data: [DONE]\n\n"
+
+
+def create_app(fake: FakeOpenAI = None) -> Flask:
+    """
+    Build the Flask app serving the fake API.
+
+    Args:
+        fake (FakeOpenAI, optional): Responder to use (defaults to zero latency).
+
+    Returns:
+        Flask: The app.
+    """
+    fake = fake or FakeOpenAI()
+    app = Flask(__name__)
+    app.config["fake"] = fake
+
+    @app.route("/v1/chat/completions", methods=["POST"])
+    def chat_completions():
+        body = request.get_json(force=True)
+        time.sleep(fake.latency.sample())
+        completion = fake.chat(body)
+        if body.get("stream"):
+            return Response(fake.stream_chunks(completion), mimetype="text/event-stream")
+        return jsonify(completion)
+
+    @app.route("/v1/audio/transcriptions", methods=["POST"])
+    def transcriptions():
+        fake._count("audio.transcriptions")
+        audio = request.files.get("file")
+        size = len(audio.read()) if audio else 0
+        time.sleep(fake.audio_latency.sample())
+        text = f"fake transcription of {size} bytes"
+        if request.form.get("response_format") == "text":
+            return Response(text, mimetype="text/plain")
+        return jsonify({"text": text})
+
+    @app.route("/v1/audio/speech", methods=["POST"])
+    def speech():
+        fake._count("audio.speech")
+        body = request.get_json(force=True)
+        time.sleep(fake.audio_latency.sample())
+        # Deterministic payload sized like the input; not real audio
+        payload = b"ID3" + hashlib.sha256(body.get("input", "").encode("utf-8")).digest() * 8
+        return Response(payload, mimetype="audio/mpeg")
+
+    @app.route("/v1/models", methods=["GET"])
+    def models():
+        names = ["gpt-4.1", "gpt-4o-mini", "gpt-4", "whisper-1", "tts-1"]
+        return jsonify({"object": "list", "data": [{"id": n, "object": "model", "owned_by": "fake"} for n in names]})
+
+    @app.route("/_fake/stats", methods=["GET"])
+    def stats():
+        return jsonify(fake.counts)
+
+    return app
+
+
+def load_rules(path: str) -> list:
+    """Read --responses rules: a JSON list of {"match": regex, "response": text or object, "schema": optional}."""
+    with open(path, encoding="utf-8") as f:
+        return [(rule["match"], rule["response"], rule.get("schema")) for rule in json.load(f)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline OpenAI-compatible server for load and latency tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--latency", default="fixed:0", help="Chat latency distribution, e.g. lognormal:0.6,0.35")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Delay between streamed chunks (s)")
+    parser.add_argument("--audio-latency", default="fixed:0", help="Audio endpoints latency distribution")
+    parser.add_argument("--responses", help="JSON file with canned answers")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    responder = FakeOpenAI(
+        latency=args.latency,
+        token_latency=args.token_latency,
+        audio_latency=args.audio_latency,
+        rules=load_rules(args.responses) if args.responses else None,
+        seed=args.seed,
+    )
+    print(f"Fake OpenAI API on http://{args.host}:{args.port}/v1 (latency {args.latency})")
+    create_app(responder).run(host=args.host, port=args.port, threaded=True)
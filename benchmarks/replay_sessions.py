@@ -0,0 +1,218 @@
+"""Replay recorded sessions against the current build for regression benchmarking.
+
+Sessions are recorded in production with SESSION_RECORD=1 (see secretary/utilities/session_recorder.py).
+This tool boots one node per recorded node id wired to the offline fakes and feeds every recorded turn
+back through Communication.receive_message at its original pace, compressed by --speed (1-100x). The
+OpenAI and Google responses observed in production are substituted for the real calls, after their
+recorded latency unless --no-latency; calls that can't be matched fall back to the fakes and are
+counted as misses.
+
+    python -m benchmarks.replay_sessions logs/sessions --speed 10 --concurrency 4
+
+Each node's turns run in order, as they arrived (nodes keep multi-turn state); up to --concurrency
+nodes are replayed in parallel. The report compares replayed latencies with the recorded ones and
+counts turns that started late (the build could not keep up with the compressed arrival rate) and
+replies that differ from the recorded reply.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from benchmarks.bench_send_message import _git_commit, start_server, summarize
+from benchmarks.fake_google import fake_calendar_service, fake_gmail_service
+from benchmarks.fake_openai import FakeOpenAI, create_app as create_fake_openai
+from secretary.utilities.log_sink import parse_time
+from secretary.utilities.session_recorder import load_turns, replaying
+
+
+def schedule(turns: list, speed: float = 1.0) -> dict:
+    """
+    Group turns per node with their start offsets, the original gaps divided by speed.
+
+    Args:
+        turns (list): Recorded turns, oldest first.
+        speed (float): Time compression factor (1 = real time).
+
+    Returns:
+        dict: node id -> [(offset seconds, turn)] in arrival order.
+    """
+    streams = defaultdict(list)
+    if not turns:
+        return streams
+    first = turns[0]["ts"]
+    for turn in turns:
+        streams[turn["node"]].append(((turn["ts"] - first) / speed, turn))
+    return streams
+
+
+def replay(nodes: dict, turns: list, speed: float = 1.0, concurrency: int = 4, latency: bool = True) -> dict:
+    """
+    Run recorded turns through the nodes' receive_message and measure them.
+
+    Args:
+        nodes (dict): node id -> object with receive_message(message, sender_id).
+        turns (list): Recorded turns, oldest first.
+        speed (float): Arrival time compression (1 = real time).
+        concurrency (int): Nodes replayed in parallel.
+        latency (bool): Wait for each substituted call's recorded duration.
+
+    Returns:
+        dict: {"samples": [...], "wall_s": float}; a sample has node, latency, recorded, lag, hits,
+            misses, ok and same_reply.
+    """
+    samples = []
+    samples_lock = threading.Lock()
+    started = time.perf_counter()
+
+    def run_stream(node_id, stream):
+        node = nodes.get(node_id)
+        for offset, turn in stream:
+            lag = max(0.0, time.perf_counter() - started - offset)
+            time.sleep(max(0.0, offset - (time.perf_counter() - started)))
+            with replaying(turn.get("calls", []), latency=latency) as source:
+                start = time.perf_counter()
+                try:
+                    reply = node.receive_message(turn["message"], turn["sender"])
+                    ok = True
+                except Exception:
+                    reply, ok = None, False
+                elapsed = time.perf_counter() - start
+            with samples_lock:
+                samples.append({
+                    "node": node_id, "latency": elapsed, "recorded": turn.get("duration", 0.0), "lag": lag,
+                    "hits": source.hits, "misses": source.misses, "ok": ok and "error" not in turn,
+                    "same_reply": reply == turn.get("response"),
+                })
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for node_id, stream in schedule(turns, speed).items():
+            pool.submit(run_stream, node_id, stream)
+    return {"samples": samples, "wall_s": time.perf_counter() - started}
+
+
+def build_report(result: dict, config: dict) -> dict:
+    """Summarize replay samples overall and per node, next to the recorded latencies."""
+    samples = result["samples"]
+    wall = result["wall_s"]
+
+    def stats(subset):
+        return {
+            **summarize([s["latency"] for s in subset]),
+            "recorded": summarize([s["recorded"] for s in subset]),
+            "errors": sum(1 for s in subset if not s["ok"]),
+            "late": sum(1 for s in subset if s["lag"] > 0.05),
+            "changed_replies": sum(1 for s in subset if not s["same_reply"]),
+            "substituted_calls": sum(s["hits"] for s in subset),
+            "missed_calls": sum(s["misses"] for s in subset),
+        }
+
+    return {
+        "meta": {
+            "benchmark": "replay_sessions",
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "config": config,
+        },
+        "overall": {
+            **stats(samples),
+            "wall_s": round(wall, 3),
+            "throughput_rps": round(len(samples) / wall, 3) if wall else 0.0,
+            "max_lag_ms": round(1000 * max((s["lag"] for s in samples), default=0.0), 3),
+        },
+        "by_node": {node: stats([s for s in samples if s["node"] == node])
+                    for node in sorted({s["node"] for s in samples})},
+    }
+
+
+def boot_nodes(node_ids: list) -> dict:
+    """
+    Import main.py wired to the fakes and create one node per recorded node id.
+
+    Unmatched OpenAI calls go to a zero-latency FakeOpenAI and Google calls to fresh in-memory services,
+    wrapped like the real ones so recorded responses can be substituted.
+
+    Returns:
+        dict: node id -> LLMNode.
+    """
+    _, fake_url = start_server(create_fake_openai(FakeOpenAI()))
+    os.environ["OPENAI_API_KEY"] = "fake-key"
+    os.environ["OPENAI_BASE_URL"] = f"{fake_url}/v1"
+    os.environ.setdefault("OPENAI_RPM", "1000000")
+    os.environ.setdefault("OPENAI_TPM", "1000000000")
+    # Replayed prompts must reach the recording, not a cache filled by earlier turns
+    os.environ.setdefault("LLM_CACHE_TTL", "0")
+    os.environ["SESSION_RECORD"] = "0"
+
+    import main
+    from config.agents import AGENT_CONFIG
+    from network.internal_communication import Intercom
+    from secretary.utilities.google import instrument_service
+
+    def google_services(node_id=None):
+        return {"calendar": instrument_service(fake_calendar_service(), "calendar", node_id),
+                "gmail": instrument_service(fake_gmail_service(), "gmail", node_id)}
+
+    main.initialize_google_services = google_services
+    main.network = Intercom(log_file=os.path.join(tempfile.mkdtemp(), "communication_log.txt"))
+    agents = {agent["id"]: agent for agent in AGENT_CONFIG}
+    for node_id in node_ids:
+        agent = agents.get(node_id, {"name": node_id, "knowledge": ""})
+        node = main.LLMNode(node_id=node_id, node_name=agent["name"], knowledge=agent["knowledge"],
+                            network=main.network, llm_api_key_override="fake-key")
+        main.network.register_node(node_id, node)
+    return dict(main.network.nodes)
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded sessions against this build.")
+    parser.add_argument("source", help="Sessions directory (e.g. logs/sessions) or a sessions .jsonl file")
+    parser.add_argument("--speed", type=float, default=1.0, help="Arrival time compression, 1-100")
+    parser.add_argument("--concurrency", type=int, default=4, help="Nodes replayed in parallel")
+    parser.add_argument("--no-latency", action="store_true", help="Answer substituted calls immediately")
+    parser.add_argument("--since", help="Only turns at or after this time (ISO, or 30m/2h/3d ago)")
+    parser.add_argument("--until", help="Only turns at or before this time (ISO, or 30m/2h/3d ago)")
+    parser.add_argument("--limit", type=int, default=None, help="Replay at most this many turns")
+    parser.add_argument("--out", default=None, help="JSON output path (default benchmarks/results/...)")
+    args = parser.parse_args(argv)
+    if not 1 <= args.speed <= 100:
+        parser.error("--speed must be between 1 and 100")
+
+    turns = load_turns(args.source, since=parse_time(args.since), until=parse_time(args.until))[: args.limit]
+    if not turns:
+        parser.error(f"no recorded turns in {args.source}")
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    nodes = boot_nodes(sorted({t["node"] for t in turns}))
+    result = replay(nodes, turns, speed=args.speed, concurrency=args.concurrency, latency=not args.no_latency)
+    config = {k: v for k, v in vars(args).items() if k != "out"}
+    report = build_report(result, {**config, "turns": len(turns)})
+
+    out = args.out or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "results",
+        f"replay_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    overall = report["overall"]
+    print(f"{overall['count']} turns at {args.speed}x, {overall['errors']} errors, {overall['late']} late, "
+          f"{overall['changed_replies']} changed replies, {overall['missed_calls']} unmatched calls")
+    print(f"  replayed  p50 {overall['p50_ms']} ms, p95 {overall['p95_ms']} ms, p99 {overall['p99_ms']} ms")
+    print(f"  recorded  p50 {overall['recorded']['p50_ms']} ms, p95 {overall['recorded']['p95_ms']} ms, "
+          f"p99 {overall['recorded']['p99_ms']} ms")
+    print(f"Report written to {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -5,7 +5,7 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response
 import threading
 import webbrowser
 from flask_cors import CORS
@@ -21,6 +21,14 @@ from secretary.communication import Communication
 from secretary.brain import Brain, LLMClient
 from secretary.scheduler import Scheduler
 from secretary.utilities.google import initialize_google_services
+from secretary.utilities.openai_client import get_registry
+from secretary.utilities.llm_cache import get_default_cache
+from secretary.utilities import metrics
+from secretary.utilities.usage import get_ledger
+from secretary.utilities.profiling import init_profiling
+from secretary.utilities.introspection import TracemallocDiff, footprint, init_memory_sampler
+from secretary.utilities.event_sync import init_event_sync
+from secretary.utilities import tracing
 from secretary.socketio_ext import socketio
 
 from flask_socketio import join_room, leave_room
@@ -43,8 +51,10 @@ except ImportError:
 openai_api_key = api_key
 if not openai_api_key:
     raise ValueError("Please set OPENAI_API_KEY in environment variables or .env file")
-# Initialize the global client (can be used if LLMNode doesn't provide its own key)
-client = openai.OpenAI(api_key=openai_api_key)
+# One pooled client registry shared by every node and component (keep-alive, per-node caps, timeouts)
+client_registry = get_registry(api_key=openai_api_key)
+# Global client used by the audio routes
+client = client_registry.get_client("global")
 
 
 log_system_message("OpenAI client initialized successfully")
@@ -81,8 +91,8 @@ class LLMNode:
         # Determine API key to use
         self.api_key = llm_api_key_override if llm_api_key_override else openai_api_key
 
-        # Use the global client if using the global key, otherwise create a new one
-        self.openai_client = client if self.api_key == openai_api_key else openai.OpenAI(api_key=self.api_key)
+        # Per-node view of the shared pooled client (a key override still reuses the same connection pool)
+        self.openai_client = client_registry.get_client(self.node_id, api_key=self.api_key)
 
         # Set LLM parameters with default values if none are provided
         self.llm_params = llm_params if llm_params else {
@@ -100,14 +110,14 @@ class LLMNode:
         self.gmail_service = self.google_services.get('gmail')
 
         # Initialize Core Components
-        self.llm_client = LLMClient(self.api_key, self.llm_params)
-        # Pass network, llm_params, and the IMPORTED socketio instance to Brain
-        self.brain = Brain(self.node_id, self.api_key, self.network, self.llm_params, socketio_instance=socketio)
+        self.llm_client = LLMClient(self.api_key, self.llm_params, client=self.openai_client)
+        # Pass network, llm_params, the IMPORTED socketio instance and the pooled client to Brain
+        self.brain = Brain(self.node_id, self.api_key, self.network, self.llm_params, socketio_instance=socketio, client=self.openai_client)
         self.brain.calendar_service = self.calendar_service # Inject calendar service
         self.brain.gmail_service = self.gmail_service       # Inject gmail service
 
         # Initialize Scheduler and inject calendar service and socketio
-        self.scheduler = Scheduler(node_id=self.node_id, calendar_service=self.calendar_service, network=self.network, brain=self.brain, socketio_instance=socketio)
+        self.scheduler = Scheduler(node_id=self.node_id, calendar_service=self.calendar_service, network=self.network, brain=self.brain, socketio_instance=socketio, client=self.openai_client)
 
         # Initialize Communication and inject dependencies
         self.communication = Communication(self.node_id, self.llm_client, self.network, self.api_key)
@@ -124,6 +134,7 @@ class LLMNode:
 
 app = Flask(__name__, template_folder='UI')
 CORS(app)  # Enable CORS for all routes
+init_profiling(app)  # Opt-in: X-Profile header or PROFILE_SAMPLE_RATE, profiles in logs/profiles
 # Initialize SocketIO with the Flask app instance
 socketio.init_app(app) 
 
@@ -204,6 +215,64 @@ def show_nodes():
         })
     return jsonify(nodes_with_names)
 
+@app.route('/llm_queue')
+def show_llm_queue():
+    """Queue depth, wait times and retry counters of the shared OpenAI dispatcher."""
+    if client_registry.dispatcher is None:
+        return jsonify({"error": "Dispatcher not enabled"}), 404
+    return jsonify(client_registry.dispatcher.stats())
+
+def _llm_queue_depth():
+    if client_registry.dispatcher is None:
+        return {}
+    lanes = client_registry.dispatcher.stats()["lanes"]
+    return {(lane,): data["queue_depth"] for lane, data in lanes.items()}
+
+def _llm_cache_lookups():
+    stats = get_default_cache().stats()
+    return {("hit",): stats["hits"], ("miss",): stats["misses"]}
+
+metrics.registry.register_gauge(
+    "secretary_llm_queue_depth", "Requests waiting in the OpenAI dispatcher.", ("lane",), _llm_queue_depth)
+metrics.registry.register_gauge(
+    "secretary_llm_cache_lookups", "LLM response cache lookups since start.", ("result",), _llm_cache_lookups)
+
+@app.route('/usage')
+def show_usage():
+    """OpenAI tokens, latency and estimated cost per node, per call site, per model and per hour."""
+    recent = request.args.get('recent', default=0, type=int)
+    return jsonify(get_ledger().summary(recent=recent))
+
+memory_diff = TracemallocDiff()
+
+@app.route('/debug/memory')
+def debug_memory():
+    """
+    Per-node sizes and counts of the long-lived structures, shared buffers and RSS.
+
+    ?tracemalloc=1 adds the top allocation growth since the previous such call (the first call starts
+    tracing); ?tracemalloc=stop ends tracing. ?top=N and ?key=lineno|filename|traceback shape the diff.
+    """
+    global network
+    if not network:
+        return jsonify({"error": "Network not initialized"}), 500
+    report = footprint(network)
+    mode = request.args.get('tracemalloc')
+    if mode == 'stop':
+        memory_diff.stop()
+        report["tracemalloc"] = {"stopped": True}
+    elif mode and mode != '0':
+        key = request.args.get('key', default='lineno')
+        if key not in ('lineno', 'filename', 'traceback'):
+            return jsonify({"error": f"Unknown key: {key}"}), 400
+        report["tracemalloc"] = memory_diff.diff(top=request.args.get('top', default=20, type=int), key=key)
+    return jsonify(report)
+
+@app.route('/metrics')
+def show_metrics():
+    """Prometheus scrape endpoint: stage, OpenAI and Google latency histograms plus queue gauges."""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
 #Show projects
 @app.route('/projects')
 def show_projects():
@@ -419,8 +488,10 @@ def send_message():
     if node_id not in network.nodes:
         return jsonify({"error": f"Node {node_id} not found"}), 404
 
-    # Pass the correct sender_id to the internal function
-    return send_message_internal(node_id, message, sender_id)
+    # Pass the correct sender_id to the internal function; continue the caller's trace if it sent one
+    with tracing.span("POST /send_message", kind="server", parent=tracing.extract(request.headers.get("traceparent")),
+                      node=node_id, sender=sender_id):
+        return send_message_internal(node_id, message, sender_id)
 
 
 def send_message_internal(node_id, message, sender_id):
@@ -500,6 +571,8 @@ if __name__ == "__main__":
         log_system_message(f"Created and registered node: {agent_config['id']}")
 
     log_system_message(f"Nodes registered: {network.get_all_nodes()}")
+    init_memory_sampler(lambda: network)  # Opt-in: MEMORY_SAMPLE_SECONDS
+    init_event_sync(network)  # CALENDAR_SYNC_SECONDS=0 turns it off
 
     # Start Flask using the shared socketio instance
     flask_thread = threading.Thread(target=start_flask) 
@@ -1,8 +1,11 @@
+import os
 from typing import List
 
 from network.people import People
 from network.tasks import Task
 from secretary.utilities.logging import log_network_message, log_system_message, log_warning, log_agent_message
+from secretary.utilities.tracing import span
+from secretary.utilities.log_sink import get_sink
 
 class Intercom(People):
     """
@@ -38,13 +41,15 @@ class Intercom(People):
             # only deliver if the node implements receive_message
             recv = getattr(recipient, "receive_message", None)
             if callable(recv):
-                recv(content, sender_id)
+                # The recipient's spans nest under this hop
+                with span("intercom.send_message", kind="producer", sender=sender_id, recipient=recipient_id):
+                    recv(content, sender_id)
             else:
                 # node cannot receive messages, silently skip
                 pass
         else:
             # Print an error message if recipient is not found.
-            log_system_message(f"[Intercom] Attempted to send message to unknown recipient: {recipient_id}.")
+            log_system_message("[Intercom] Attempted to send message to unknown recipient: %s.", recipient_id)
             print(f"[Intercom] Unknown recipient: {recipient_id}.")
 
     def _log_message(self, sender_id: str, recipient_id: str, content: str) -> None:
@@ -60,14 +65,13 @@ class Intercom(People):
         # Log using external logging module
         log_network_message(sender_id, recipient_id, content)
 
-        #----------------Note: We can probably remove the logging inside the network------------------#
-        
-        # Also preserve original file logging if configured
+        # Also keep a per-network message log if configured: a rotating JSONL sink named after
+        # log_file (communication_log.txt -> communication_log.jsonl + compressed segments), written
+        # from a background thread
         if self.log_file:
-            # Open the log file in append mode with UTF-8 encoding to handle any special characters.
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                # Write the message in a readable format.
-                f.write(f"From {sender_id} to {recipient_id}: {content}\n")
+            directory, name = os.path.split(os.path.abspath(self.log_file))
+            sink = get_sink(directory, os.path.splitext(name)[0], background=True)
+            sink.write({"from": sender_id, "to": recipient_id, "content": content})
 
     def add_task(self, task: Task):
         """
@@ -84,14 +88,14 @@ class Intercom(People):
                         - assigned_to (str): The node ID of the node to which the task is assigned.
         """
         
-        log_system_message(f"[Intercom] Adding task: {task.title} to {task.assigned_to}.")
+        log_system_message("[Intercom] Adding task: %s to %s.", task.title, task.assigned_to)
         
         self.tasks.append(task) # Add the new task to the list.
         
         # Build a notification message with task details.
         if task.assigned_to in self.nodes:
             message = f"New task assigned: {task.title}. Due: {task.due_date.strftime('%Y-%m-%d')}. Priority: {task.priority}."
-            log_system_message(f"[Intercom] Sending task notification to {task.assigned_to}: {message}.")
+            log_system_message("[Intercom] Sending task notification to %s: %s.", task.assigned_to, message)
             # Send the notification message from a system-originated sender.
             self.send_message("system", task.assigned_to, message)
     
@@ -1,4 +1,7 @@
 import re, json
+import asyncio
+import contextvars
+import threading
 from datetime import datetime, timedelta
 import openai
 
@@ -11,20 +14,120 @@ from secretary.utilities.logging import (
     log_error, log_warning,
     log_api_request, log_api_response
 )
+from secretary.utilities.llm_cache import LLMCache, make_cache_key, get_default_cache
+from secretary.utilities.usage import usage_site, find_call_site
+from secretary.utilities.tracing import traced
+from secretary.utilities.llm_dispatcher import llm_priority, BACKGROUND
+from secretary.utilities.singleflight import SingleFlight, get_default_singleflight
+from secretary.utilities.calendar_index import IndexedCalendar
 from secretary.socketio_ext import socketio
 from config.agents import AGENT_CONFIG
 
+# System prompt prepended by LLMClient.chat() and chat_stream()
+CHAT_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        "You are a direct and concise AI agent for an organization. "
+        "Provide short, to-the-point answers." #TODO: Improve
+    )
+}
+
+# JSON schema for Brain.route_message: every intent the Communication pipeline needs, in one call.
+# Strict structured outputs require every property to be listed as required, so optional values are nullable.
+_NULLABLE_STRING = {"type": ["string", "null"]}
+ROUTER_SCHEMA = {
+    "name": "message_route",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "additionalProperties": False,
+        "required": ["calendar", "email", "send_email"],
+        "properties": {
+            "calendar": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["is_calendar_command", "action", "missing_info"],
+                "properties": {
+                    "is_calendar_command": {"type": "boolean"},
+                    "action": {
+                        "type": ["string", "null"],
+                        "enum": ["schedule_meeting", "cancel_meeting", "list_meetings", "reschedule_meeting", None],
+                    },
+                    "missing_info": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": ["time", "duration", "participants", "date", "title"]},
+                    },
+                },
+            },
+            "email": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["action", "criteria", "summary_type"],
+                "properties": {
+                    "action": {
+                        "type": "string",
+                        "enum": ["list_labels", "advanced_search", "fetch_recent", "search", "none"],
+                    },
+                    "criteria": {
+                        "type": "object",
+                        "additionalProperties": False,
+                        "required": ["from", "to", "subject", "keywords", "has_attachment", "is_unread",
+                                     "label", "after", "before", "max_results"],
+                        "properties": {
+                            "from": _NULLABLE_STRING,
+                            "to": _NULLABLE_STRING,
+                            "subject": _NULLABLE_STRING,
+                            "keywords": {"type": ["array", "null"], "items": {"type": "string"}},
+                            "has_attachment": {"type": ["boolean", "null"]},
+                            "is_unread": {"type": ["boolean", "null"]},
+                            "label": _NULLABLE_STRING,
+                            "after": _NULLABLE_STRING,
+                            "before": _NULLABLE_STRING,
+                            "max_results": {"type": ["integer", "null"]},
+                        },
+                    },
+                    "summary_type": {"type": "string", "enum": ["concise", "detailed"]},
+                },
+            },
+            "send_email": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["is_send_email", "recipient", "subject", "body"],
+                "properties": {
+                    "is_send_email": {"type": "boolean"},
+                    "recipient": {"type": "string"},
+                    "subject": {"type": "string"},
+                    "body": {"type": "string"},
+                },
+            },
+        },
+    },
+}
+
+
 class LLMClient:
 
-    def __init__(self, api_key: str, params: dict):
+    def __init__(self, api_key: str, params: dict, cache: LLMCache = None, client=None,
+                 singleflight: SingleFlight = None):
         """
         Args:
             api_key: Your OpenAI API key.
             params: Dict containing 'model', 'temperature', 'max_tokens', etc.
+            cache: Response cache to use. Defaults to the process-wide cache; pass False to disable.
+            client: Injected OpenAI client (see secretary.utilities.openai_client). If omitted,
+                    falls back to the module-level openai API configured with api_key.
+            singleflight: Coalescer for identical concurrent requests. Defaults to the process-wide
+                    one; pass False to disable.
         """
-        openai.api_key = api_key
-        self.client = openai
+        if client is None:
+            openai.api_key = api_key
+            client = openai
+        self.client = client
         self.params = params
+        self.cache = get_default_cache() if cache is None else (cache or None)
+        self.singleflight = get_default_singleflight() if singleflight is None else (singleflight or None)
+        # Only near-deterministic requests are worth caching
+        self.cache_max_temperature = params.get("cache_max_temperature", 0.5)
 
     def chat(self, messages):
         """
@@ -32,30 +135,204 @@ class LLMClient:
         and logs both request and response.
         """
         
-        system = [{
-            "role": "system",
-            "content": (
-                "You are a direct and concise AI agent for an organization. "
-                "Provide short, to-the-point answers." #TODO: Improve
-            )
-        }]
-        prompt = system + messages
+        prompt = [CHAT_SYSTEM_MESSAGE] + messages
         try:
-            log_api_request("openai_chat", {"model": self.params["model"], "messages": prompt})
+            return self.complete(prompt)
+        
+        except Exception as e:
+            log_error(f"LLMClient.chat failed: {e}")
+            return "LLM query failed."
+
+    def complete(self, messages, model=None, temperature=None, max_tokens=None, **extra):
+        """
+        Send the messages as-is (no system prompt injected) and return the stripped text.
+
+        Identical requests are answered from the cache when the temperature is low enough, and
+        identical requests made at the same time share one API call (single-flight).
+        Errors are raised to the caller.
+
+        Args:
+            messages (list): Chat messages.
+            model (str, optional): Overrides params['model'].
+            temperature (float, optional): Overrides params['temperature'].
+            max_tokens (int, optional): Overrides params['max_tokens'].
+            **extra: Additional create() arguments, e.g. response_format.
+
+        Returns:
+            str: The completion text.
+        """
+        model = model or self.params["model"]
+        temperature = self.params["temperature"] if temperature is None else temperature
+        max_tokens = self.params["max_tokens"] if max_tokens is None else max_tokens
+
+        deterministic = (temperature or 0) <= self.cache_max_temperature
+        use_cache = self.cache is not None and deterministic
+        coalesce = self.singleflight is not None and deterministic
+        key = make_cache_key(messages, model, temperature, max_tokens, **extra) if (use_cache or coalesce) else None
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                log_api_response("openai_chat", {"response": cached, "cached": True})
+                return cached
+
+        def fetch():
+            log_api_request("openai_chat", {"model": model, "messages": messages})
             resp = self.client.chat.completions.create(
-                model=self.params["model"],
-                messages=prompt,
-                temperature=self.params["temperature"],
-                max_tokens=self.params["max_tokens"]
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **extra
             )
             text = resp.choices[0].message.content.strip()
             log_api_response("openai_chat", {"response": text})
+
+            if use_cache and text:
+                self.cache.set(key, text)
             return text
+
+        if coalesce:
+            return self.singleflight.do(key, fetch)
+        return fetch()
+
+    def chat_stream(self, messages):
+        """
+        Streaming variant of chat(): same system prompt, yields text chunks as they arrive.
+        """
+        yield from self.stream([CHAT_SYSTEM_MESSAGE] + messages)
+
+    def stream(self, messages, model=None, temperature=None, max_tokens=None, **extra):
+        """
+        Send the messages with stream=True and yield the text deltas as they arrive.
+
+        A cached answer is yielded as a single chunk; a completed stream is written to the cache.
+        Errors are raised to the caller.
+
+        Args:
+            messages (list): Chat messages.
+            model, temperature, max_tokens, **extra: As in complete().
+
+        Yields:
+            str: Successive pieces of the completion text.
+        """
+        model = model or self.params["model"]
+        temperature = self.params["temperature"] if temperature is None else temperature
+        max_tokens = self.params["max_tokens"] if max_tokens is None else max_tokens
+
+        use_cache = self.cache is not None and (temperature or 0) <= self.cache_max_temperature
+        key = make_cache_key(messages, model, temperature, max_tokens, **extra) if use_cache else None
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                log_api_response("openai_chat_stream", {"response": cached, "cached": True})
+                yield cached
+                return
+
+        log_api_request("openai_chat_stream", {"model": model, "messages": messages})
+        resp = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **extra
+        )
+        parts = []
+        for chunk in resp:
+            # Some chunks (e.g. the final usage chunk) carry no choices
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+
+        text = "".join(parts).strip()
+        log_api_response("openai_chat_stream", {"response": text})
+        if use_cache and text:
+            self.cache.set(key, text)
         
-        except Exception as e:
-            log_error(f"LLMClient.chat failed: {e}")
-            return "LLM query failed."
-        
+class AsyncLLMClient:
+    """
+    asyncio front-end for issuing many completions in parallel with bounded concurrency.
+
+    The wrapped client may be an openai.AsyncOpenAI (awaited directly) or a synchronous client such
+    as the pooled NodeClient, whose blocking calls are pushed to worker threads. The synchronous form
+    is the default because it keeps using the shared keep-alive pool across event loops.
+    """
+
+    def __init__(self, client, max_concurrency: int = 5):
+        """
+        Args:
+            client: OpenAI client (sync or async).
+            max_concurrency: Maximum number of requests in flight from this instance.
+        """
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.is_async = isinstance(client, openai.AsyncOpenAI)
+
+    async def create(self, semaphore: asyncio.Semaphore = None, **kwargs):
+        """
+        Run one chat.completions.create call.
+
+        Args:
+            semaphore: Shared limiter for a batch (see gather()); created on demand if omitted.
+            **kwargs: Arguments for chat.completions.create.
+
+        Returns:
+            The raw completion response.
+        """
+        semaphore = semaphore or asyncio.Semaphore(self.max_concurrency)
+        async with semaphore:
+            if self.is_async:
+                return await self.client.chat.completions.create(**kwargs)
+            # The worker thread has no view of our stack; hand the call site over through the context
+            with usage_site(find_call_site()):
+                return await asyncio.to_thread(self.client.chat.completions.create, **kwargs)
+
+    async def gather(self, requests: list) -> list:
+        """
+        Run a batch of requests concurrently and return the results in request order.
+
+        Args:
+            requests (list): One kwargs dict per chat.completions.create call.
+
+        Returns:
+            list: The response for each request, or the exception it raised.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(
+            *(self.create(semaphore=semaphore, **kwargs) for kwargs in requests),
+            return_exceptions=True
+        )
+
+
+def run_async(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Flask worker threads have no event loop, so asyncio.run() is used directly. If the calling
+    thread already runs a loop, the coroutine is executed on a helper thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+    def runner():
+        try:
+            result['value'] = asyncio.run(coro)
+        except BaseException as e:
+            result['error'] = e
+    # Carry context variables (e.g. the LLM priority lane) over to the helper thread
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(runner,))
+    thread.start()
+    thread.join()
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
 class Confirmation:
     """
     Simple interactive yes/no prompt. Returns True on 'y' answers.
@@ -101,13 +378,17 @@ class Brain:
         openai_api_key: str,
         network: Intercom,
         llm_params: dict = None,
-        socketio_instance=None
+        socketio_instance=None,
+        client=None
     ):
         self.node_id = node_id
 
         # --- LLM client setup ---
-        openai.api_key = openai_api_key
-        self.client = openai
+        # Prefer the injected (pooled) client; the module-level API is only a standalone fallback
+        if client is None:
+            openai.api_key = openai_api_key
+            client = openai
+        self.client = client
         self.llm_params = llm_params or {
             "model": "gpt-4o-mini",
             "temperature": 0.1,
@@ -115,7 +396,9 @@ class Brain:
         }
 
         # wraps logging / system prompt injection centrally
-        self.llm = LLMClient(openai_api_key, self.llm_params)
+        self.llm = LLMClient(openai_api_key, self.llm_params, client=self.client)
+        # parallel fan-out for multi-step workflows (e.g. per-step task generation)
+        self.async_llm = AsyncLLMClient(self.client, max_concurrency=self.llm_params.get("max_parallel_requests", 5))
 
         # User confirmation service
         self.confirmation = Confirmation()
@@ -152,8 +435,105 @@ class Brain:
         # --- SocketIO (if using realtime UI updates) ---
         self.socketio = socketio_instance
 
+        # Routing decisions per message (see route_message)
+        self._route_cache = LLMCache(max_entries=256, ttl_seconds=self.llm_params.get("route_cache_ttl", 600))
+
         log_system_message(f"[Brain:{self.node_id}] initialized.")
+
+    @property
+    def calendar(self) -> IndexedCalendar:
+        """Local meetings, indexed per participant for availability queries."""
+        return self._calendar
+
+    @calendar.setter
+    def calendar(self, meetings):
+        # Reassignments (e.g. filtering out a cancelled event) keep the index
+        self._calendar = meetings if isinstance(meetings, IndexedCalendar) else IndexedCalendar(meetings)
         
+    @traced("brain.route_message")
+    def route_message(self, message: str) -> dict:
+        """
+        Classify a message for calendar, email-search and send-email handling in a single LLM call.
+
+        Replaces calling _detect_calendar_intent, _analyze_email_command and _detect_send_email_intent
+        one after another. The model answers against ROUTER_SCHEMA (structured outputs) and the parsed
+        result is cached per message, so retries and repeated commands don't hit the API again.
+
+        Args:
+            message (str): The incoming message.
+
+        Returns:
+            dict: {
+                "calendar":   same shape as _detect_calendar_intent(),
+                "email":      same shape as _analyze_email_command(),
+                "send_email": same shape as _detect_send_email_intent()
+            }
+        """
+        model = self.llm_params.get("router_model", "gpt-4o-mini")
+        today = datetime.now().strftime("%Y/%m/%d")
+        key = make_cache_key([{"role": "user", "content": message}], model, extra=today)
+
+        cached = self._route_cache.get(key)
+        if cached is not None:
+            route = json.loads(cached)
+        else:
+            prompt = f"""
+            Today is {today}. Classify this message for an assistant that manages a calendar and a Gmail inbox:
+            '{message}'
+
+            calendar: is it a calendar command ("schedule_meeting", "cancel_meeting", "list_meetings",
+              "reschedule_meeting")? List the missing information among "time", "duration", "participants",
+              "date", "title".
+            email: is it a request to read or search emails ("list_labels", "advanced_search", "fetch_recent",
+              "search", otherwise "none")? Fill only the criteria explicitly mentioned or clearly implied, leave the
+              others null. Convert date references like "yesterday" or "last week" to YYYY/MM/DD.
+            send_email: is it a request to write and send an email? Extract the recipient (name or address only),
+              the subject and the body; use an empty string for anything not given. If the message itself looks like
+              the email content, use it as the body without the command words.
+            """
+            try:
+                raw = self.llm.complete(
+                    [{"role": "user", "content": prompt}],
+                    model=model,
+                    temperature=0,
+                    response_format={"type": "json_schema", "json_schema": ROUTER_SCHEMA},
+                )
+                route = json.loads(raw)
+                self._route_cache.set(key, json.dumps(route))
+            except Exception as e:
+                print(f"[{self.node_id}] Error routing message: {str(e)}")
+                log_error(f"[Brain] [{self.node_id}] Error routing message: {e}")
+                route = {}
+
+        calendar = route.get("calendar") or {}
+        email = route.get("email") or {}
+        send_email = dict(route.get("send_email") or {})
+
+        # Drop empty criteria so callers see the same shape _analyze_email_command produced
+        criteria = {k: v for k, v in (email.get("criteria") or {}).items() if v not in (None, "", [])}
+        email_route = {
+            "action": email.get("action") or "none",
+            "criteria": criteria,
+            "summary_type": email.get("summary_type") or "concise",
+        }
+        send_email.setdefault("is_send_email", False)
+        send_email["missing_info"] = [f for f in ("recipient", "subject", "body") if not send_email.get(f)]
+
+        # An email being composed takes the follow-up messages (same rule as the per-intent detectors)
+        if hasattr(self, 'email_context') and self.email_context.get('active'):
+            email_route = {"action": "none"}
+            send_email = {"is_send_email": False}
+
+        return {
+            "calendar": {
+                "is_calendar_command": bool(calendar.get("is_calendar_command")),
+                "action": calendar.get("action"),
+                "missing_info": calendar.get("missing_info", []) or [],
+            },
+            "email": email_route,
+            "send_email": send_email,
+        }
+
     def _detect_calendar_intent(self, message):
         """
         Detect if the incoming message is related to calendar commands.
@@ -239,7 +619,8 @@ class Brain:
             print(f"[{self.node_id}] Error extracting meeting details: {str(e)}")
             return {}
         
-    def query_llm(self, messages):
+    @traced("brain.query_llm")
+    def query_llm(self, messages, stream_room: str = None):
         """
         Query the language model with a list of messages.
         
@@ -247,6 +628,8 @@ class Brain:
         
         Args:
             messages (list): A list of message dictionaries (role and content).
+            stream_room (str, optional): If given (and SocketIO is available), tokens are emitted to this
+                room as 'llm_token' events while they arrive, followed by 'llm_stream_end'.
         
         Returns:
             str: The trimmed text response from the LLM.
@@ -267,7 +650,10 @@ class Brain:
             log_api_request("openai_chat", {"model": self.llm_params["model"], "messages": combined_messages})
             
             # Call through LLMClient
-            response_content = self.llm.chat(combined_messages)
+            if stream_room and self.socketio:
+                response_content = self._stream_to_room(combined_messages, stream_room)
+            else:
+                response_content = self.llm.chat(combined_messages)
             
             # Log the agent's response
             log_agent_message(self.node_id, response_content)
@@ -280,6 +666,35 @@ class Brain:
             log_error(error_msg)
             return "LLM query failed."
         
+    def _stream_to_room(self, messages, room: str) -> str:
+        """
+        Stream a completion to a SocketIO room and return the full text.
+
+        'llm_stream_end' is always emitted. If the stream fails, the tokens sent so far are discarded:
+        the answer is requested again without streaming and sent with the end event, flagged 'error'.
+
+        Args:
+            messages (list): Chat messages (system prompt already included).
+            room (str): SocketIO room of the requesting node.
+
+        Returns:
+            str: The complete response text.
+        """
+        parts = []
+        try:
+            for token in self.llm.chat_stream(messages):
+                parts.append(token)
+                self.socketio.emit('llm_token', {'node_id': self.node_id, 'token': token}, room=room)
+        except Exception as e:
+            log_error("[Brain] [%s] Streaming failed after %d tokens, asking again without streaming: %s",
+                      self.node_id, len(parts), e)
+            text = self.llm.chat(messages)
+            self.socketio.emit('llm_stream_end', {'node_id': self.node_id, 'text': text, 'error': True}, room=room)
+            return text
+        text = "".join(parts).strip()
+        self.socketio.emit('llm_stream_end', {'node_id': self.node_id, 'text': text, 'error': False}, room=room)
+        return text
+
     def initiate_project_planning(self, project_id: str, objective: str):
         """
         V2: Initiates project planning by first getting candidate suggestions.
@@ -454,15 +869,14 @@ class Brain:
         ]
 
         try:
-            log_api_request("openai_chat_candidates", {"model": self.llm_params["model"], "messages": messages})
-            resp = self.client.chat.completions.create(
-                model=self.llm_params.get("model", "gpt-4o-mini"), # Use model from llm_params
-                messages=messages,
-                temperature=self.llm_params.get("temperature", 0.3),
-                max_tokens=self.llm_params.get("max_tokens", 150)
-            )
-            result_content = resp.choices[0].message.content.strip()
-            log_api_response("openai_chat_candidates", {"response": result_content})
+            # Goes through LLMClient so repeated objectives are served from the cache
+            with llm_priority(BACKGROUND):
+                result_content = self.llm.complete(
+                    messages,
+                    model=self.llm_params.get("model", "gpt-4o-mini"), # Use model from llm_params
+                    temperature=self.llm_params.get("temperature", 0.3),
+                    max_tokens=self.llm_params.get("max_tokens", 150)
+                )
 
             if not result_content or result_content.isspace():
                 log_warning(f"[{self.node_id}] Empty response from OpenAI for candidate suggestion.")
@@ -711,6 +1125,8 @@ class Brain:
         
         For each step in the plan, this method constructs a prompt to generate 1-3 tasks, calls the LLM with a
         function tool specification (create_task), parses the returned task details, and creates the Task objects.
+        All step prompts are sent concurrently and merged in step order; task insertion and reminder creation
+        then run as a second concurrent stage, so wall time follows the slowest step rather than the sum.
         
         Args:
             project_id (str): Identifier for the project.
@@ -761,7 +1177,8 @@ class Brain:
             }
         ]
         
-        # Process each project plan step
+        # Stage 1: build one prompt per plan step, then send them all to the LLM concurrently
+        step_requests = []  # (step index, step, create() kwargs)
         for i, step in enumerate(steps):
             step_description = step.get("description", "")
             
@@ -798,49 +1215,35 @@ class Brain:
             CRITICAL REQUIREMENT: Every participant in the list ({current_participants_list_str}) MUST be assigned to at least one of the tasks you create for this step. Distribute task responsibilities logically among them. If a participant cannot be logically assigned a task from the primary step description, you can create a related sub-task or a review task for them, ensuring it's relevant to the step and the project.
             """
             
+            step_requests.append((i, step, {
+                "model": "gpt-4o-mini",
+                "messages": [{"role": "user", "content": prompt}],
+                "tools": functions,
+                "tool_choice": {"type": "function", "function": {"name": "create_task"}}
+            }))
+
+        # Bulk work: queued behind interactive chat by the dispatcher
+        with llm_priority(BACKGROUND):
+            responses = run_async(self.async_llm.gather([kwargs for _, _, kwargs in step_requests]))
+
+        # Merge the tool-call results in step order
+        tasks = []
+        for (i, step, _), response in zip(step_requests, responses):
             try:
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[{"role": "user", "content": prompt}],
-                    tools=functions,
-                    tool_choice={"type": "function", "function": {"name": "create_task"}}
-                )
-                
-                # Process any function calls in the response to create tasks
-                for choice in response.choices:
-                    if hasattr(choice.message, 'tool_calls') and choice.message.tool_calls:
-                        for tool_call in choice.message.tool_calls:
-                            if tool_call.function.name == "create_task":
-                                task_data = json.loads(tool_call.function.arguments)
-                                
-                                # Create a new Task using the provided data
-                                due_date = datetime.now() + timedelta(days=task_data["due_date_offset"])
-                                task = Task(
-                                    title=task_data["title"],
-                                    description=task_data["description"],
-                                    due_date=due_date,
-                                    assigned_to=task_data["assigned_to"],
-                                    priority=task_data["priority"],
-                                    project_id=project_id
-                                )
-                                
-                                # Add to network tasks
-                                if self.network:
-                                    self.network.add_task(task)
-                                    print(f"[{self.node_id}] Created task: {task}")
-                                    
-                                    # Create a calendar reminder for the task
-                                    # This should probably return a collective result after all steps.
-                                    # For now, let's assume scheduler.create_calendar_reminder is robust.
-                                    if hasattr(self, 'scheduler') and self.scheduler:
-                                         self.scheduler.create_calendar_reminder(task) # Fire-and-forget for now
-                                else:
-                                    log_warning(f"[{self.node_id}] Network not available, task '{task.title}' not added to network tasks.")
-            
+                if isinstance(response, Exception):
+                    raise response
+                tasks.extend(self._tasks_from_tool_calls(response, project_id))
             except Exception as e:
                 print(f"[{self.node_id}] Error generating tasks for step {i+1}: {e}")
                 log_error(f"[Brain] [{self.node_id}] Error generating tasks for project '{project_id}', step '{step.get('name')}': {e}")
-                # Continue to next step, don't let one step's failure stop all task generation.
+                # Continue with the other steps, don't let one step's failure stop all task generation.
+
+        # Stage 2: add the tasks to the network and create their reminders concurrently
+        if self.network:
+            run_async(self._insert_tasks_async(tasks))
+        else:
+            for task in tasks:
+                log_warning(f"[{self.node_id}] Network not available, task '{task.title}' not added to network tasks.")
 
         # After processing all steps, emit a task update through socketio if available
         if self.socketio:
@@ -864,6 +1267,68 @@ class Brain:
 
         return f"Task generation process completed for project '{project_id}'. Check task list for details.{formatted_plan}"
 
+    def _tasks_from_tool_calls(self, response, project_id: str) -> list:
+        """
+        Build Task objects from the create_task tool calls of a completion response.
+
+        Args:
+            response: Chat completion response produced with the create_task tool.
+            project_id (str): Project the tasks belong to.
+
+        Returns:
+            list: Task objects in the order the model emitted them.
+        """
+        tasks = []
+        for choice in response.choices:
+            if hasattr(choice.message, 'tool_calls') and choice.message.tool_calls:
+                for tool_call in choice.message.tool_calls:
+                    if tool_call.function.name == "create_task":
+                        task_data = json.loads(tool_call.function.arguments)
+
+                        # Create a new Task using the provided data
+                        due_date = datetime.now() + timedelta(days=task_data["due_date_offset"])
+                        tasks.append(Task(
+                            title=task_data["title"],
+                            description=task_data["description"],
+                            due_date=due_date,
+                            assigned_to=task_data["assigned_to"],
+                            priority=task_data["priority"],
+                            project_id=project_id
+                        ))
+        return tasks
+
+    async def _insert_tasks_async(self, tasks: list):
+        """
+        Add tasks to the network in step order while their calendar reminders are created concurrently.
+
+        add_task delivers to the assignees' receive_message, so the tasks are added one at a time (inbound
+        handlers must not race on a node's meeting/confirmation context, and network.tasks keeps the
+        step order). Reminders only call Google Calendar; they run on worker threads meanwhile.
+
+        Args:
+            tasks (list): Task objects to insert.
+        """
+        semaphore = asyncio.Semaphore(self.async_llm.max_concurrency)
+        scheduler = getattr(self, 'scheduler', None)
+
+        def add_in_order():
+            for task in tasks:
+                try:
+                    self.network.add_task(task)
+                    log_system_message("[Brain] [%s] Created task: %s", self.node_id, task)
+                except Exception as e:
+                    log_error(f"[Brain] [{self.node_id}] Error inserting task '{task.title}': {e}")
+
+        async def remind(task):
+            async with semaphore:
+                await asyncio.to_thread(scheduler.create_calendar_reminder, task)
+
+        reminders = [remind(task) for task in tasks] if scheduler else []
+        results = await asyncio.gather(asyncio.to_thread(add_in_order), *reminders, return_exceptions=True)
+        for task, result in zip(tasks if scheduler else [], results[1:]):
+            if isinstance(result, Exception):
+                log_error(f"[Brain] [{self.node_id}] Error creating the reminder for task '{task.title}': {result}")
+
     def list_tasks(self):
         """
         List all tasks assigned to this node.
@@ -946,7 +1411,8 @@ class Brain:
             """
         
         # Get summary from the LLM
-        response = self.query_llm([{"role": "user", "content": prompt}])
+        with llm_priority(BACKGROUND):
+            response = self.query_llm([{"role": "user", "content": prompt}])
         return response
 
     def process_email_command(self, command):
@@ -1038,6 +1504,29 @@ class Brain:
             # Default fallback
             return {"action": "none", "count": 5, "query": "", "summary_type": "concise"}
         
+    def fetch_emails_with_advanced_query(self, criteria: dict):
+        """
+        Fetch emails matching structured search criteria (as produced by _analyze_email_command / route_message).
+
+        Args:
+            criteria (dict): Optional keys from, to, subject, keywords, has_attachment, is_unread,
+                label, after, before, max_results.
+
+        Returns:
+            list: Emails in the same format as fetch_emails().
+        """
+        parts = []
+        for field in ("from", "to", "subject", "label", "after", "before"):
+            if criteria.get(field):
+                value = str(criteria[field])
+                parts.append(f'{field}:"{value}"' if " " in value else f"{field}:{value}")
+        parts.extend(criteria.get("keywords") or [])
+        if criteria.get("has_attachment"):
+            parts.append("has:attachment")
+        if criteria.get("is_unread"):
+            parts.append("is:unread")
+        return self.fetch_emails(max_results=criteria.get("max_results") or 10, query=" ".join(parts))
+
     def fetch_emails(self, max_results=10, query=None):
         """
         Fetch emails from the Gmail account using the Gmail service.
@@ -1238,14 +1727,17 @@ class Brain:
         Depending on the action (e.g., list_labels, advanced_search), it calls appropriate functions.
         
         Args:
-            command (str): The advanced email command in natural language.
+            command (str | dict): The advanced email command in natural language, or an analysis
+                dict already produced by _analyze_email_command / route_message.
         
         Returns:
             str: The output or response from processing the advanced email command.
         """
         
-        # First analyze the command to extract detailed intent and parameters
-        analysis = self._analyze_email_command(command)
+        # First analyze the command to extract detailed intent and parameters,
+        # unless the caller already did (Communication passes the route_message analysis)
+        precomputed = isinstance(command, dict)
+        analysis = command if precomputed else self._analyze_email_command(command)
         
         action = analysis.get('action', 'none')
         
@@ -1273,11 +1765,11 @@ class Brain:
                     
             return response
             
-        elif action == 'advanced_search':
+        elif action == 'advanced_search' or (precomputed and action in ('search', 'fetch_recent')):
             # Extract search criteria from analysis
             criteria = analysis.get('criteria', {})
             
-            if not criteria:
+            if not criteria and action != 'fetch_recent':
                 return "I couldn't understand your search criteria. Please try again with more specific details."
                 
             # Fetch emails matching criteria
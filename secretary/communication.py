@@ -1,5 +1,6 @@
 import re
 import base64
+import threading
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta, timezone 
 
@@ -7,6 +8,11 @@ from secretary.utilities.logging import log_user_message, log_network_message, l
 from secretary.utilities.google import initialize_google_services
 from secretary.scheduler import Scheduler
 from secretary.brain import Confirmation
+from secretary.memory import ConversationMemory
+from secretary.utilities.intent_classifier import get_default_classifier, route_label, log_example
+from secretary.utilities.metrics import timed
+from secretary.utilities.tracing import traced, current_span
+from secretary.utilities.session_recorder import recorded
 
 class Communication:
     """
@@ -39,8 +45,11 @@ class Communication:
         self.projects: Dict = {}
         self.meetings: List = []
 
-        # Conversation history for LLM
-        self.conversation_history: List[Dict] = []
+        # Local pre-classifier deciding which messages need the LLM router
+        self.intent_classifier = get_default_classifier()
+
+        # Conversation history for LLM (recent turns verbatim, older turns summarized)
+        self.conversation_history = ConversationMemory(summarizer=self._summarize_history)
 
         # --- ADD Placeholders for injected dependencies ---
         self.brain = None  # Will be injected by LLMNode
@@ -48,6 +57,8 @@ class Communication:
         self.calendar_service = None # Will be injected by LLMNode
         self.gmail_service = None # Will be injected by LLMNode
 
+    @traced("communication.receive_message", kind="consumer")
+    @recorded
     def receive_message(self, message: str, sender_id: str) -> Optional[str]:
         """
         Process an incoming message in four steps:
@@ -64,61 +75,116 @@ class Communication:
             Optional[str]: The textual response to be sent back, or None if handled internally.
         """
         
+        current_span().set_attribute("sender", sender_id)
+
         # Log the message
-        log_system_message(f"[Communication] {sender_id, self.node_id, message}")
+        log_system_message("[Communication] %s", (sender_id, self.node_id, message))
         print(f"[{self.node_id}] Received from {sender_id}: {message}")
 
         # Check if it is a information message from another node
         if message.startswith("[(INFO)]"):
-            log_system_message(f"[Communication] [{self.node_id}] Information message: {message.replace("[(INFO)]", "")}")
+            log_system_message("[Communication] [%s] Information message: %s", self.node_id, message.replace("[(INFO)]", ""))
             return message.replace("[(INFO)]", "")        
 
         # quick CLI command handling
-        quick_cmd_response = self._handle_quick_command(message, sender_id)
+        with timed("quick_command", self.node_id):
+            quick_cmd_response = self._handle_quick_command(message, sender_id)
         if quick_cmd_response is not None:
-            log_system_message(f"[Communication] Quick command response: {quick_cmd_response}")
+            log_system_message("[Communication] Quick command response: %s", quick_cmd_response)
             return quick_cmd_response
 
         # Check if the message is the response to a confirmation question
         if self.brain and self.brain.confirmation_context['active'] == True:
-            log_system_message(f"[Communication] Confirmation response: {message}")
+            log_system_message("[Communication] Confirmation response: %s", message)
             
-            if Confirmation.request(self, message):
+            with timed("confirmation", self.node_id):
+                confirmed = Confirmation.request(self, message)
+            if confirmed:
                 self.brain.confirmation_context['active'] = False
-                return self._handle_confirmation_response(message, sender_id)
+                with timed("confirmation_action", self.node_id):
+                    return self._handle_confirmation_response(message, sender_id)
             else:
                 self.brain.confirmation_context['active'] = False
                 return "No problem, let me know if you need anything else."
 
+        # Email commands - only check if message looks like an email-related command
+        # Simple heuristic to avoid unnecessary LLM calls for non-email messages
+        email_keywords = ["email", "gmail", "mail", "inbox", "message", "send", "write", "compose", "draft"]
+        looks_like_email = any(keyword in message.lower() for keyword in email_keywords)
+
+        # Local pre-classifier: confident chit-chat goes straight to chat, without an LLM routing call.
+        # Not while a meeting or an email is being composed, since the message may be the missing detail.
+        predicted = None
+        in_flow = self.brain and (self.brain.meeting_context['active'] or
+                                  getattr(self.brain, 'email_context', {}).get('active'))
+        if self.brain and not in_flow:
+            with timed("preclassify", self.node_id):
+                skip_router, predicted, shadow = self.intent_classifier.should_skip_router(message)
+            if skip_router:
+                log_system_message("[Communication] [%s] Pre-classifier: chat, skipping router", self.node_id)
+                if shadow:
+                    threading.Thread(target=self._shadow_route, args=(message, predicted), daemon=True).start()
+                return self._chat_with_llm(message)
+
+        # One structured call classifies calendar, email-search and send-email intents together
+        route = None
+        if self.brain and (self.scheduler or looks_like_email):
+            with timed("route", self.node_id):
+                route = self.brain.route_message(message)
+            if predicted is not None:
+                actual = route_label(route)
+                self.intent_classifier.record(predicted, actual)
+                log_example(message, actual)
+
         # Calendar commands -> delegate entirely to Scheduler
         if self.scheduler:
-            cal_intent = self.brain._detect_calendar_intent(message)
-            log_system_message(f"[Communication] Calendar intent detected: {cal_intent}")
+            cal_intent = route['calendar']
+            log_system_message("[Communication] Calendar intent detected: %s", cal_intent)
             if cal_intent.get('is_calendar_command', False):
-                log_system_message(f"[Communication] Routing calendar command to scheduler")
-                return self.scheduler.handle_calendar(cal_intent, message)
+                log_system_message("[Communication] Routing calendar command to scheduler")
+                with timed("calendar", self.node_id):
+                    return self.scheduler.handle_calendar(cal_intent, message)
             if self.brain.meeting_context['active'] == True:
-                log_system_message(f"[Communication] Meeting creation in progress")
-                return self.scheduler._continue_meeting_creation(message, sender_id)
+                log_system_message("[Communication] Meeting creation in progress")
+                with timed("calendar", self.node_id):
+                    return self.scheduler._continue_meeting_creation(message, sender_id)
 
-        # Email commands - only check if message looks like an email-related command
-        # Simple heuristic to avoid unnecessary LLM calls for non-email messages
-        email_keywords = ["email", "gmail", "mail", "inbox", "message", "send", "write", "compose", "draft"]
-        if any(keyword in message.lower() for keyword in email_keywords) and self.brain:
+        if looks_like_email and route is not None:
             # First, check for advanced commands (like search, list labels) which should return a response
-            adv_email_analysis = self.brain._analyze_email_command(message)
+            adv_email_analysis = route['email']
             if adv_email_analysis.get('action') in ['list_labels', 'advanced_search', 'fetch_recent', 'search']:
-                return self.brain.process_advanced_email_command(adv_email_analysis)
+                with timed("email", self.node_id):
+                    return self.brain.process_advanced_email_command(adv_email_analysis)
                 
             # Then, check for send email intent
-            send_email_intent = self.brain._detect_send_email_intent(message)
+            send_email_intent = route['send_email']
             if send_email_intent.get('is_send_email', False):
                 # Email composition might be multi-turn, handle appropriately
-                return self._handle_email_composition(send_email_intent, message)
+                with timed("email", self.node_id):
+                    return self._handle_email_composition(send_email_intent, message)
 
         # Fallback: send to LLM
         return self._chat_with_llm(message)
     
+    def _shadow_route(self, message: str, predicted: str):
+        """
+        Check a locally routed message against the LLM router, for the pre-classifier's precision counters.
+
+        Args:
+            message (str): The message that skipped the router.
+            predicted (str): The pre-classifier's label.
+        """
+        try:
+            actual = route_label(self.brain.route_message(message))
+        except Exception as e:
+            log_warning(f"[Communication] [{self.node_id}] Shadow routing failed: {e}")
+            return
+        self.intent_classifier.record(predicted, actual)
+        log_example(message, actual)
+        if actual != predicted:
+            log_warning(f"[Communication] [{self.node_id}] Pre-classifier said {predicted}, router said {actual}: {message}")
+        log_system_message("[Communication] Pre-classifier stats: %s", self.intent_classifier.stats())
+
     def _handle_confirmation_response(self, message: str, sender_id: str) -> Optional[str]:
         """
         Handle the response to a confirmation question.
@@ -234,12 +300,42 @@ class Communication:
     def _chat_with_llm(self, message: str) -> str:
         """
         Fallback: append to history, query LLM, print and return the response.
+        Tokens are streamed to this node's SocketIO room while the answer is generated.
         """
         self.conversation_history.append({'role':'user','content':message})
-        response = self.brain.query_llm(self.conversation_history)
+        with timed("chat", self.node_id):
+            response = self.brain.query_llm(self.conversation_history.get_messages(), stream_room=self.node_id)
         self.conversation_history.append({'role':'assistant','content':response})
         return response
 
+    def _summarize_history(self, previous_summary: str, messages: List[Dict]) -> str:
+        """
+        Fold older conversation turns into the rolling summary kept by ConversationMemory.
+
+        Args:
+            previous_summary (str): The current summary (may be empty).
+            messages (List[Dict]): The turns to fold in.
+
+        Returns:
+            str: The updated summary.
+        """
+        llm = self.llm or getattr(self.brain, 'llm', None)
+        if llm is None:
+            raise RuntimeError("no LLM client available")
+        transcript = "\n".join(f"{m.get('role')}: {m.get('content')}" for m in messages)
+        prompt = f"""
+        Update the summary of a conversation between a user and an assistant.
+
+        Current summary:
+        {previous_summary or "(none)"}
+
+        New turns:
+        {transcript}
+
+        Return only the updated summary in a few sentences. Keep names, dates, decisions and open questions.
+        """
+        return llm.complete([{"role": "user", "content": prompt}], temperature=0)
+
     def _handle_email_composition(self, intent: dict, message: str) -> Optional[str]:
         """Handles the process of composing and sending an email."""
         if not self.brain or not self.gmail_service:
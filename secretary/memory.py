@@ -1 +1,192 @@
-# TODO: This  file should contain the memory class and its methods
\ No newline at end of file
+"""Conversation memory for the fallback chat.
+
+Keeps the most recent turns verbatim and folds older turns into a rolling summary, so the
+prompt sent to the LLM stays within a token budget no matter how long a session runs.
+Summarization happens in a background thread once the history crosses a threshold; until it
+finishes, get_messages() simply drops the oldest turns that don't fit.
+"""
+
+import threading
+from typing import Callable, Dict, List, Optional
+
+from secretary.utilities.logging import log_system_message, log_warning
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for budgeting (about 4 characters per token for English text).
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: Estimated number of tokens.
+    """
+    if not text:
+        return 0
+    return len(text) // 4 + 1
+
+
+def _message_tokens(message: Dict) -> int:
+    # A few tokens of per-message overhead for the role/formatting
+    return estimate_tokens(str(message.get("content") or "")) + 4
+
+
+class ConversationMemory:
+    """
+    Token-bounded conversation history with a rolling summary of older turns.
+
+    Supports append()/len()/iteration so it can stand in for the plain list that was used before.
+
+    Attributes:
+        max_tokens (int): Budget for the messages returned by get_messages().
+        recent_turns (int): Number of most recent messages that are never summarized.
+        summarize_threshold (float): Fraction of max_tokens at which summarization is triggered.
+        summary (str): Rolling summary of the turns that were folded out of the window.
+    """
+
+    def __init__(
+        self,
+        summarizer: Optional[Callable[[str, List[Dict]], str]] = None,
+        max_tokens: int = 3000,
+        recent_turns: int = 8,
+        summarize_threshold: float = 0.75,
+        background: bool = True,
+    ):
+        """
+        Args:
+            summarizer (callable, optional): fn(previous_summary, messages) -> new summary. Without it
+                old turns are only dropped from the prompt, never summarized.
+            max_tokens (int): Token budget for the prompt history.
+            recent_turns (int): Messages always kept verbatim.
+            summarize_threshold (float): Start summarizing when the history exceeds this share of the budget.
+            background (bool): Run the summarizer in a daemon thread (False runs it inline).
+        """
+        self.summarizer = summarizer
+        self.max_tokens = max_tokens
+        self.recent_turns = recent_turns
+        self.summarize_threshold = summarize_threshold
+        self.background = background
+
+        self.summary: str = ""
+        self._messages: List[Dict] = []
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    # --- list-like interface ---
+
+    def append(self, message: Dict):
+        """
+        Add a message ({'role': ..., 'content': ...}) and summarize older turns if needed.
+
+        Args:
+            message (dict): The chat message.
+        """
+        with self._lock:
+            self._messages.append(message)
+        self._maybe_summarize()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self):
+        return iter(list(self._messages))
+
+    def clear(self):
+        """Forget all turns and the summary."""
+        with self._lock:
+            self._messages.clear()
+            self.summary = ""
+
+    # --- prompt construction ---
+
+    def total_tokens(self) -> int:
+        """Estimated tokens of the summary plus all verbatim messages."""
+        with self._lock:
+            return estimate_tokens(self.summary) + sum(_message_tokens(m) for m in self._messages)
+
+    def get_messages(self) -> List[Dict]:
+        """
+        Build the history to send to the LLM.
+
+        Returns:
+            list: A system message carrying the summary (if any) followed by the most recent
+                messages that fit in max_tokens. The latest message is always included.
+        """
+        with self._lock:
+            summary = self.summary
+            messages = list(self._messages)
+
+        result: List[Dict] = []
+        budget = self.max_tokens
+        if summary:
+            summary_message = {
+                "role": "system",
+                "content": f"Summary of the earlier conversation: {summary}",
+            }
+            budget -= _message_tokens(summary_message)
+        else:
+            summary_message = None
+
+        kept: List[Dict] = []
+        for message in reversed(messages):
+            cost = _message_tokens(message)
+            if kept and cost > budget:
+                break
+            kept.append(message)
+            budget -= cost
+        kept.reverse()
+
+        if summary_message:
+            result.append(summary_message)
+        result.extend(kept)
+        return result
+
+    # --- summarization ---
+
+    def _maybe_summarize(self):
+        """Start a summarization pass if the history is over the threshold and none is running."""
+        if self.summarizer is None:
+            return
+        if self.total_tokens() <= self.max_tokens * self.summarize_threshold:
+            return
+        with self._lock:
+            if len(self._messages) <= self.recent_turns:
+                return
+            if self._worker is not None and self._worker.is_alive():
+                return
+            if self.background:
+                self._worker = threading.Thread(target=self._summarize, daemon=True)
+                self._worker.start()
+                return
+        self._summarize()
+
+    def _summarize(self):
+        """Fold everything but the recent window into the rolling summary."""
+        with self._lock:
+            cutoff = len(self._messages) - self.recent_turns
+            if cutoff <= 0:
+                return
+            old_messages = self._messages[:cutoff]
+            previous = self.summary
+
+        try:
+            new_summary = self.summarizer(previous, old_messages)
+        except Exception as e:
+            log_warning(f"[ConversationMemory] Summarization failed: {e}")
+            return
+        if not new_summary:
+            return
+
+        with self._lock:
+            # Only the summarized prefix is removed; turns appended meanwhile are kept
+            if self._messages[:cutoff] == old_messages:
+                del self._messages[:cutoff]
+                self.summary = new_summary.strip()
+        log_system_message(f"[ConversationMemory] Folded {len(old_messages)} messages into the summary")
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until a running background summarization has finished (mainly for tests)."""
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
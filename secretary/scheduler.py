@@ -7,12 +7,18 @@ import uuid
 from network.tasks import Task            
 from network.internal_communication import Intercom  
 from secretary.utilities.logging import log_system_message, log_warning, log_error  
+from secretary.utilities.google import execute_request
+from secretary.utilities.tracing import traced
+from secretary.utilities.calendar_index import IndexedCalendar, as_local
+from secretary.utilities.slot_finder import SlotPolicy, find_slots
+from secretary.utilities.availability_bitmap import get_availability_bitmaps
+from secretary.utilities.freebusy import get_freebusy_cache
 from secretary.brain import LLMClient
 from config.agents import AGENT_CONFIG
 
 class Scheduler:
 
-    def __init__(self, node_id: str = None, calendar_service=None, network: Intercom = None, brain = None, socketio_instance=None):
+    def __init__(self, node_id: str = None, calendar_service=None, network: Intercom = None, brain = None, socketio_instance=None, client=None):
         """
         Initialize the Scheduler.
 
@@ -22,12 +28,18 @@ class Scheduler:
             network (Intercom): The Intercom/network instance for notifications.
             brain: The Brain instance associated with this node.
             socketio_instance: The shared SocketIO instance.
+            client: Injected OpenAI client. Defaults to the Brain's client.
         """
         self.node_id = node_id
         self.calendar_service = calendar_service
         self.network = network
         self.brain = brain
         self.socketio = socketio_instance
+        self.client = client if client is not None else getattr(brain, 'client', None)
+        # Working hours, buffers and horizon for proposed meeting times (find_perfect_meeting_time)
+        self.slot_policy = SlotPolicy.from_env()
+        # Synced mirror of the Google calendar serving the read paths; set up by event_sync.init_event_sync
+        self.event_cache = None
         self.calendar = self.network.local_calendar if self.network and node_id in self.network.nodes else []
         self.node = self.network.nodes.get(node_id) if self.network and node_id in self.network.nodes else None
 
@@ -42,7 +54,7 @@ class Scheduler:
 
     def get_upcoming_meetings(self, max_results=100):
         """
-        Fetch upcoming meetings from Google Calendar and local storage for this node.
+        Fetch upcoming meetings from Google Calendar (the synced event cache when available) and local storage for this node.
 
         Args:
             max_results (int): Maximum number of meetings to retrieve from Google Calendar.
@@ -53,16 +65,8 @@ class Scheduler:
         google_meetings = []
         if self.calendar_service:
             try:
-                now_utc = datetime.utcnow().isoformat() + 'Z'  # 'Z' indicates UTC time
-                events_result = self.calendar_service.events().list(
-                    calendarId='primary',
-                    timeMin=now_utc,
-                    maxResults=max_results,
-                    singleEvents=True,
-                    orderBy='startTime'
-                ).execute()
-                google_meetings = events_result.get('items', [])
-                log_system_message(f"[{self.node_id}] Fetched {len(google_meetings)} upcoming meetings from Google Calendar.")
+                google_meetings = self._upcoming_events(max_results)
+                log_system_message("[%s] Fetched %d upcoming meetings from Google Calendar.", self.node_id, len(google_meetings))
             except Exception as e:
                 log_error(f"[{self.node_id}] Error fetching upcoming meetings from Google Calendar: {str(e)}")
         else:
@@ -70,7 +74,7 @@ class Scheduler:
 
         local_meetings_transformed = []
         if self.brain and hasattr(self.brain, 'calendar') and self.brain.calendar:
-            log_system_message(f"[{self.node_id}] Found {len(self.brain.calendar)} local meetings.")
+            log_system_message("[%s] Found %d local meetings.", self.node_id, len(self.brain.calendar))
             for local_meeting in self.brain.calendar:
                 # Transform local meeting structure to be compatible with UI expectations (like GCal events)
                 # Ensure start and end times are in the correct format for the UI.
@@ -127,7 +131,7 @@ class Scheduler:
                         if dt_obj_check >= datetime.now(timezone.utc):
                             local_meetings_transformed.append(transformed)
                         else:
-                            log_system_message(f"[{self.node_id}] Skipping past local meeting: {transformed.get('summary')}")
+                            log_system_message("[%s] Skipping past local meeting: %s", self.node_id, transformed.get('summary'))
                     except ValueError as ve:
                          log_warning(f"[{self.node_id}] Could not parse date for local meeting '{transformed.get('summary')}': {start_time_str}. Error: {ve}")
                          local_meetings_transformed.append(transformed) # Append if date parsing fails, let UI handle display or ignore
@@ -170,7 +174,7 @@ class Scheduler:
 
         merged_meetings.sort(key=get_sort_key)
 
-        log_system_message(f"[{self.node_id}] Total upcoming meetings (merged): {len(merged_meetings)}")
+        log_system_message("[%s] Total upcoming meetings (merged): %d", self.node_id, len(merged_meetings))
         
         return merged_meetings
 
@@ -218,8 +222,9 @@ class Scheduler:
                 }
             }
 
-            # Insert the event into the primary calendar
-            event = self.calendar_service.events().insert(calendarId='primary', body=event).execute()
+            # Insert the event into the primary calendar (may run on a worker thread, see Brain.generate_tasks_from_plan)
+            event = execute_request(self.calendar_service.events().insert(calendarId='primary', body=event))
+            self._event_changed(event)
             log_system_message(f"[Scheduler] [{self.node_id}] Task reminder created: {event.get('htmlLink')}")
             
         except Exception as e:
@@ -277,6 +282,7 @@ class Scheduler:
             log_system_message(f"[Scheduler] [{self.node_id}] Attempting to create google calendar event: {event}")
             # Insert the meeting event into the calendar and capture the response event
             event = self.calendar_service.events().insert(calendarId='primary', body=event).execute()
+            self._event_changed(event)
             msg = f"[{self.node_id}] Meeting created: {event.get('htmlLink')}"
             log_system_message(msg)
             
@@ -649,6 +655,8 @@ class Scheduler:
             }
 
             # --- Start: Conflict Check and Resolution ---
+            # One free/busy request for everyone; the checks below and the slot search reuse it
+            self._google_busy(participants, *self._busy_window(start_datetime))
             conflict_found = False
             conflicting_participant = None
             for p in participants:
@@ -662,14 +670,14 @@ class Scheduler:
                 # Call find_perfect_meeting_time to get a suggestion
                 exist_conflict, proposed_start, proposed_end = self.find_perfect_meeting_time(participants, start_datetime, end_datetime)
 
-                if not proposed_start: # Handle case where LLM fails to propose a time
+                if not proposed_start: # No free slot for everyone within the search horizon
                      msg = f"[{self.node_id}] Could not find an alternative time slot for all participants."
                      print(msg)
                      return msg
 
-                # Always check the exist_conflict flag from the LLM's analysis
+                # Always check the exist_conflict flag from the availability check
                 if exist_conflict:
-                    # Ask user to confirm the LLM's proposed time
+                    # Ask user to confirm the proposed time
                     formatted_proposed_time = proposed_start.strftime('%Y-%m-%d %H:%M')
                     confirm_prompt = (f"Conflict found for {conflicting_participant}. The next available slot for all participants seems to be "
                                       f"{formatted_proposed_time}. Schedule then? (yes/no)")
@@ -719,9 +727,8 @@ class Scheduler:
                     #     # If declined, we stop here as per current requirement.
                     #     return msg
                 else:
-                     # LLM indicated no conflict OR suggested the original time was fine?
-                     # Schedule at the time the LLM proposed (which might be the original time if it found no conflict)
-                     log_system_message(f"[{self.node_id}] LLM found no conflict or suggested using {proposed_start}. Scheduling at proposed time.")
+                     # No conflict across the participants' own calendars: keep the requested time
+                     log_system_message(f"[{self.node_id}] No conflict across participants' calendars, scheduling at {proposed_start}.")
                      meeting_id = f"meeting_{int(datetime.now().timestamp())}"
                      meeting_title = meeting_data.get("title", f"Meeting scheduled by {self.node_id}")
                      self._create_calendar_meeting(meeting_id, meeting_title, participants, proposed_start, proposed_end)
@@ -760,6 +767,10 @@ class Scheduler:
     def _check_time_with_attendees(self, participant_id: str, start_datetime: datetime, end_datetime: datetime) -> bool:
         """
         Check if the specified time range is available for a participant.
+
+        Reads the same calendars as the slot search (see _busy_intervals): the participant's own brain
+        calendar when they are on this network, otherwise this node's, plus their Google free/busy times
+        when there is a calendar service.
         
         Args:
             participant_id (str): The identifier for the participant to check.
@@ -769,38 +780,27 @@ class Scheduler:
         Returns:
             bool: True if the time is available, False otherwise.
         """
+        return not self._busy_intervals(participant_id, as_local(start_datetime), as_local(end_datetime))
 
-        participant_calendar = self.brain.calendar
-
-        #print(participant_calendar)
-
-        if not participant_calendar:
-            return True
-        
-        for meeting in participant_calendar:
-            # only consider meetings that include this participant
-            if participant_id not in meeting['participants']:
-                continue
-
-            # parse ISO strings to datetimes
-            meeting_start = datetime.fromisoformat(meeting['start_time'])
-            meeting_end = datetime.fromisoformat(meeting['end_time'])
-            
-            # Check if the proposed time overlaps with any existing meetings
-            if (start_datetime > meeting_start and end_datetime < meeting_end):
-                return False
-            elif (start_datetime == meeting_start or end_datetime == meeting_end):
-                return False
-            elif (start_datetime < meeting_end and end_datetime > meeting_start):
-                return False
-            else:
-                return True
+    @staticmethod
+    def _reschedule_in_brain(brain, event_id: str, start_datetime: datetime, end_datetime: datetime):
+        """Move a rescheduled event's entries in a brain's calendar (and its availability index) to the new times."""
+        calendar = getattr(brain, 'calendar', None)
+        if isinstance(calendar, IndexedCalendar):
+            calendar.reschedule(event_id, start_datetime, end_datetime)
 
-    def find_perfect_meeting_time(self, participants: list[str], start_datetime: datetime, end_datetime: datetime) -> str:
+    @traced("scheduler.find_perfect_meeting_time")
+    def find_perfect_meeting_time(self, participants: list[str], start_datetime: datetime, end_datetime: datetime) -> tuple:
         """
         Find a perfect meeting time for all participants by checking their availability.
 
-        Goes through all participants' calendars and finds a time slot that works for everyone.
+        Merges every participant's busy intervals, local and from Google free/busy (fetched for all
+        participants in one request, see freebusy), and proposes the earliest slot of
+        the same duration within working hours, keeping the configured buffer around meetings and
+        searching up to the horizon (self.slot_policy); with SCHEDULER_BITMAPS the search runs over cached
+        per-participant availability bitmaps instead (see availability_bitmap). With SCHEDULER_LLM_TIEBREAK the LLM picks
+        among the candidate slots; it never decides availability. The proposal is stored in
+        brain.confirmation_context for the user's yes/no.
         
         Args:
             participants (list): The identifier for all participants.
@@ -808,83 +808,186 @@ class Scheduler:
             end_datetime (datetime): The proposed end time for the meeting.
             
         Returns:
-            str: A confirmation message if the proposed meeting should be scheduled. (use class Confirmation)
+            tuple: (exist_conflict, proposed_start_time, proposed_end_time). Without a conflict the
+                requested times are returned; without a free slot in the horizon both times are None.
         """
+        start_datetime, end_datetime = as_local(start_datetime), as_local(end_datetime)
+        duration = end_datetime - start_datetime
+        search_from = max(start_datetime, datetime.now().replace(second=0, microsecond=0))
+        remote = self._google_busy(participants, *self._busy_window(start_datetime))
+
+        exist_conflict = any(self._busy_intervals(p, start_datetime, end_datetime) for p in participants)
+        if not exist_conflict:
+            return False, start_datetime, end_datetime
+
+        bitmaps = get_availability_bitmaps()
+        if bitmaps is not None and bitmaps.supports(self.slot_policy):
+            sources = [(p, self._calendar_version(p), lambda s, e, p=p: self._local_busy(p, s, e))
+                       for p in participants]
+            sources += [(f"google:{p}", fb.version, fb.overlapping) for p, fb in remote.items()]
+            sources += [(f"google:{p}", None, lambda s, e: [(s, e)]) for p in self._google_unknown(participants, remote)]
+            candidates = bitmaps.find_slots(sources, duration, search_from, self.slot_policy)
+        else:
+            search_to = search_from + self.slot_policy.horizon + duration
+            busy = [interval for p in participants for interval in self._busy_intervals(p, search_from, search_to)]
+            candidates = find_slots(busy, duration, search_from, self.slot_policy)
+        log_system_message("[%s] Candidate slots for %s: %s", self.node_id, participants,
+                           [s.isoformat() for s, _ in candidates])
+        if not candidates:
+            return True, None, None
 
-        print('DEBUG: Entered find_perfect_meeting_time')
+        proposed_start_time, proposed_end_time = self._pick_slot(participants, candidates)
 
-        duration = (end_datetime - start_datetime).total_seconds() / 60
-        calendar = self.brain.calendar
-        if not calendar:
-            print(f" Calendar service not available, can't schedule meetings")
-            print(calendar)
-            return
-        
-        # TODO: Replace with a conversation between agents to find the perfect meeting time
-        prompt = f"""
-        Extract all meetings from this calender for every node: '{calendar}'
+        self.brain.confirmation_context = {
+            'active': True,
+            'context': 'schedule meeting',
+            'initial_message': f"Proposed meeting time: {proposed_start_time} to {proposed_end_time}",
+            'start_datetime': proposed_start_time,
+            'end_datetime': proposed_end_time
+        }
 
-        Identitfy if there are any potential conflicts with the existing meetings in {calendar}
-        with a new meeting that goes from {start_datetime} to {end_datetime} with {participants} as participants.
+        return exist_conflict, proposed_start_time, proposed_end_time
 
-        If there is a conflict return the meeting time and participants of the conflicting meeting and propose the next possible time slot with a duration of {duration} minutes
-        that is free for all participants: {participants}. 
-        
-        Return a JSON object with these fields:
-        - exist_conflict: A bool that is true if there are meeting conflicts and false otherwise 
-        - proposed_start_time: The start time of the next possible meeting slot if there are meeting conflicts and None otherwise
-        
-        IMPORTANT: exist_conflict MUST be a bool. proposed_start_time MUST be a datetime. ALL participants MUST be free (i.e. have no meetings scheduled) during the proposed time slot.
+    def _busy_intervals(self, participant_id: str, start_datetime: datetime, end_datetime: datetime) -> list:
         """
-    
-        response = self.node.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"}
-            )
-        
-        response_content = response.choices[0].message.content
-
-        print(response_content, participants)
+        A participant's busy (start, end) intervals overlapping the range, local and from Google.
 
-        # response_content = LLMClient.chat(self, prompt)
-        # print(f"[{self.node_id}] Response: {response_content}")
+        When Google could not tell (see _google_unknown) the whole range counts as busy.
+        """
+        busy = self._local_busy(participant_id, start_datetime, end_datetime)
+        remote = self._google_busy([participant_id], start_datetime, end_datetime)
+        if participant_id in remote:
+            busy.extend(remote[participant_id].overlapping(start_datetime, end_datetime))
+        elif self._google_unknown([participant_id], remote):
+            busy.append((start_datetime, end_datetime))
+        return busy
+
+    def _local_busy(self, participant_id: str, start_datetime: datetime, end_datetime: datetime) -> list:
+        """
+        A participant's busy (start, end) intervals overlapping the range, from the local calendars.
 
-        try:
-            reschedule_data = json.loads(response_content)
-        except json.JSONDecodeError as e:
-            msg = f"[{self.node_id}] Error parsing rescheduling JSON: {e}"
-            print(f"[{self.node_id}] Error parsing rescheduling JSON: {e}")
-            return msg
-        
-        print(reschedule_data)
+        Read from the participant's own brain calendar when the node is on this network (that is where
+        their meetings are recorded), otherwise from this node's calendar.
+        """
+        calendar = self._calendar_of(participant_id)
+        if isinstance(calendar, IndexedCalendar):
+            return calendar.busy(participant_id, start_datetime, end_datetime)
+        busy = []
+        for meeting in calendar or []:
+            if participant_id not in meeting.get('participants', []):
+                continue
+            meeting_start = as_local(datetime.fromisoformat(meeting['start_time']))
+            meeting_end = as_local(datetime.fromisoformat(meeting['end_time']))
+            if meeting_start < end_datetime and meeting_end > start_datetime:
+                busy.append((meeting_start, meeting_end))
+        return busy
 
-        exist_conflict = None
-        if "exist_conflict" in reschedule_data and reschedule_data["exist_conflict"]:
-            exist_conflict = bool(reschedule_data["exist_conflict"])
-        
-        print(exist_conflict)
+    def _busy_window(self, start_datetime: datetime) -> tuple:
+        """
+        Range fetched from Google free/busy for a scheduling request at start_datetime.
 
-        proposed_start_time = None
-        if "proposed_start_time" in reschedule_data and reschedule_data['proposed_start_time']:
-            proposed_start_time = datetime.strptime(reschedule_data['proposed_start_time'], "%Y-%m-%dT%H:%M:%S")
-        print(proposed_start_time)
-        
-        proposed_end_time = proposed_start_time + (end_datetime - start_datetime)
+        Whole days from the day before the request to past the slot search horizon (and the bitmap
+        grid), so the conflict checks and the slot search are all answered by one cached query.
+        """
+        start_datetime = as_local(start_datetime)
+        day = datetime.combine(start_datetime.date(), datetime.min.time())
+        search_day = max(day, datetime.combine(datetime.now().date(), datetime.min.time()))
+        return day - timedelta(days=1), search_day + self.slot_policy.horizon + timedelta(days=3)
+
+    def _google_calendar_id(self, participant_id: str) -> str:
+        """Calendar id of a participant for free/busy (the address they are invited with)."""
+        return 'primary' if participant_id == self.node_id else f'{participant_id}@example.com'
+
+    def _google_busy(self, participants: list, start_datetime: datetime, end_datetime: datetime) -> dict:
+        """Google free/busy per participant (see freebusy.FreeBusyCache); empty without a calendar service."""
+        if not self.calendar_service or not participants:
+            return {}
+        calendars = {p: self._google_calendar_id(p) for p in participants}
+        return get_freebusy_cache().query(self.calendar_service, calendars, start_datetime, end_datetime)
+
+    def _google_unknown(self, participants: list, remote: dict) -> list:
+        """
+        Participants whose Google free/busy lookup failed (missing from _google_busy's result).
 
-        self.brain.confirmation_context = {
-            'active': True,
-            'context': 'schedule meeting',
-            'initial_message': f"Proposed meeting time: {proposed_start_time} to {proposed_end_time}",
-            'start_datetime': proposed_start_time,
-            'end_datetime': proposed_end_time
-        }
+        Their availability is unknown, not free, so they are treated as busy until a lookup succeeds.
+        """
+        if not self.calendar_service:
+            return []
+        unknown = [p for p in participants if p not in remote]
+        if unknown:
+            log_warning("[%s] Google free/busy unknown for %s, treating them as busy", self.node_id, unknown)
+        return unknown
 
-        print(exist_conflict, proposed_start_time, proposed_end_time)
+    def _event_changed(self, event: dict, deleted: bool = False):
+        """
+        Reflect an event this node inserted, updated or deleted in Google: update the event cache and drop
+        the attendees' cached free/busy.
+        """
+        if self.event_cache is not None:
+            if deleted:
+                self.event_cache.discard(event.get('id'))
+            else:
+                self.event_cache.apply(event)
+        get_freebusy_cache().invalidate(['primary'] + [a.get('email') for a in event.get('attendees', [])])
 
-        # TODO: Return a confirmation message with the proposed time slot and participants (class Confirmation)      
-        return exist_conflict, proposed_start_time, proposed_end_time
+    def _upcoming_events(self, max_results: int) -> list:
+        """
+        Upcoming events of the primary calendar in start order: from the event cache while it is fresh
+        (see event_sync), otherwise listed from Google.
+        """
+        if self.event_cache is not None and self.event_cache.ready:
+            return self.event_cache.upcoming(max_results)
+        events_result = self.calendar_service.events().list(
+            calendarId='primary',
+            timeMin=datetime.now(timezone.utc).isoformat(),
+            maxResults=max_results,
+            singleEvents=True,
+            orderBy='startTime'
+        ).execute()
+        return events_result.get('items', [])
+
+    def _calendar_of(self, participant_id: str) -> list:
+        """The calendar holding a participant's meetings: their own brain's if on this network, else ours."""
+        node = self.network.nodes.get(participant_id) if self.network else None
+        calendar = getattr(getattr(node, 'brain', node), 'calendar', None)
+        return calendar if isinstance(calendar, list) else self.brain.calendar
+
+    def _calendar_version(self, participant_id: str):
+        """Version of the participant's meetings for availability caches; None (don't cache) for plain lists."""
+        calendar = self._calendar_of(participant_id)
+        return calendar.version(participant_id) if isinstance(calendar, IndexedCalendar) else None
+
+    def _pick_slot(self, participants: list, candidates: list) -> tuple:
+        """
+        Choose among free slots: the earliest, or the LLM's pick when the tie-breaker is enabled.
 
+        The prompt only lists the candidates (all equally available), so its size does not grow with
+        the calendar; any failure falls back to the earliest slot.
+        """
+        if not self.slot_policy.llm_tiebreak or len(candidates) < 2 or self.client is None:
+            return candidates[0]
+        meeting_context = getattr(self.brain, 'meeting_context', None) or {}
+        title = (meeting_context.get('collected_info') or {}).get('title') or "a meeting"
+        options = "\n".join(f"{i}: {s.strftime('%A %Y-%m-%d %H:%M')} - {e.strftime('%H:%M')}"
+                             for i, (s, e) in enumerate(candidates))
+        prompt = (
+            f"All participants ({', '.join(participants)}) are free at each of these times for {title}:\n"
+            f"{options}\n\n"
+            "Pick the most convenient one (prefer sensible times of day and sooner dates unless the title "
+            "suggests otherwise). Return a JSON object with the field 'choice': the option number."
+        )
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"}
+            )
+            choice = int(json.loads(response.choices[0].message.content).get("choice", 0))
+            if 0 <= choice < len(candidates):
+                return candidates[choice]
+        except Exception as e:
+            log_warning("[%s] Slot tie-breaker failed, using the earliest slot: %s", self.node_id, e)
+        return candidates[0]
 
     def _handle_list_meetings(self):
         """
@@ -914,16 +1017,7 @@ class Scheduler:
             return msg
         
         try:
-            # Retrieve current time in the required ISO format for querying events
-            now = datetime.now(timezone.utc).isoformat()
-            events_result = self.calendar_service.events().list(
-                calendarId='primary',
-                timeMin=now,
-                maxResults=10,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            events = events_result.get('items', [])
+            events = self._upcoming_events(10)
             
             if not events:
                 msg = f"[{self.node_id}] No upcoming meetings found."
@@ -949,6 +1043,7 @@ class Scheduler:
             return msg
 
     # TODO: Refactor this function to have return values instead of print statements 
+    @traced("scheduler.reschedule_meeting")
     def _handle_meeting_rescheduling(self, message):
         """
         Handle meeting rescheduling requests by extracting new scheduling details and updating the event.
@@ -993,7 +1088,7 @@ class Scheduler:
             The meeting_identifier MUST be a simple string.
             """
             
-            response = self.node.client.chat.completions.create(
+            response = self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[{"role": "user", "content": prompt}],
                 response_format={"type": "json_object"}
@@ -1044,15 +1139,7 @@ class Scheduler:
             
             # Retrieve upcoming meetings to search for a matching event
             try:
-                now = datetime.now(timezone.utc).isoformat()
-                events_result = self.calendar_service.events().list(
-                    calendarId='primary',
-                    timeMin=now,
-                    maxResults=20,
-                    singleEvents=True,
-                    orderBy='startTime'
-                ).execute()
-                events = events_result.get('items', [])
+                events = self._upcoming_events(20)
             except Exception as e:
                 print(f"[{self.node_id}] Error fetching calendar events: {str(e)}")
                 return
@@ -1175,6 +1262,7 @@ class Scheduler:
                     eventId=target_event['id'],
                     body=target_event
                 ).execute()
+                self._event_changed(updated_event)
                 
                 # Print success message with user-friendly time format
                 meeting_title = updated_event.get('summary', 'Untitled meeting')
@@ -1187,6 +1275,7 @@ class Scheduler:
                 for meeting in self.calendar:
                     if meeting.get('event_id') == updated_event['id']:
                         meeting['meeting_info'] = f"{meeting_title} (Rescheduled to {formatted_date} at {formatted_time})"
+                self._reschedule_in_brain(self.brain, updated_event['id'], new_start_datetime, new_end_datetime)
                 
                 # Notify all attendees about the rescheduled meeting
                 attendees = updated_event.get('attendees', [])
@@ -1197,6 +1286,9 @@ class Scheduler:
                         for meeting in self.network.nodes[attendee_id].calendar:
                             if meeting.get('event_id') == updated_event['id']:
                                 meeting['meeting_info'] = f"{meeting_title} (Rescheduled to {formatted_date} at {formatted_time})"
+                        if attendee_id != self.node_id:
+                            self._reschedule_in_brain(getattr(self.network.nodes[attendee_id], 'brain', None),
+                                                      updated_event['id'], new_start_datetime, new_end_datetime)
                         
                         # Send notifications
                         notification = (
@@ -1214,6 +1306,7 @@ class Scheduler:
         except Exception as e:
             print(f"[{self.node_id}] General error in meeting rescheduling: {str(e)}")
     
+    @traced("scheduler.cancel_meeting")
     def _handle_meeting_cancellation(self, message):
         """
         Handle meeting cancellation requests based on natural language commands.
@@ -1247,7 +1340,7 @@ class Scheduler:
             Only include information that is explicitly mentioned.
             """
             
-            response = self.node.client.chat.completions.create(
+            response = self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[{"role": "user", "content": prompt}],
                 response_format={"type": "json_object"}
@@ -1260,15 +1353,7 @@ class Scheduler:
                 return self._fallback_cancel_meeting(cancel_data)
             
             # Get upcoming meetings
-            now = datetime.now(timezone.utc).isoformat()
-            events_result = self.calendar_service.events().list(
-                calendarId='primary',
-                timeMin=now,
-                maxResults=10,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            events = events_result.get('items', [])
+            events = self._upcoming_events(10)
             
             if not events:
                 msg = f"[{self.node_id}] No upcoming meetings found to cancel."
@@ -1309,6 +1394,7 @@ class Scheduler:
                         calendarId='primary',
                         eventId=event['id']
                     ).execute()
+                    self._event_changed(event, deleted=True)
                     
                     # Remove the event from the local calendar records
                     self.calendar = [m for m in self.calendar if m.get('event_id') != event['id']]
@@ -1451,7 +1537,7 @@ class Scheduler:
             list: List(Dict[str, Any]) of upcoming meetings.
         """
         
-        log_system_message(f"[Scheduler] [{self.node_id}] Retrieving local meetings on date: {date}")
+        log_system_message("[Scheduler] [%s] Retrieving local meetings on date: %s", self.node_id, date)
         
         calendar = self.brain.calendar
         meeting_list = []
@@ -1464,7 +1550,7 @@ class Scheduler:
             
             if event_dt.date() == parsed_date:
                 meeting_list.append(event)
-                log_system_message(f"[Scheduler] [{self.node_id}] Meeting found: {event.get('meeting_info')}")
+                log_system_message("[Scheduler] [%s] Meeting found: %s", self.node_id, event.get('meeting_info'))
                 print(f"[{self.node_id}] Meeting found: {event.get('meeting_info')}")
         
         return meeting_list
@@ -1472,6 +1558,7 @@ class Scheduler:
         pass
         
         
+    @traced("scheduler.create_calendar_meeting")
     def _create_calendar_meeting(self, meeting_id, title, participants, start_datetime, end_datetime):
         """
         Create a meeting event in Google Calendar.
@@ -1515,6 +1602,7 @@ class Scheduler:
 
         try:
             event = self.calendar_service.events().insert(calendarId='primary', body=event).execute()
+            self._event_changed(event)
             
             # Correctly format date and time for user display
             meeting_date = start_datetime.strftime("%Y-%m-%d")
@@ -1613,6 +1701,7 @@ class Scheduler:
                 eventId=target_event_id,
                 body=event
             ).execute()
+            self._event_changed(updated_event)
             
             # Format date and time for user-friendly display
             meeting_title = updated_event.get('summary', 'Untitled meeting')
@@ -1626,6 +1715,7 @@ class Scheduler:
             for meeting in self.calendar:
                 if meeting.get('event_id') == updated_event['id']:
                     meeting['meeting_info'] = f"{meeting_title} (Rescheduled to {formatted_date} at {formatted_time})"
+            self._reschedule_in_brain(self.brain, updated_event['id'], new_start_datetime, new_end_datetime)
             
             # Notify each attendee about the updated meeting details
             attendees = updated_event.get('attendees', [])
@@ -1636,6 +1726,9 @@ class Scheduler:
                     for meeting in self.network.nodes[attendee_id].calendar:
                         if meeting.get('event_id') == updated_event['id']:
                             meeting['meeting_info'] = f"{meeting_title} (Rescheduled to {formatted_date} at {formatted_time})"
+                    if attendee_id != self.node_id:
+                        self._reschedule_in_brain(getattr(self.network.nodes[attendee_id], 'brain', None),
+                                                  updated_event['id'], new_start_datetime, new_end_datetime)
                     
                     # Send notification
                     notification = (
@@ -1655,6 +1748,7 @@ class Scheduler:
             print(f"[{self.node_id}] Error completing meeting rescheduling: {str(e)}")
             print(f"[{self.node_id}] Response: There was an error rescheduling the meeting. Please try again.")
     
+    @traced("scheduler.handle_calendar")
     def handle_calendar(self, intent: dict, message: str):
         """
         Handle calendar-related commands such as scheduling or cancelling meetings.
@@ -0,0 +1,184 @@
+"""Vectorized availability bitmaps for multi-participant slot search (optional, needs numpy).
+
+Each participant's busy time is rasterized onto a grid of policy.step cells (15 minutes by default)
+that starts at midnight of the search day and covers the horizon. The bitmap is built lazily, on the
+first search that needs it, and cached per participant until their calendar changes
+(IndexedCalendar.version). A search over N participants is then:
+
+  - busy = OR of the N cached bitmaps, free = ~busy & working-hours mask
+  - the cumulative sum of free tells, for every cell, whether the next k cells are all free
+  - the first such cell of each free gap is a slot, as in slot_finder.find_slots
+
+Meetings and buffers off the grid are rounded outwards, so a slot is never proposed inside a busy
+period; for grid-aligned calendars the result is the same as find_slots. Enable with
+SCHEDULER_BITMAPS=1; without numpy (or with a step that doesn't divide a day) the sweep line is used.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, time, timedelta
+from typing import Callable, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional, slot_finder's sweep line is used instead
+    np = None
+
+from secretary.utilities.slot_finder import Interval, SlotPolicy
+
+# (cache key, version or None to skip the cache, intervals(start, end) called only to build the bitmap)
+Source = Tuple[str, Optional[object], Callable[[datetime, datetime], List[Interval]]]
+
+_DAY = timedelta(days=1)
+
+
+def _since_midnight(value: time) -> timedelta:
+    return timedelta(hours=value.hour, minutes=value.minute, seconds=value.second)
+
+
+def rasterize(intervals: List[Interval], origin: datetime, step: timedelta, size: int,
+              buffer: timedelta = timedelta(0)) -> "np.ndarray":
+    """
+    Busy bitmap: cell i is True if [origin + i*step, origin + (i+1)*step) meets a (buffered) interval.
+
+    Args:
+        intervals (list): (start, end) pairs, any order, may overlap or fall outside the grid.
+        origin (datetime): Start of cell 0.
+        step (timedelta): Cell size.
+        size (int): Number of cells.
+        buffer (timedelta): Widen every interval by this much on both sides.
+
+    Returns:
+        np.ndarray: Boolean array of length size.
+    """
+    if not intervals:
+        return np.zeros(size, dtype=bool)
+    offsets = np.array(intervals, dtype="datetime64[us]") - np.datetime64(origin, "us")
+    cell, pad = np.timedelta64(step, "us"), np.timedelta64(buffer, "us")
+    lo = np.clip((offsets[:, 0] - pad) // cell, 0, size)
+    hi = np.clip(-((-offsets[:, 1] - pad) // cell), 0, size)  # ceil
+    depth = np.cumsum(np.bincount(lo, minlength=size + 1) - np.bincount(hi, minlength=size + 1))
+    return depth[:size] > 0
+
+
+def working_mask(policy: SlotPolicy, origin: datetime, size: int) -> "np.ndarray":
+    """Cells lying entirely within working hours on a workday; origin must be a midnight."""
+    per_day = _DAY // policy.step
+    day = np.zeros(per_day, dtype=bool)
+    day[-(-_since_midnight(policy.work_start) // policy.step):_since_midnight(policy.work_end) // policy.step] = True
+    days = -(-size // per_day)
+    workdays = np.isin((origin.weekday() + np.arange(days)) % 7, list(policy.workdays))
+    return (np.tile(day, days) & np.repeat(workdays, per_day))[:size]
+
+
+class AvailabilityBitmaps:
+    """
+    Cache of per-participant busy bitmaps and the vectorized slot search over them.
+
+    Attributes:
+        max_entries (int): Bitmaps kept; the least recently used are dropped.
+        hits (int): Searches served from a cached bitmap.
+        misses (int): Bitmaps built.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        if np is None:
+            raise RuntimeError("Availability bitmaps need the numpy package")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (version, grid, bitmap)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def supports(policy: SlotPolicy) -> bool:
+        """Whether the policy's step tiles a day (the grid repeats daily)."""
+        return policy.step > timedelta(0) and _DAY % policy.step == timedelta(0)
+
+    def bitmap(self, source: Source, origin: datetime, step: timedelta, size: int,
+               buffer: timedelta) -> "np.ndarray":
+        """The source's busy bitmap on the grid, from the cache while its version is unchanged."""
+        key, version, intervals = source
+        grid = (origin, step, size, buffer)
+        if version is not None:
+            with self._lock:
+                entry = self._cache.get(key)
+                if entry is not None and entry[0] == version and entry[1] == grid:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return entry[2]
+        busy = rasterize(intervals(origin - buffer, origin + size * step + buffer), origin, step, size, buffer)
+        busy.flags.writeable = False
+        with self._lock:
+            self.misses += 1
+            if version is not None:
+                self._cache[key] = (version, grid, busy)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return busy
+
+    def find_slots(self, sources: Iterable[Source], duration: timedelta, start: datetime, policy: SlotPolicy,
+                   limit: int = None) -> List[Interval]:
+        """
+        Earliest free slots for everyone, one per free gap (see slot_finder.find_slots).
+
+        Args:
+            sources (Iterable): (key, version, intervals) per participant; see Source.
+            duration (timedelta): Meeting length.
+            start (datetime): Earliest acceptable start (naive local time).
+            policy (SlotPolicy): Working hours, workdays, buffer, horizon and grid step.
+            limit (int, optional): Number of slots (default policy.candidates).
+
+        Returns:
+            list: Up to `limit` (start, end) slots in chronological order.
+        """
+        limit = policy.candidates if limit is None else limit
+        step = policy.step
+        # Anchored at midnight and a fixed size, so cached bitmaps serve every search of the day
+        origin = datetime.combine(start.date(), time(0))
+        size = (policy.horizon + 2 * _DAY) // step
+        busy = np.zeros(size, dtype=bool)
+        for source in sources:
+            busy |= self.bitmap(source, origin, step, size, policy.buffer)
+
+        free = ~busy & working_mask(policy, origin, size)
+        free[:-(-(start - origin) // step)] = False
+        free[(start + policy.horizon - origin) // step:] = False
+
+        cells = max(1, -(-duration // step))
+        if cells > size:
+            return []
+        counts = np.concatenate(([0], np.cumsum(free, dtype=np.int32)))
+        fits = counts[cells:] - counts[:-cells] == cells
+        firsts = np.flatnonzero(fits & ~np.concatenate(([False], fits[:-1])))[:limit]
+        return [(origin + int(i) * step, origin + int(i) * step + duration) for i in firsts]
+
+
+_bitmaps: Optional[AvailabilityBitmaps] = None
+_bitmaps_configured = False
+_bitmaps_lock = threading.Lock()
+
+
+def get_availability_bitmaps() -> Optional[AvailabilityBitmaps]:
+    """
+    Return the process-wide bitmap cache, or None when disabled. Configured on first use:
+      - SCHEDULER_BITMAPS: "1" to search with bitmaps (default off; needs numpy)
+      - SCHEDULER_BITMAP_CACHE: bitmaps kept (default 4096)
+    """
+    global _bitmaps, _bitmaps_configured
+    with _bitmaps_lock:
+        if not _bitmaps_configured:
+            _bitmaps_configured = True
+            if np is not None and os.getenv("SCHEDULER_BITMAPS", "0").lower() in ("1", "true", "yes"):
+                _bitmaps = AvailabilityBitmaps(int(os.getenv("SCHEDULER_BITMAP_CACHE", "4096")))
+        return _bitmaps
+
+
+def set_availability_bitmaps(bitmaps: Optional[AvailabilityBitmaps]) -> Optional[AvailabilityBitmaps]:
+    """Replace the process-wide cache (None disables it, e.g. in tests); returns the previous one."""
+    global _bitmaps, _bitmaps_configured
+    with _bitmaps_lock:
+        previous, _bitmaps, _bitmaps_configured = _bitmaps, bitmaps, True
+        return previous
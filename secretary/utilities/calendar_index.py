@@ -0,0 +1,271 @@
+"""Per-participant availability index over the local calendar.
+
+IndexedCalendar is a drop-in list of meeting dicts (as stored in Brain.calendar) that keeps, for every
+participant, the meeting start times and end times in sorted arrays. Every list mutation (append,
+remove, slice assignment, ...) updates the index, so availability queries never scan the calendar:
+
+  - is_free / count_overlaps: #starts < end  -  #ends <= start, two bisections, O(log n)
+  - conflicts: the meetings starting in [start - longest meeting, end), O(log n + k)
+
+Meetings edited in place (new times or participants) must be passed to reindex(); reschedule() does
+that for all entries of an event. version(participant) changes whenever that participant's indexed
+meetings do, so caches derived from them (availability_bitmap) know when to rebuild. Times are compared as naive local datetimes; aware ISO strings are
+converted. Entries without parseable times or a participants list stay in the list but not the index.
+"""
+
+import itertools
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Process-wide, so a version never repeats across calendars
+_versions = itertools.count(1)
+
+
+def as_local(value: datetime) -> datetime:
+    """Naive local datetime (aware values are converted to local time)."""
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo is not None else value
+
+
+def _parse(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return as_local(value)
+    try:
+        return as_local(datetime.fromisoformat(value.replace("Z", "+00:00")))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _interval(meeting) -> Optional[Tuple[datetime, datetime, tuple]]:
+    """(start, end, participants) of a meeting dict, or None if it can't be indexed."""
+    if not isinstance(meeting, dict):
+        return None
+    start, end = _parse(meeting.get("start_time")), _parse(meeting.get("end_time"))
+    participants = meeting.get("participants")
+    if start is None or end is None or not isinstance(participants, (list, tuple, set)):
+        return None
+    return start, max(start, end), tuple(dict.fromkeys(participants))
+
+
+class _Timeline:
+    """One participant's meetings: starts (with the meetings, in start order) and ends, both sorted."""
+
+    __slots__ = ("starts", "meetings", "meeting_ends", "ends", "longest")
+
+    def __init__(self):
+        self.starts: List[datetime] = []
+        self.meetings: List[dict] = []
+        self.meeting_ends: List[datetime] = []  # end of meetings[i]
+        self.ends: List[datetime] = []
+        self.longest = timedelta(0)  # upper bound on durations (not lowered on removal)
+
+    def add(self, start: datetime, end: datetime, meeting: dict):
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.meetings.insert(i, meeting)
+        self.meeting_ends.insert(i, end)
+        insort(self.ends, end)
+        self.longest = max(self.longest, end - start)
+
+    def discard(self, start: datetime, end: datetime, meeting: dict):
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.meetings[i] is meeting:
+                del self.starts[i], self.meetings[i], self.meeting_ends[i]
+                del self.ends[bisect_left(self.ends, end)]
+                return
+            i += 1
+
+    def count_overlaps(self, start: datetime, end: datetime) -> int:
+        # Meetings starting before `end`, minus those of them already over by `start`
+        return bisect_left(self.starts, end) - bisect_right(self.ends, start)
+
+    def overlapping(self, start: datetime, end: datetime) -> List[dict]:
+        lo = bisect_left(self.starts, start - self.longest)
+        hi = bisect_left(self.starts, end)
+        return [self.meetings[i] for i in range(lo, hi) if self.meeting_ends[i] > start]
+
+
+class IndexedCalendar(list):
+    """
+    List of meeting dicts with a per-participant interval index.
+
+    Reads behave exactly like a list; slicing and copy() return plain lists.
+    """
+
+    def __init__(self, meetings: Iterable = ()):
+        super().__init__()
+        self._timelines: Dict[str, _Timeline] = {}
+        self._indexed: Dict[int, list] = {}  # id(meeting) -> [(start, end, participants), references]
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self.extend(meetings)
+
+    # --- index maintenance ---
+
+    def _index(self, meeting):
+        entry = self._indexed.get(id(meeting))
+        if entry is not None:
+            entry[1] += 1
+            return
+        interval = _interval(meeting)
+        self._indexed[id(meeting)] = [interval, 1]
+        if interval is None:
+            return
+        start, end, participants = interval
+        for participant in participants:
+            timeline = self._timelines.get(participant)
+            if timeline is None:
+                timeline = self._timelines[participant] = _Timeline()
+            timeline.add(start, end, meeting)
+            self._versions[participant] = next(_versions)
+
+    def _unindex(self, meeting):
+        entry = self._indexed.get(id(meeting))
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del self._indexed[id(meeting)]
+        if entry[0] is None:
+            return
+        start, end, participants = entry[0]
+        for participant in participants:
+            timeline = self._timelines.get(participant)
+            if timeline is not None:
+                timeline.discard(start, end, meeting)
+                self._versions[participant] = next(_versions)
+                if not timeline.starts:
+                    del self._timelines[participant]
+
+    def reindex(self, meeting: dict):
+        """Refresh the index after a meeting's times or participants were changed in place."""
+        with self._lock:
+            entry = self._indexed.get(id(meeting))
+            if entry is None:
+                return
+            references = entry[1]
+            entry[1] = 1
+            self._unindex(meeting)
+            self._index(meeting)
+            self._indexed[id(meeting)][1] = references
+
+    def reschedule(self, event_id: str, start: datetime, end: datetime) -> int:
+        """
+        Move every entry of an event to new times.
+
+        Returns:
+            int: Number of entries updated.
+        """
+        updated = 0
+        with self._lock:
+            for meeting in [m for m in self if isinstance(m, dict) and m.get("event_id") == event_id]:
+                meeting["start_time"] = start.isoformat()
+                meeting["end_time"] = end.isoformat()
+                self.reindex(meeting)
+                updated += 1
+        return updated
+
+    # --- list mutators ---
+
+    def append(self, meeting):
+        with self._lock:
+            super().append(meeting)
+            self._index(meeting)
+
+    def extend(self, meetings):
+        with self._lock:
+            for meeting in list(meetings):
+                self.append(meeting)
+
+    def __iadd__(self, meetings):
+        self.extend(meetings)
+        return self
+
+    def insert(self, index, meeting):
+        with self._lock:
+            super().insert(index, meeting)
+            self._index(meeting)
+
+    def remove(self, meeting):
+        with self._lock:
+            # list.remove compares with ==; unindex the element actually removed
+            del self[self.index(meeting)]
+
+    def pop(self, index=-1):
+        with self._lock:
+            meeting = super().pop(index)
+            self._unindex(meeting)
+            return meeting
+
+    def clear(self):
+        with self._lock:
+            super().clear()
+            for participant in self._timelines:
+                self._versions[participant] = next(_versions)
+            self._timelines.clear()
+            self._indexed.clear()
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            old = self[key] if isinstance(key, slice) else [self[key]]
+            value = list(value) if isinstance(key, slice) else value
+            super().__setitem__(key, value)
+            for meeting in old:
+                self._unindex(meeting)
+            for meeting in (value if isinstance(key, slice) else [value]):
+                self._index(meeting)
+
+    def __delitem__(self, key):
+        with self._lock:
+            old = self[key] if isinstance(key, slice) else [self[key]]
+            super().__delitem__(key)
+            for meeting in old:
+                self._unindex(meeting)
+
+    # --- queries ---
+
+    def count_overlaps(self, participant: str, start: datetime, end: datetime) -> int:
+        """Number of the participant's meetings overlapping [start, end) (touching ends don't count)."""
+        timeline = self._timelines.get(participant)
+        if timeline is None:
+            return 0
+        with self._lock:
+            return timeline.count_overlaps(as_local(start), as_local(end))
+
+    def is_free(self, participant: str, start: datetime, end: datetime) -> bool:
+        """Whether the participant has no meeting overlapping [start, end)."""
+        return self.count_overlaps(participant, start, end) == 0
+
+    def conflicts(self, participant: str, start: datetime, end: datetime) -> List[dict]:
+        """The participant's meetings overlapping [start, end), in start order."""
+        timeline = self._timelines.get(participant)
+        if timeline is None:
+            return []
+        with self._lock:
+            return timeline.overlapping(as_local(start), as_local(end))
+
+    def busy(self, participant: str, start: datetime = None, end: datetime = None) -> List[Tuple[datetime, datetime]]:
+        """The participant's (start, end) intervals in start order, optionally only those overlapping [start, end)."""
+        timeline = self._timelines.get(participant)
+        if timeline is None:
+            return []
+        with self._lock:
+            lo = 0 if start is None else bisect_left(timeline.starts, as_local(start) - timeline.longest)
+            hi = len(timeline.starts) if end is None else bisect_left(timeline.starts, as_local(end))
+            return [(timeline.starts[i], timeline.meeting_ends[i]) for i in range(lo, hi)
+                    if start is None or timeline.meeting_ends[i] > as_local(start)]
+
+    def version(self, participant: str) -> int:
+        """Changes whenever the participant's indexed meetings change; 0 if they never had any."""
+        return self._versions.get(participant, 0)
+
+    def participants(self) -> List[str]:
+        """Participants with at least one indexed meeting."""
+        return list(self._timelines)
+
+    def __reduce__(self):
+        # Pickle/copy as a fresh calendar; the index is rebuilt from the meetings
+        return (IndexedCalendar, (list(self),))
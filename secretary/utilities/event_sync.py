@@ -0,0 +1,199 @@
+"""Local mirror of a node's Google Calendar, kept fresh with incremental sync.
+
+EventCache lists the calendar once (a full sync, from `lookback` ago onwards) and keeps the
+nextSyncToken Google returns with the last page. Every later sync passes that token and receives
+only the events created, changed or cancelled since, so a refresh of an unchanged calendar is a
+single small request. When Google expires the token (HTTP 410 Gone) the cache does a full sync
+again. A background thread refreshes each cache every CALENDAR_SYNC_SECONDS; the scheduler's read
+paths (upcoming meetings, rescheduling and cancellation lookups) are answered from the cache
+while it is fresh, and its own inserts, updates and deletes are applied to it right away.
+"""
+
+import copy
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from secretary.utilities.calendar_index import as_local
+from secretary.utilities.google import execute_request
+from secretary.utilities.logging import log_system_message, log_warning
+
+PAGE_SIZE = 2500  # events().list maximum
+
+
+def _when(moment: dict) -> Optional[datetime]:
+    """Naive local datetime of an event's start/end ({'dateTime': ...} or {'date': ...} for all-day events)."""
+    value = (moment or {}).get('dateTime') or (moment or {}).get('date')
+    try:
+        return as_local(datetime.fromisoformat(value.replace('Z', '+00:00')))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _status(error: Exception) -> Optional[int]:
+    """HTTP status of a googleapiclient HttpError (or a look-alike)."""
+    return getattr(getattr(error, 'resp', None), 'status', None) or getattr(error, 'status_code', None)
+
+
+class EventCache:
+    """
+    Events of one calendar, by id, synchronized incrementally.
+
+    Attributes:
+        service: Google Calendar service.
+        calendar_id (str): Calendar mirrored (default "primary").
+        node_id (str): Node the cache belongs to (for logs).
+        interval (float): Seconds between background syncs.
+        lookback (timedelta): Events that ended longer ago are not kept.
+        sync_token (str): Token for the next incremental sync; None before the first full sync.
+        synced_at (float): time.time() of the last successful sync.
+        requests (int): events().list requests sent.
+        full_syncs (int): Full listings done (the first one and after expired tokens).
+    """
+
+    def __init__(self, service, calendar_id: str = 'primary', node_id: str = None, interval: float = 60.0,
+                 lookback: timedelta = timedelta(days=1)):
+        self.service = service
+        self.calendar_id = calendar_id
+        self.node_id = node_id
+        self.interval = interval
+        self.lookback = lookback
+        self.sync_token: Optional[str] = None
+        self.synced_at: Optional[float] = None
+        self.requests = 0
+        self.full_syncs = 0
+        self._events: Dict[str, dict] = {}
+        self._lock = threading.Lock()  # guards _events
+        self._sync_lock = threading.Lock()  # one sync at a time
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether reads can be served from the cache: synced recently (within a few intervals)."""
+        return self.synced_at is not None and time.time() - self.synced_at < 5 * self.interval
+
+    def sync(self) -> int:
+        """
+        Bring the cache up to date: incrementally with the sync token, or with a full listing.
+
+        Returns:
+            int: Number of events received (changed, added or cancelled for an incremental sync).
+        """
+        with self._sync_lock:
+            if self.sync_token is not None:
+                try:
+                    return self._pull(incremental=True)
+                except Exception as e:
+                    if _status(e) != 410:
+                        raise
+                    log_system_message("[EventCache:%s] Sync token expired, listing the calendar again", self.node_id)
+                    self.sync_token = None
+            return self._pull(incremental=False)
+
+    def _pull(self, incremental: bool) -> int:
+        params = {'calendarId': self.calendar_id, 'singleEvents': True, 'maxResults': PAGE_SIZE}
+        if incremental:
+            params['syncToken'] = self.sync_token
+        else:
+            # Incremental syncs keep the initial request's filters, so this bounds the whole mirror
+            params['timeMin'] = (datetime.now() - self.lookback).astimezone().isoformat()
+        items = []
+        while True:
+            response = execute_request(self.service.events().list(**params))
+            self.requests += 1
+            items.extend(response.get('items', []))
+            if not response.get('nextPageToken'):
+                break
+            params['pageToken'] = response['nextPageToken']
+
+        with self._lock:
+            if not incremental:
+                self._events = {}
+                self.full_syncs += 1
+            for event in items:
+                self._apply(event)
+            self._prune()
+        self.sync_token = response.get('nextSyncToken')
+        self.synced_at = time.time()
+        return len(items)
+
+    def _apply(self, event: dict):
+        if event.get('status') == 'cancelled':
+            self._events.pop(event.get('id'), None)
+        elif event.get('id'):
+            self._events[event['id']] = event
+
+    def _prune(self):
+        cutoff = datetime.now() - self.lookback
+        for event_id in [i for i, e in self._events.items() if (_when(e.get('end')) or cutoff) < cutoff]:
+            del self._events[event_id]
+
+    def apply(self, event: dict):
+        """Record an event this node just inserted or updated (a cancelled one is removed)."""
+        with self._lock:
+            self._apply(copy.deepcopy(event))
+
+    def discard(self, event_id: str):
+        """Forget an event this node just deleted."""
+        with self._lock:
+            self._events.pop(event_id, None)
+
+    def upcoming(self, max_results: int = None, now: datetime = None) -> List[dict]:
+        """
+        Events not yet over, by start time, like events().list(timeMin=now, orderBy='startTime').
+
+        Returns:
+            list: Copies of the events (callers may modify them).
+        """
+        now = as_local(now) if now is not None else datetime.now()
+        with self._lock:
+            events = [e for e in self._events.values() if (_when(e.get('end')) or datetime.max) > now]
+            events.sort(key=lambda e: _when(e.get('start')) or now)
+            return copy.deepcopy(events[:max_results])
+
+    def __len__(self):
+        return len(self._events)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"event-sync-{self.node_id}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                log_warning("[EventCache:%s] Sync failed: %s", self.node_id, e)
+            if self._stop.wait(self.interval):
+                return
+
+
+def init_event_sync(network) -> List[EventCache]:
+    """
+    Give every node's scheduler that has a calendar service an EventCache refreshed in the background:
+      - CALENDAR_SYNC_SECONDS: refresh interval (default 60; 0 = off, read paths list from Google)
+
+    Returns:
+        list: The caches started.
+    """
+    interval = float(os.getenv("CALENDAR_SYNC_SECONDS", "60"))
+    if interval <= 0:
+        return []
+    caches = []
+    for node_id, node in network.nodes.items():
+        scheduler = getattr(node, 'scheduler', None)
+        if scheduler is None or not scheduler.calendar_service or scheduler.event_cache is not None:
+            continue
+        scheduler.event_cache = EventCache(scheduler.calendar_service, node_id=node_id, interval=interval)
+        scheduler.event_cache.start()
+        caches.append(scheduler.event_cache)
+    log_system_message("[EventCache] Syncing %d calendars every %ss", len(caches), interval)
+    return caches
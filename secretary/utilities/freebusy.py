@@ -0,0 +1,191 @@
+"""Google Calendar free/busy lookups, batched across participants and cached with a short TTL.
+
+FreeBusyCache.query() answers "when is each of these people busy between start and end" with one
+freebusy.query request for all calendars not already cached (chunked by the API's 50-calendar
+limit), instead of an events().list per participant. Each calendar's result is kept with the window
+it was fetched for; later queries inside that window are served from the cache until the TTL
+expires. Calendars Google reports as not found have no busy time and are cached like any other.
+Other per-calendar errors (rateLimitExceeded, backendError, ...) and failed requests are logged and
+not cached: those participants are missing from the result, and the caller must treat their
+availability as unknown rather than free.
+"""
+
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from secretary.utilities.calendar_index import as_local
+from secretary.utilities.google import execute_request
+from secretary.utilities.logging import log_warning
+from secretary.utilities.slot_finder import Interval
+
+MAX_CALENDARS_PER_QUERY = 50
+
+# Per-calendar error reasons that are a definite answer (no such calendar), not a failed lookup
+_PERMANENT_ERRORS = {"notFound"}
+
+# Process-wide, so a version never repeats (used as a cache key by availability_bitmap)
+_versions = itertools.count(1)
+
+
+def _parse(value: str) -> datetime:
+    return as_local(datetime.fromisoformat(value.replace("Z", "+00:00")))
+
+
+def _rfc3339(value: datetime) -> str:
+    # Naive datetimes are local time, like everywhere in the scheduler
+    return value.astimezone().isoformat()
+
+
+class FreeBusy:
+    """
+    One calendar's busy intervals over the window they were fetched for.
+
+    Attributes:
+        start (datetime): Window start.
+        end (datetime): Window end.
+        intervals (list): (start, end) busy intervals, naive local time, in start order.
+        fetched (float): Clock time of the fetch.
+        version (int): Unique per fetch.
+    """
+
+    __slots__ = ("start", "end", "intervals", "fetched", "version")
+
+    def __init__(self, start: datetime, end: datetime, intervals: List[Interval], fetched: float):
+        self.start = start
+        self.end = end
+        self.intervals = sorted(intervals)
+        self.fetched = fetched
+        self.version = next(_versions)
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return self.start <= start and end <= self.end
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Interval]:
+        """Busy intervals overlapping [start, end)."""
+        return [(s, e) for s, e in self.intervals if s < end and e > start]
+
+
+class FreeBusyCache:
+    """
+    Per-calendar free/busy results with a TTL.
+
+    Attributes:
+        ttl (float): Seconds a result is reused.
+        max_entries (int): Calendars kept; the least recently used are dropped.
+        requests (int): freebusy.query requests sent.
+        hits (int): Calendars answered from the cache.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 4096, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.requests = 0
+        self.hits = 0
+        self._clock = clock
+        self._entries: "OrderedDict[str, FreeBusy]" = OrderedDict()  # calendar id -> result
+        self._lock = threading.Lock()
+
+    def query(self, service, calendars: Dict[str, str], start: datetime, end: datetime) -> Dict[str, FreeBusy]:
+        """
+        Busy intervals of several calendars, fetching the uncached ones in one request.
+
+        Args:
+            service: Google Calendar service.
+            calendars (dict): Participant -> calendar id (e.g. their email, or "primary").
+            start (datetime): Window start (naive local time).
+            end (datetime): Window end.
+
+        Returns:
+            dict: Participant -> FreeBusy covering [start, end); participants whose lookup failed
+                (temporary errors included) are missing.
+        """
+        start, end = as_local(start), as_local(end)
+        now = self._clock()
+        found, missing = {}, []
+        with self._lock:
+            for calendar_id in dict.fromkeys(calendars.values()):
+                entry = self._entries.get(calendar_id)
+                if entry is not None and now - entry.fetched < self.ttl and entry.covers(start, end):
+                    self._entries.move_to_end(calendar_id)
+                    found[calendar_id] = entry
+                    self.hits += 1
+                else:
+                    missing.append(calendar_id)
+
+        for i in range(0, len(missing), MAX_CALENDARS_PER_QUERY):
+            found.update(self._fetch(service, missing[i:i + MAX_CALENDARS_PER_QUERY], start, end))
+        return {p: found[calendar_id] for p, calendar_id in calendars.items() if calendar_id in found}
+
+    def _fetch(self, service, calendar_ids: List[str], start: datetime, end: datetime) -> Dict[str, FreeBusy]:
+        body = {"timeMin": _rfc3339(start), "timeMax": _rfc3339(end), "items": [{"id": c} for c in calendar_ids]}
+        with self._lock:
+            self.requests += 1
+        try:
+            response = execute_request(service.freebusy().query(body=body))
+        except Exception as e:
+            log_warning("[FreeBusy] Query for %d calendars failed: %s", len(calendar_ids), e)
+            return {}
+
+        fetched = self._clock()
+        results = {}
+        for calendar_id in calendar_ids:
+            data = (response.get("calendars") or {}).get(calendar_id)
+            if data is None:
+                log_warning("[FreeBusy] No result for %s", calendar_id)
+                continue
+            reasons = [e.get("reason", "?") for e in data.get("errors") or []]
+            if reasons:
+                log_warning("[FreeBusy] %s: %s", calendar_id, ", ".join(reasons))
+                if not _PERMANENT_ERRORS.issuperset(reasons):
+                    continue
+            try:
+                intervals = [(_parse(b["start"]), _parse(b["end"])) for b in data.get("busy", [])]
+            except (KeyError, TypeError, ValueError) as e:
+                log_warning("[FreeBusy] Unreadable busy times for %s: %s", calendar_id, e)
+                continue
+            results[calendar_id] = FreeBusy(start, end, intervals, fetched)
+
+        with self._lock:
+            for calendar_id, entry in results.items():
+                self._entries[calendar_id] = entry
+                self._entries.move_to_end(calendar_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return results
+
+    def invalidate(self, calendar_ids=None):
+        """Drop cached results (all, or those of the given calendar ids), e.g. after writing events."""
+        with self._lock:
+            if calendar_ids is None:
+                self._entries.clear()
+            for calendar_id in calendar_ids or ():
+                self._entries.pop(calendar_id, None)
+
+
+_cache: Optional[FreeBusyCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_freebusy_cache() -> FreeBusyCache:
+    """
+    Return the process-wide free/busy cache, configured from the environment on first use:
+      - FREEBUSY_TTL_SECONDS: how long results are reused (default 60)
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FreeBusyCache(ttl=float(os.getenv("FREEBUSY_TTL_SECONDS", "60")))
+        return _cache
+
+
+def set_freebusy_cache(cache: FreeBusyCache) -> FreeBusyCache:
+    """Replace the process-wide cache (e.g. in tests); returns the previous one."""
+    global _cache
+    with _cache_lock:
+        previous, _cache = _cache, cache
+        return previous
@@ -1,10 +1,16 @@
-import os, pickle, webbrowser
+import os, pickle, webbrowser, threading
 from datetime import datetime, timedelta
+import httplib2
+import google_auth_httplib2
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 
+from secretary.utilities import metrics
+from secretary.utilities.tracing import span
+from secretary.utilities.session_recorder import intercept
+
 SCOPES = [
     'https://www.googleapis.com/auth/calendar',
     'https://www.googleapis.com/auth/gmail.modify',
@@ -68,7 +74,7 @@ def initialize_google_services(node_id: str = None) -> dict:
     try:
         cal = build('calendar', 'v3', credentials=creds)
         _ = cal.calendarList().list().execute()
-        services['calendar'] = cal
+        services['calendar'] = instrument_service(cal, 'calendar', node_id)
         print(f"{prefix} Calendar OK")
     except Exception as e:
         print(f"{prefix} Calendar init failed: {e}")
@@ -77,9 +83,103 @@ def initialize_google_services(node_id: str = None) -> dict:
     try:
         gm = build('gmail', 'v1', credentials=creds)
         _ = gm.users().getProfile(userId='me').execute()
-        services['gmail'] = gm
+        services['gmail'] = instrument_service(gm, 'gmail', node_id)
         print(f"{prefix} Gmail OK")
     except Exception as e:
         print(f"{prefix} Gmail init failed: {e}")
 
     return services
+
+
+_thread_local = threading.local()
+
+def execute_request(request):
+    """
+    Execute a googleapiclient request on a connection owned by the calling thread.
+
+    httplib2 (used by googleapiclient) is not thread-safe, so requests issued from worker threads
+    get their own AuthorizedHttp built from the service's credentials. Objects that don't look like
+    a googleapiclient request (e.g. test doubles) are simply executed.
+    """
+    credentials = getattr(getattr(request, 'http', None), 'credentials', None)
+    if credentials is None:
+        return request.execute()
+
+    https = getattr(_thread_local, 'https', None)
+    if https is None:
+        https = _thread_local.https = {}
+    http = https.get(id(credentials))
+    if http is None:
+        http = https[id(credentials)] = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+    return request.execute(http=http)
+
+
+_PLAIN_RESULTS = (dict, list, str, bytes, int, float, bool, type(None))
+
+
+def _unwrap(value):
+    return value._target if isinstance(value, (_TimedResource, _TimedRequest)) else value
+
+
+class _TimedRequest:
+    """A pending request whose execute() is traced and recorded in secretary_google_request_duration_seconds."""
+
+    def __init__(self, target, api: str, method: str, node_id: str, params: dict = None):
+        self._target = target
+        self._labels = (node_id or "", api, method)
+        self._params = params or {}
+
+    def execute(self, *args, **kwargs):
+        node, api, method = self._labels
+        with span(f"google {api}.{method}", kind="client", node=node, method=method):
+            with metrics.timed_into(metrics.GOOGLE_DURATION, *self._labels):
+                # Recorded (or answered from a recording) when a session turn is open
+                return intercept("google", node, f"{api}.{method}", self._params,
+                                 lambda: self._target.execute(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+
+class _TimedResource:
+    """Forwards a discovery resource, wrapping the requests and sub-resources its methods return."""
+
+    def __init__(self, target, api: str, node_id: str, path: str = ""):
+        self._target = target
+        self._api = api
+        self._node_id = node_id
+        self._path = path
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        path = f"{self._path}.{name}" if self._path else name
+
+        def call(*args, **kwargs):
+            args = [_unwrap(a) for a in args]
+            kwargs = {k: _unwrap(v) for k, v in kwargs.items()}
+            result = attr(*args, **kwargs)
+            if isinstance(result, _PLAIN_RESULTS):
+                return result
+            if hasattr(result, 'execute'):
+                return _TimedRequest(result, self._api, path, self._node_id, kwargs)
+            return _TimedResource(result, self._api, self._node_id, path)
+        return call
+
+
+def instrument_service(service, api: str, node_id: str = None):
+    """
+    Wrap a googleapiclient service so every request's execute() is timed per node, API and method.
+
+    Args:
+        service: Service returned by build() (or any object with the same call chains).
+        api (str): "calendar" or "gmail".
+        node_id (str, optional): Node the service belongs to.
+
+    Returns:
+        The wrapped service; attribute access is forwarded to the original.
+    """
+    if service is None or isinstance(service, _TimedResource):
+        return service
+    return _TimedResource(service, api, node_id)
@@ -0,0 +1,364 @@
+"""Local intent pre-classifier.
+
+Decides in well under a millisecond, without any network call, whether a message is plain chat or
+might be a calendar/email command. Only messages it is not confident about are sent to the LLM
+router (Brain.route_message).
+
+Two layers:
+  1) Rules: short chit-chat ("thanks", "hi", "ok") is chat; obvious calendar/email vocabulary escalates.
+  2) A small multinomial logistic regression over hashed, TF-IDF weighted word unigrams/bigrams,
+     trained from the routing examples Communication logs (see log_example / train_from_log).
+
+Every prediction that is later checked against the LLM router (escalations, plus a random shadow
+sample of the confident ones) updates per-route precision counters, so the threshold can be tuned.
+"""
+
+import json
+import math
+import os
+import random
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from secretary.utilities.log_sink import get_sink, query_logs
+from secretary.utilities.logging import log_system_message, log_warning, logs_dir
+
+LABELS = ("calendar", "email", "chat")
+
+_TOKEN_RE = re.compile(r"[a-z0-9@']+")
+
+# Messages that are chat no matter what the model thinks
+_CHAT_RE = re.compile(
+    r"^(hi|hello|hey|thanks?|thank you|thx|ok(ay)?|cool|great|nice|perfect|sure|yes|no|yep|nope|"
+    r"bye|goodbye|good (morning|afternoon|evening|night)|how are you|what'?s up|lol|haha)[\s!.?]*$"
+)
+# Vocabulary that always needs the LLM router
+_CALENDAR_WORDS = {"meeting", "meetings", "schedule", "reschedule", "calendar", "appointment", "call",
+                   "cancel", "agenda", "availability", "available", "slot", "invite", "sync"}
+_EMAIL_WORDS = {"email", "emails", "gmail", "mail", "mails", "inbox", "compose", "draft", "unread", "send",
+                "reply", "label", "labels", "sender", "attachment"}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens plus adjacent bigrams."""
+    words = _TOKEN_RE.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class IntentClassifier:
+    """
+    Rules + hashed logistic regression over LABELS.
+
+    Attributes:
+        threshold (float): Minimum probability for a "chat" prediction to skip the LLM router.
+        shadow_rate (float): Share of confident predictions that are still checked against the router.
+        n_features (int): Size of the hashed feature space.
+        trained (bool): Whether model weights are available (otherwise only the rules decide).
+    """
+
+    def __init__(self, threshold: float = 0.9, shadow_rate: float = 0.05, n_features: int = 2 ** 18):
+        self.threshold = threshold
+        self.shadow_rate = shadow_rate
+        self.n_features = n_features
+
+        # Sparse weights: label -> {feature index -> weight}
+        self.weights: Dict[str, Dict[int, float]] = {label: {} for label in LABELS}
+        self.bias: Dict[str, float] = {label: 0.0 for label in LABELS}
+        self.idf: Dict[int, float] = {}
+        self.trained = False
+
+        # predicted label -> {"checked": n, "correct": n}; plus how many decisions were served locally
+        self._counters = defaultdict(lambda: {"checked": 0, "correct": 0})
+        self._served_locally = 0
+        self._escalated = 0
+        self._lock = threading.Lock()
+
+    # --- features / model ---
+
+    def _features(self, text: str) -> Dict[int, float]:
+        """Hashed log-TF * IDF features, L2 normalized."""
+        counts: Dict[int, int] = defaultdict(int)
+        for token in tokenize(text):
+            counts[zlib.crc32(token.encode("utf-8")) % self.n_features] += 1
+        feats = {i: (1.0 + math.log(c)) * self.idf.get(i, 1.0) for i, c in counts.items()}
+        norm = math.sqrt(sum(v * v for v in feats.values())) or 1.0
+        return {i: v / norm for i, v in feats.items()}
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """
+        Class probabilities from the logistic regression model.
+
+        Args:
+            text (str): The message.
+
+        Returns:
+            dict: label -> probability (uniform if the model is untrained).
+        """
+        if not self.trained:
+            return {label: 1.0 / len(LABELS) for label in LABELS}
+        feats = self._features(text)
+        scores = {
+            label: self.bias[label] + sum(self.weights[label].get(i, 0.0) * v for i, v in feats.items())
+            for label in LABELS
+        }
+        top = max(scores.values())
+        exp = {label: math.exp(s - top) for label, s in scores.items()}
+        total = sum(exp.values())
+        return {label: e / total for label, e in exp.items()}
+
+    def fit(self, examples: Iterable[Tuple[str, str]], epochs: int = 20, learning_rate: float = 0.5, l2: float = 1e-4):
+        """
+        Train the model with plain SGD on (text, label) pairs.
+
+        Args:
+            examples: Iterable of (message, label) with label in LABELS.
+            epochs (int): Passes over the data.
+            learning_rate (float): SGD step size.
+            l2 (float): L2 regularization strength.
+        """
+        data = [(text, label) for text, label in examples if label in LABELS and text]
+        if not data:
+            log_warning("[IntentClassifier] No training examples, keeping rules only")
+            return
+
+        # Inverse document frequency over the hashed features
+        doc_freq: Dict[int, int] = defaultdict(int)
+        for text, _ in data:
+            for i in {zlib.crc32(t.encode("utf-8")) % self.n_features for t in tokenize(text)}:
+                doc_freq[i] += 1
+        n_docs = len(data)
+        self.idf = {i: math.log((1 + n_docs) / (1 + df)) + 1.0 for i, df in doc_freq.items()}
+
+        self.weights = {label: {} for label in LABELS}
+        self.bias = {label: 0.0 for label in LABELS}
+        self.trained = True
+        featurized = [(self._features(text), label) for text, label in data]
+
+        rng = random.Random(0)
+        for epoch in range(epochs):
+            rng.shuffle(featurized)
+            step = learning_rate / (1.0 + epoch)
+            for feats, label in featurized:
+                scores = {
+                    l: self.bias[l] + sum(self.weights[l].get(i, 0.0) * v for i, v in feats.items())
+                    for l in LABELS
+                }
+                top = max(scores.values())
+                exp = {l: math.exp(s - top) for l, s in scores.items()}
+                total = sum(exp.values())
+                for l in LABELS:
+                    grad = exp[l] / total - (1.0 if l == label else 0.0)
+                    w = self.weights[l]
+                    for i, v in feats.items():
+                        w[i] = w.get(i, 0.0) * (1 - step * l2) - step * grad * v
+                    self.bias[l] -= step * grad
+        log_system_message(f"[IntentClassifier] Trained on {n_docs} examples")
+
+    # --- decisions ---
+
+    def classify(self, text: str) -> Tuple[str, float, str]:
+        """
+        Classify a message locally.
+
+        Args:
+            text (str): The message.
+
+        Returns:
+            tuple: (label, confidence, source) where source is "rule", "model" or "default".
+        """
+        lowered = text.strip().lower()
+        if _CHAT_RE.match(lowered):
+            return "chat", 1.0, "rule"
+
+        words = set(_TOKEN_RE.findall(lowered))
+        if words & _CALENDAR_WORDS:
+            return "calendar", 1.0, "rule"
+        if words & _EMAIL_WORDS:
+            return "email", 1.0, "rule"
+
+        if not self.trained:
+            return "chat", 0.0, "default"
+        proba = self.predict_proba(text)
+        label = max(proba, key=proba.get)
+        return label, proba[label], "model"
+
+    def should_skip_router(self, text: str) -> Tuple[bool, str, bool]:
+        """
+        Decide whether a message can go straight to chat.
+
+        Args:
+            text (str): The message.
+
+        Returns:
+            tuple: (skip, predicted_label, shadow) - predicted_label is "uncertain" for chat predictions
+                below the threshold; shadow is True when a skipped message should still be checked
+                against the LLM router in the background to measure precision.
+        """
+        label, confidence, _ = self.classify(text)
+        skip = label == "chat" and confidence >= self.threshold
+        if label == "chat" and not skip:
+            label = "uncertain"
+        with self._lock:
+            if skip:
+                self._served_locally += 1
+            else:
+                self._escalated += 1
+        shadow = skip and random.random() < self.shadow_rate
+        return skip, label, shadow
+
+    def record(self, predicted: str, actual: str):
+        """
+        Update the precision counters with a prediction whose true route is known.
+
+        Args:
+            predicted (str): Label returned by should_skip_router().
+            actual (str): Label derived from the LLM router.
+        """
+        if predicted not in LABELS:
+            return
+        with self._lock:
+            counter = self._counters[predicted]
+            counter["checked"] += 1
+            if predicted == actual:
+                counter["correct"] += 1
+
+    def stats(self) -> dict:
+        """Per-route precision counters and how many messages skipped the router."""
+        with self._lock:
+            routes = {
+                label: {
+                    **counts,
+                    "precision": (counts["correct"] / counts["checked"]) if counts["checked"] else None,
+                }
+                for label, counts in self._counters.items()
+            }
+            return {
+                "threshold": self.threshold,
+                "served_locally": self._served_locally,
+                "escalated": self._escalated,
+                "routes": routes,
+            }
+
+    # --- persistence ---
+
+    def save(self, path: str):
+        """Write the model weights to a JSON file."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "n_features": self.n_features,
+                "idf": self.idf,
+                "bias": self.bias,
+                "weights": self.weights,
+            }, f)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "IntentClassifier":
+        """Load a model saved with save(); kwargs are passed to the constructor."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        clf = cls(n_features=data["n_features"], **kwargs)
+        clf.idf = {int(i): v for i, v in data["idf"].items()}
+        clf.bias = data["bias"]
+        clf.weights = {label: {int(i): v for i, v in w.items()} for label, w in data["weights"].items()}
+        clf.trained = True
+        return clf
+
+
+def route_label(route: dict) -> str:
+    """
+    Collapse a Brain.route_message() result to one of LABELS.
+
+    Args:
+        route (dict): The router output.
+
+    Returns:
+        str: "calendar", "email" or "chat".
+    """
+    if route.get("calendar", {}).get("is_calendar_command"):
+        return "calendar"
+    if route.get("email", {}).get("action") not in (None, "none") or route.get("send_email", {}).get("is_send_email"):
+        return "email"
+    return "chat"
+
+
+def _sink_location(path: str) -> Tuple[str, str]:
+    """(directory, prefix) of the JsonlSink writing `path` (prefix = file name without .jsonl)."""
+    directory, name = os.path.split(os.path.abspath(path))
+    return directory, name[:-len(".jsonl")] if name.endswith(".jsonl") else name
+
+
+def log_example(message: str, label: str, path: Optional[str] = None):
+    """
+    Append a labelled routing example (from the LLM router) to the training log.
+
+    Written by a background JsonlSink (rotated like the other logs), so the request thread only enqueues.
+
+    Args:
+        message (str): The user message.
+        label (str): Its route label.
+        path (str, optional): JSONL file; defaults to INTENT_EXAMPLES_PATH or logs/intent_examples.jsonl.
+    """
+    path = path or os.getenv("INTENT_EXAMPLES_PATH") or os.path.join(logs_dir, "intent_examples.jsonl")
+    try:
+        get_sink(*_sink_location(path), background=True).write({"text": message, "label": label})
+    except OSError as e:
+        log_warning("[IntentClassifier] Could not write training example: %s", e)
+
+
+def train_from_log(path: str, **kwargs) -> IntentClassifier:
+    """
+    Train a classifier from a JSONL file written by log_example() (and its rotated segments).
+
+    Args:
+        path (str): The examples file.
+        **kwargs: Passed to IntentClassifier().
+
+    Returns:
+        IntentClassifier: The trained classifier.
+    """
+    examples = [(record.get("text", ""), record.get("label")) for record in query_logs(*_sink_location(path))]
+    clf = IntentClassifier(**kwargs)
+    clf.fit(examples)
+    return clf
+
+
+_default_classifier: Optional[IntentClassifier] = None
+_default_classifier_lock = threading.Lock()
+
+
+def get_default_classifier() -> IntentClassifier:
+    """
+    Return the process-wide classifier, configured from the environment on first use:
+      - INTENT_MODEL_PATH: weights saved with IntentClassifier.save() (rules only if unset/missing)
+      - INTENT_THRESHOLD: confidence needed to skip the router (default 0.9)
+      - INTENT_SHADOW_RATE: share of skipped messages checked in the background (default 0.05)
+    """
+    global _default_classifier
+    with _default_classifier_lock:
+        if _default_classifier is None:
+            kwargs = {
+                "threshold": float(os.getenv("INTENT_THRESHOLD", "0.9")),
+                "shadow_rate": float(os.getenv("INTENT_SHADOW_RATE", "0.05")),
+            }
+            model_path = os.getenv("INTENT_MODEL_PATH")
+            if model_path and os.path.exists(model_path):
+                _default_classifier = IntentClassifier.load(model_path, **kwargs)
+            else:
+                _default_classifier = IntentClassifier(**kwargs)
+        return _default_classifier
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the local intent classifier from logged routing examples.")
+    parser.add_argument("examples", help="JSONL file written by log_example()")
+    parser.add_argument("--out", default="intent_model.json", help="Where to save the weights")
+    args = parser.parse_args()
+
+    classifier = train_from_log(args.examples)
+    classifier.save(args.out)
+    print(f"Saved model to {args.out}")
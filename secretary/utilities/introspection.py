@@ -0,0 +1,324 @@
+"""Memory footprint introspection for long-running nodes.
+
+footprint() reports, per node, the element count and deep size of the structures that grow with
+uptime (Brain.calendar/projects/tasks/context, Communication.conversation_history, the route cache),
+plus the shared ones (Intercom.tasks, logging and sink queues, the usage ledger, the LLM cache) and
+the process RSS. Sizes are sys.getsizeof summed over everything reachable through containers and
+plain objects, stopping at nodes and their components, so a structure's size never includes the rest
+of the graph. Objects shared by two structures are counted in both.
+
+TracemallocDiff compares tracemalloc snapshots between two calls, and MemorySampler takes a
+footprint every few minutes and warns about structures that keep growing.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from secretary.utilities.logging import log_system_message, log_warning
+
+# Per-node structures, as attribute paths from the node object
+NODE_STRUCTURES = (
+    "brain.calendar",
+    "brain.projects",
+    "brain.tasks",
+    "brain.context",
+    "brain._route_cache._entries",
+    "communication.conversation_history",
+)
+# Components of a node; sizes never descend into these
+NODE_COMPONENTS = ("brain", "communication", "scheduler", "llm_client", "openai_client")
+
+# Never descended into (nor counted): code, modules, classes, threads and synchronization primitives
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+           types.CodeType, types.FrameType, threading.Thread, type(threading.Lock()), type(threading.RLock()),
+           threading.Condition, threading.Event)
+
+
+def deep_sizeof(obj, stop: set = frozenset(), max_objects: int = 200_000) -> tuple:
+    """
+    Size of an object and everything reachable from it through containers and instance attributes.
+
+    Args:
+        obj: Root object.
+        stop (set): ids of objects not to count or descend into.
+        max_objects (int): Walk budget; the result is a lower bound once it is exhausted.
+
+    Returns:
+        tuple: (bytes, truncated)
+    """
+    seen = set(stop)
+    pending = [obj]
+    total = 0
+    while pending:
+        if len(seen) - len(stop) >= max_objects:
+            return total, True
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, _OPAQUE):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item, 0)
+        if isinstance(item, (str, bytes, bytearray, int, float, bool)) or item is None:
+            continue
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            pending.extend(item)
+        else:
+            attrs = getattr(item, "__dict__", None)
+            if attrs is not None:
+                pending.append(attrs)
+            for slot in getattr(type(item), "__slots__", ()):
+                if hasattr(item, slot):
+                    pending.append(getattr(item, slot))
+    return total, False
+
+
+def measure(value, stop: set = frozenset()) -> dict:
+    """Element count (when the value has a length) and deep size of one structure."""
+    size, truncated = deep_sizeof(value, stop)
+    result = {"count": len(value) if hasattr(value, "__len__") else None, "bytes": size}
+    if truncated:
+        result["truncated"] = True
+    return result
+
+
+def _resolve(obj, path: str):
+    for name in path.split("."):
+        obj = getattr(obj, name, None)
+        if obj is None:
+            return None
+    return obj
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process (Linux /proc; peak RSS elsewhere), or None."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def _buffers(stop: set) -> Dict[str, dict]:
+    from secretary.utilities import log_sink, logging as app_logging
+    from secretary.utilities.llm_cache import get_default_cache
+    from secretary.utilities.usage import get_ledger
+
+    buffers = {"logging.queue": {"count": app_logging.log_queue.qsize(), "bytes": None}}
+    for sink in list(log_sink._sinks.values()) + [app_logging.file_sink]:
+        sink_queue = getattr(sink, "_queue", None)
+        if sink_queue is not None:
+            buffers[f"sink.{sink.prefix}.queue"] = {"count": sink_queue.qsize(), "bytes": None}
+    buffers["usage.ledger"] = measure(get_ledger()._records, stop)
+    buffers["llm_cache"] = measure(get_default_cache()._entries, stop)
+    return buffers
+
+
+def footprint(network, include_buffers: bool = True) -> dict:
+    """
+    Sizes of the long-lived structures of every node and of the shared buffers.
+
+    Args:
+        network: The Intercom (anything with .nodes and .tasks).
+        include_buffers (bool): Also measure the process-wide logging/usage/cache buffers.
+
+    Returns:
+        dict: {"ts", "rss_bytes", "nodes": {node_id: {structure: {"count", "bytes"}}}, "network", "buffers"}
+    """
+    nodes = dict(getattr(network, "nodes", {}) or {})
+    stop = {id(network)}
+    for node in nodes.values():
+        stop.add(id(node))
+        stop.update(id(c) for c in (getattr(node, name, None) for name in NODE_COMPONENTS) if c is not None)
+
+    report = {"ts": time.time(), "rss_bytes": rss_bytes(), "nodes": {}, "network": {}, "buffers": {}}
+    for node_id, node in nodes.items():
+        structures = {}
+        for path in NODE_STRUCTURES:
+            value = _resolve(node, path)
+            if value is not None:
+                structures[path] = measure(value, stop)
+        report["nodes"][node_id] = structures
+    for name in ("tasks", "local_calendar"):
+        value = getattr(network, name, None)
+        if value is not None:
+            report["network"][f"intercom.{name}"] = measure(value, stop)
+    if include_buffers:
+        report["buffers"] = _buffers(stop)
+    return report
+
+
+def flatten(report: dict) -> Dict[str, int]:
+    """Footprint as {"<node>/<structure>" or "<structure>": bytes}, for trend tracking."""
+    flat = {f"{node_id}/{path}": data["bytes"]
+            for node_id, structures in report["nodes"].items() for path, data in structures.items()}
+    for section in ("network", "buffers"):
+        for name, data in report[section].items():
+            flat[name] = data["bytes"] if data["bytes"] is not None else data["count"]
+    if report.get("rss_bytes") is not None:
+        flat["rss"] = report["rss_bytes"]
+    return flat
+
+
+class TracemallocDiff:
+    """
+    Allocation diffs between successive calls of diff().
+
+    The first call starts tracemalloc (which slows allocation down noticeably) and takes the baseline;
+    every later call reports the top allocation sites by growth since the previous call.
+
+    Attributes:
+        frames (int): Stack depth tracemalloc keeps per allocation.
+    """
+
+    def __init__(self, frames: int = 1):
+        self.frames = frames
+        self._previous: Optional[tuple] = None  # (snapshot, taken at)
+        self._lock = threading.Lock()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        # Our own bookkeeping would otherwise show up as the biggest "leak"
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+
+    def diff(self, top: int = 20, key: str = "lineno") -> dict:
+        """
+        Compare with the previous call's snapshot.
+
+        Args:
+            top (int): Number of allocation sites reported.
+            key (str): "lineno", "filename" or "traceback".
+
+        Returns:
+            dict: {"started": True} on the first call, else {"interval_s", "traced_bytes", "top": [...]}.
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self._previous = None
+            snapshot = self._snapshot()
+            snapshot_ts = time.time()
+            previous, self._previous = self._previous, (snapshot, snapshot_ts)
+            if previous is None:
+                return {"started": True, "frames": self.frames}
+            stats = snapshot.compare_to(previous[0], key)
+            return {
+                "interval_s": round(snapshot_ts - previous[1], 3),
+                "traced_bytes": tracemalloc.get_traced_memory()[0],
+                "top": [{
+                    "where": str(stat.traceback) if key != "traceback" else stat.traceback.format(),
+                    "size_diff": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                    "size": stat.size,
+                } for stat in stats[:top]],
+            }
+
+    def stop(self):
+        """Stop tracing and drop the baseline."""
+        with self._lock:
+            self._previous = None
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+
+class MemorySampler:
+    """
+    Periodically takes a footprint, logs it and warns about sustained growth.
+
+    A structure is reported when it grew in each of the last `window` samples, with its growth rate
+    per hour. RSS alone is only reported that way too, so a one-off spike does not trigger warnings.
+
+    Attributes:
+        collect (Callable[[], dict]): Returns a footprint (see footprint()).
+        interval (float): Seconds between samples.
+        window (int): Consecutive growing samples before a warning.
+        history (deque): (ts, flattened footprint) of the recent samples.
+    """
+
+    def __init__(self, collect: Callable[[], dict], interval: float = 300.0, window: int = 6):
+        self.collect = collect
+        self.interval = interval
+        self.window = window
+        self.history: deque = deque(maxlen=window + 1)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                log_warning("[MemorySampler] Sampling failed: %s", e)
+
+    def sample(self) -> list:
+        """
+        Take one footprint and return the structures growing over the whole window.
+
+        Returns:
+            list: (name, first value, last value, growth per hour) for each growing structure.
+        """
+        report = self.collect()
+        self.history.append((report["ts"], flatten(report)))
+        rss = report.get("rss_bytes")
+        log_system_message("[MemorySampler] rss=%s MB, %d nodes", round(rss / 2**20, 1) if rss else "?",
+                           len(report["nodes"]))
+        growing = self.growing()
+        for name, first, last, per_hour in growing:
+            log_warning("[MemorySampler] %s grew in each of the last %d samples: %s -> %s (%+.0f/h)",
+                        name, self.window, first, last, per_hour)
+        return growing
+
+    def growing(self) -> list:
+        if len(self.history) <= self.window:
+            return []
+        samples = list(self.history)
+        (start_ts, first), (end_ts, last) = samples[0], samples[-1]
+        hours = max(end_ts - start_ts, 1e-9) / 3600
+        result = []
+        for name in last:
+            values = [flat.get(name) for _, flat in samples]
+            if None in values:
+                continue
+            if all(b > a for a, b in zip(values, values[1:])):
+                result.append((name, values[0], values[-1], (values[-1] - values[0]) / hours))
+        return result
+
+
+def init_memory_sampler(get_network: Callable[[], object]) -> Optional[MemorySampler]:
+    """
+    Start a MemorySampler configured from the environment (nothing is started by default):
+      - MEMORY_SAMPLE_SECONDS: sampling interval (default 0 = off)
+      - MEMORY_TREND_WINDOW: consecutive growing samples before a warning (default 6)
+    """
+    interval = float(os.getenv("MEMORY_SAMPLE_SECONDS", "0"))
+    if interval <= 0:
+        return None
+    sampler = MemorySampler(lambda: footprint(get_network()), interval=interval,
+                            window=int(os.getenv("MEMORY_TREND_WINDOW", "6")))
+    sampler.start()
+    log_system_message("[MemorySampler] Sampling every %ss", interval)
+    return sampler
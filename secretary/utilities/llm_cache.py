@@ -0,0 +1,258 @@
+"""Response cache for LLM completions.
+
+Two tiers:
+  1) An in-memory LRU (always on), bounded by max_entries.
+  2) An optional SQLite file that survives restarts and is shared between processes.
+
+Entries expire after ttl_seconds in both tiers. Hit/miss counters are kept so we can
+see how much the cache actually saves.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from secretary.utilities.logging import log_warning
+
+# Message fields besides role/content that change the answer (tool calls and their results)
+_KEYED_FIELDS = ("name", "tool_calls", "tool_call_id")
+
+
+def normalize_messages(messages: list) -> list:
+    """
+    Normalize a chat message list so that cosmetic differences don't produce different keys.
+
+    Only leading and trailing whitespace is stripped from the content: line breaks and indentation
+    inside it can change the answer (email bodies, code, numbered plans parsed line by line). Role,
+    content and the tool fields (name, tool_calls, tool_call_id) are kept; anything else is dropped.
+
+    Args:
+        messages (list): List of {'role': ..., 'content': ...} dictionaries.
+
+    Returns:
+        list: The normalized message list.
+    """
+    normalized = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            content = content.strip()
+        entry = {"role": message.get("role"), "content": content}
+        entry.update((field, message[field]) for field in _KEYED_FIELDS if message.get(field) is not None)
+        normalized.append(entry)
+    return normalized
+
+
+def make_cache_key(messages: list, model: str, temperature=None, max_tokens=None, **extra) -> str:
+    """
+    Build a stable cache key from the request parameters.
+
+    Args:
+        messages (list): The chat messages sent to the model.
+        model (str): Model name.
+        temperature: Sampling temperature.
+        max_tokens: Completion token limit.
+        **extra: Any other request parameters that change the answer (e.g. response_format).
+
+    Returns:
+        str: A sha256 hex digest.
+    """
+    payload = {
+        "messages": normalize_messages(messages),
+        "model": model,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "extra": extra,
+    }
+    raw = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Thread-safe LRU + TTL cache for completion texts, with an optional SQLite tier.
+
+    Attributes:
+        max_entries (int): Capacity of the in-memory tier.
+        ttl_seconds (float): Lifetime of an entry in both tiers.
+        db_path (Optional[str]): Path of the SQLite file, or None for memory only.
+        hits (int): Number of lookups served from either tier.
+        misses (int): Number of lookups that found nothing.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._db = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if db_path:
+            self._open_db(db_path)
+
+    def _open_db(self, db_path: str):
+        """Open (or create) the on-disk tier. Failures only disable the disk tier."""
+        try:
+            directory = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(directory, exist_ok=True)
+            # One connection shared by all threads, guarded by self._lock
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            log_warning(f"[LLMCache] Could not open disk cache at {db_path}: {e}. Using memory only.")
+            self._db = None
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached value.
+
+        Args:
+            key (str): Cache key from make_cache_key().
+
+        Returns:
+            Optional[str]: The cached text, or None on a miss or expired entry.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    log_warning(f"[LLMCache] Disk lookup failed: {e}")
+                    row = None
+                if row is not None:
+                    value, expires_at = row
+                    if expires_at > now:
+                        # Promote into the memory tier
+                        self._store_memory(key, value, expires_at)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str, ttl_seconds: Optional[float] = None):
+        """
+        Store a value in both tiers.
+
+        Args:
+            key (str): Cache key from make_cache_key().
+            value (str): The completion text.
+            ttl_seconds (Optional[float]): Override of the default lifetime.
+        """
+        expires_at = time.time() + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        with self._lock:
+            self._store_memory(key, value, expires_at)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, value, expires_at),
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    log_warning(f"[LLMCache] Disk write failed: {e}")
+
+    def _store_memory(self, key: str, value: str, expires_at: float):
+        """Insert into the LRU tier, evicting the least recently used entries. Caller holds the lock."""
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def purge_expired(self) -> int:
+        """
+        Drop expired entries from both tiers.
+
+        Returns:
+            int: Number of entries removed from the memory tier.
+        """
+        now = time.time()
+        with self._lock:
+            expired = [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]
+            for k in expired:
+                del self._entries[k]
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    log_warning(f"[LLMCache] Disk purge failed: {e}")
+        return len(expired)
+
+    def clear(self):
+        """Remove every entry from both tiers (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "entries": len(self._entries),
+                "disk_enabled": self._db is not None,
+            }
+
+
+_default_cache: Optional[LLMCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> LLMCache:
+    """
+    Return the process-wide cache shared by all LLMClient instances.
+
+    Configured from the environment on first use:
+      - LLM_CACHE_PATH: SQLite file for the disk tier (memory only if unset)
+      - LLM_CACHE_TTL: entry lifetime in seconds (default 3600)
+      - LLM_CACHE_SIZE: in-memory capacity (default 1024)
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache(
+                max_entries=int(os.getenv("LLM_CACHE_SIZE", "1024")),
+                ttl_seconds=float(os.getenv("LLM_CACHE_TTL", "3600")),
+                db_path=os.getenv("LLM_CACHE_PATH") or None,
+            )
+        return _default_cache
@@ -0,0 +1,299 @@
+"""Central dispatcher for OpenAI requests.
+
+Every request made through a NodeClient (see secretary.utilities.openai_client) passes through here:
+  - token buckets enforce requests-per-minute and tokens-per-minute limits for the whole process,
+  - waiting requests are served by priority lane, so interactive chat goes ahead of background work
+    (task generation, candidate selection, email summaries),
+  - rate-limit / server errors are retried with jittered exponential backoff.
+
+The lane is taken from a context variable, so background code only needs:
+
+    with llm_priority(BACKGROUND):
+        ...  # every OpenAI call made here (and in asyncio tasks / to_thread calls started here)
+"""
+
+import contextlib
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import openai
+
+from secretary.utilities.logging import log_system_message, log_warning
+
+INTERACTIVE = 0
+BACKGROUND = 1
+LANE_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+_lane: contextvars.ContextVar = contextvars.ContextVar("llm_lane", default=INTERACTIVE)
+
+# Errors worth retrying: 429, 5xx, timeouts and dropped connections
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+
+@contextlib.contextmanager
+def llm_priority(lane: int):
+    """
+    Run the enclosed OpenAI calls in the given lane.
+
+    Args:
+        lane (int): INTERACTIVE or BACKGROUND.
+    """
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def current_lane() -> int:
+    """Lane of the calling context (INTERACTIVE unless set by llm_priority)."""
+    return _lane.get()
+
+
+def estimate_request_tokens(kwargs: dict) -> int:
+    """
+    Rough token cost of a chat request: prompt characters / 4 plus the completion limit.
+
+    Args:
+        kwargs (dict): Arguments of chat.completions.create().
+
+    Returns:
+        int: Estimated tokens (0 for calls without messages, e.g. audio).
+    """
+    messages = kwargs.get("messages")
+    if not messages:
+        return 0
+    chars = sum(len(str(m.get("content") or "")) for m in messages)
+    return chars // 4 + len(messages) * 4 + int(kwargs.get("max_tokens") or kwargs.get("max_completion_tokens") or 0)
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `per_minute` units per minute, holding at most
+    `burst_seconds` worth of refill.
+
+    Not thread-safe on its own; the dispatcher calls it under its lock.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = 60.0):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)  # oversized requests wait for a full bucket, not forever
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float):
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class LLMDispatcher:
+    """
+    Rate-limited, priority-ordered gate in front of the OpenAI API.
+
+    Attributes:
+        requests_per_minute (int): RPM limit.
+        tokens_per_minute (int): TPM limit (estimated before the call, corrected with the reported usage).
+        burst_seconds (float): How many seconds of budget may be spent at once after an idle period.
+        max_retries (int): Retries on retryable errors before giving up.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 200_000,
+        burst_seconds: float = 60.0,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.burst_seconds = burst_seconds
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._requests = TokenBucket(requests_per_minute, burst_seconds)
+        self._tokens = TokenBucket(tokens_per_minute, burst_seconds)
+        self._cond = threading.Condition()
+        self._queue: list = []                 # heap of (lane, seq)
+        self._seq = itertools.count()
+
+        # Metrics
+        self._depth: Dict[int, int] = {lane: 0 for lane in LANE_NAMES}
+        self._waits: Dict[int, deque] = {lane: deque(maxlen=1000) for lane in LANE_NAMES}
+        self._max_wait: Dict[int, float] = {lane: 0.0 for lane in LANE_NAMES}
+        self._completed = 0
+        self._retries = 0
+        self._rate_limited = 0
+        self._failures = 0
+
+    def _acquire(self, lane: int, tokens: int) -> float:
+        """Block until this request is at the head of the queue and both buckets allow it; return the wait."""
+        ticket = (lane, next(self._seq))
+        start = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            self._depth[lane] += 1
+            try:
+                while True:
+                    if self._queue[0] == ticket:
+                        wait = max(self._requests.time_until(1), self._tokens.time_until(tokens))
+                        if wait <= 0:
+                            self._requests.take(1)
+                            self._tokens.take(tokens)
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+            finally:
+                self._remove(ticket)
+                self._depth[lane] -= 1
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            self._waits[lane].append(waited)
+            self._max_wait[lane] = max(self._max_wait[lane], waited)
+        return waited
+
+    def _remove(self, ticket):
+        """Take a ticket off the queue. Caller holds the lock."""
+        if self._queue and self._queue[0] == ticket:
+            heapq.heappop(self._queue)
+            return
+        # Not at the head: only when a waiter was interrupted
+        try:
+            self._queue.remove(ticket)
+            heapq.heapify(self._queue)
+        except ValueError:
+            pass
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential delay, never shorter than a server-provided Retry-After."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        response = getattr(error, "response", None)
+        retry_after = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+        try:
+            delay = max(delay, float(retry_after)) if retry_after else delay
+        except ValueError:
+            pass
+        return min(delay, self.max_delay)
+
+    def submit(self, fn: Callable, *args, **kwargs):
+        """
+        Run an OpenAI call under the rate limits, retrying retryable errors.
+
+        Args:
+            fn (Callable): The client method (e.g. chat.completions.create).
+            *args, **kwargs: Its arguments.
+
+        Returns:
+            Whatever fn returns.
+        """
+        lane = current_lane()
+        estimate = estimate_request_tokens(kwargs)
+        attempt = 0
+        while True:
+            self._acquire(lane, estimate)
+            try:
+                result = fn(*args, **kwargs)
+            except RETRYABLE_ERRORS as e:
+                with self._cond:
+                    if isinstance(e, openai.RateLimitError):
+                        self._rate_limited += 1
+                    if attempt >= self.max_retries:
+                        self._failures += 1
+                        raise
+                    self._retries += 1
+                delay = self._backoff(attempt, e)
+                log_warning(f"[LLMDispatcher] {type(e).__name__} ({LANE_NAMES[lane]}), retry {attempt + 1} in {delay:.2f}s")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            # Correct the token bucket with the real usage when the API reports it
+            usage = getattr(result, "usage", None)
+            total = getattr(usage, "total_tokens", None)
+            with self._cond:
+                self._completed += 1
+                if isinstance(total, int) and estimate:
+                    if total < estimate:
+                        self._tokens.give_back(estimate - total)
+                    else:
+                        self._tokens.take(total - estimate)
+                self._cond.notify_all()
+            return result
+
+    def stats(self) -> dict:
+        """Queue depth and wait-time metrics per lane, plus retry counters."""
+        with self._cond:
+            lanes = {}
+            for lane, name in LANE_NAMES.items():
+                waits = sorted(self._waits[lane])
+                lanes[name] = {
+                    "queue_depth": self._depth[lane],
+                    "requests": len(waits),
+                    "wait_p50": waits[len(waits) // 2] if waits else 0.0,
+                    "wait_p95": waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0,
+                    "wait_max": self._max_wait[lane],
+                }
+            return {
+                "lanes": lanes,
+                "completed": self._completed,
+                "retries": self._retries,
+                "rate_limited": self._rate_limited,
+                "failures": self._failures,
+                "requests_available": round(self._requests.level, 1),
+                "tokens_available": round(self._tokens.level),
+            }
+
+
+_dispatcher: Optional[LLMDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> LLMDispatcher:
+    """
+    Return the process-wide dispatcher, configured from the environment on first use:
+      - OPENAI_RPM: requests per minute (default 500)
+      - OPENAI_TPM: tokens per minute (default 200000)
+      - OPENAI_BURST_SECONDS: budget that may be spent at once after idling (default 60)
+      - OPENAI_DISPATCH_RETRIES: retries on 429/5xx (default 5)
+    """
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = LLMDispatcher(
+                requests_per_minute=int(os.getenv("OPENAI_RPM", "500")),
+                tokens_per_minute=int(os.getenv("OPENAI_TPM", "200000")),
+                burst_seconds=float(os.getenv("OPENAI_BURST_SECONDS", "60")),
+                max_retries=int(os.getenv("OPENAI_DISPATCH_RETRIES", "5")),
+            )
+            log_system_message(
+                f"[LLMDispatcher] Limits: {_dispatcher.requests_per_minute} RPM, {_dispatcher.tokens_per_minute} TPM"
+            )
+        return _dispatcher
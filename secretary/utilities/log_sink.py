@@ -0,0 +1,424 @@
+"""Rotating, compressed JSONL log sink with a time-range index.
+
+Records are appended as one JSON object per line to `<prefix>.jsonl` in the log directory. The
+active segment is rotated when it exceeds `max_bytes` or gets older than `max_age` seconds; rotated
+segments are compressed in the background (gzip, or zstd when the `zstandard` package is installed)
+and listed in `<prefix>.index.json` with their time range, so queries only open the segments that
+overlap the requested window. The oldest segments are deleted once `max_total_bytes` is exceeded.
+
+    python -m secretary.utilities.log_sink query --since 2h --grep "find_perfect_meeting_time"
+    python -m secretary.utilities.log_sink query --prefix communication_log --since 2024-06-01T09:00 --level ERROR
+"""
+
+import argparse
+import gzip
+import io
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional, gzip is used instead
+    zstandard = None
+
+_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+
+
+def _open_segment(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd-compressed but the zstandard package is not installed")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb")), encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def read_index(directory: str, prefix: str) -> List[dict]:
+    """Rotated segments of a sink, oldest first: [{"file", "start", "end", "records", "bytes"}]."""
+    try:
+        with open(os.path.join(directory, f"{prefix}.index.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def query_logs(directory: str, prefix: str, since: float = None, until: float = None, contains: str = None,
+               level: str = None) -> Iterator[dict]:
+    """
+    Yield records in [since, until], opening only the segments whose time range overlaps it.
+
+    Args:
+        directory (str): Log directory.
+        prefix (str): Sink prefix.
+        since (float, optional): Epoch seconds lower bound.
+        until (float, optional): Epoch seconds upper bound.
+        contains (str, optional): Regex matched against the raw JSON line.
+        level (str, optional): Only records with this "level".
+    """
+    pattern = re.compile(contains) if contains else None
+    paths = [os.path.join(directory, e["file"]) for e in read_index(directory, prefix)
+             if (since is None or (e["end"] or 0) >= since) and (until is None or (e["start"] or 0) <= until)]
+    paths.append(os.path.join(directory, f"{prefix}.jsonl"))
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with _open_segment(path) as f:
+            for line in f:
+                if pattern is not None and not pattern.search(line):
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(record, dict):
+                    continue
+                ts = record.get("ts", 0)
+                if (since is not None and ts < since) or (until is not None and ts > until):
+                    continue
+                if level and record.get("level") != level:
+                    continue
+                yield record
+
+
+class JsonlSink:
+    """
+    Append-only JSONL writer with rotation, background compression, retention and an index.
+
+    Attributes:
+        directory (str): Where segments and the index live.
+        prefix (str): File name prefix, e.g. "agentai" -> agentai.jsonl, agentai.index.json.
+        max_bytes (int): Rotate the active segment beyond this size.
+        max_age (float): Rotate the active segment once its first record is this old (seconds).
+        compression (str): "gzip", "zstd" or "none".
+        max_total_bytes (int): Disk budget for rotated segments; the oldest are deleted beyond it.
+        background (bool): Write from a background thread (callers only enqueue).
+        dropped (int): Background records that failed to be written; the first failure is reported
+            on stderr, as logging.Handler.handleError does.
+    """
+
+    def __init__(self, directory: str, prefix: str = "agentai", max_bytes: int = 50 * 1024 * 1024,
+                 max_age: float = 86400.0, compression: str = "gzip", max_total_bytes: int = 1024 * 1024 * 1024,
+                 background: bool = False):
+        if compression == "zstd" and zstandard is None:
+            compression = "gzip"
+        if compression not in _EXTENSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compression = compression
+        self.max_total_bytes = max_total_bytes
+        self.background = background
+        self.path = os.path.join(directory, f"{prefix}.jsonl")
+        self.index_path = os.path.join(directory, f"{prefix}.index.json")
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._index_lock = threading.Lock()
+        self._compressors: List[threading.Thread] = []
+        self._file = None
+        self._size = 0
+        self._first_ts = None
+        self._last_ts = None
+        self._records = 0
+        self.dropped = 0
+
+        # Continue a segment left behind by a previous run (one writing process per prefix)
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            self._first_ts, self._last_ts, self._records = self._scan(self.path)
+        self._open()
+
+        self._queue: Optional[queue.Queue] = None
+        if background:
+            self._queue = queue.Queue()
+            self._writer = threading.Thread(target=self._drain, name=f"jsonl-sink-{prefix}", daemon=True)
+            self._writer.start()
+
+    # -- writing ---------------------------------------------------------------------------------
+
+    def write(self, record: dict):
+        """
+        Append one record; a "ts" (epoch seconds) field is added if missing.
+
+        Args:
+            record (dict): JSON-serializable record.
+        """
+        if "ts" not in record:
+            record = {"ts": time.time(), **record}
+        if self._queue is not None:
+            self._queue.put(record)
+        else:
+            self._write(record)
+
+    def _drain(self):
+        while True:
+            record = self._queue.get()
+            try:
+                if record is None:
+                    return
+                self._write(record)
+            except Exception:
+                # Not through logging: this sink may be the one behind the log handler
+                self.dropped += 1
+                if self.dropped == 1:
+                    sys.stderr.write(f"--- JsonlSink error: record dropped from {self.path} ---\n")
+                    traceback.print_exc(file=sys.stderr)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, record: dict):
+        data = (json.dumps(record, default=str, ensure_ascii=False) + "\n").encode("utf-8")
+        ts = record["ts"]
+        with self._lock:
+            if self._records and (self._size + len(data) > self.max_bytes or ts - (self._first_ts or time.time()) >= self.max_age):
+                self._rotate_locked()
+                self._open()
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+            if self._first_ts is None:
+                self._first_ts = ts
+            self._last_ts = ts
+            self._records += 1
+
+    def _open(self):
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+
+    def _rotate_locked(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        stamp = datetime.fromtimestamp(self._first_ts or time.time()).strftime("%Y%m%dT%H%M%S")
+        segment = os.path.join(self.directory, f"{self.prefix}-{stamp}-{int(time.time() * 1000) % 100000:05d}.jsonl")
+        os.replace(self.path, segment)
+        entry = {"file": os.path.basename(segment), "start": self._first_ts, "end": self._last_ts,
+                 "records": self._records, "bytes": os.path.getsize(segment)}
+        self._update_index(lambda index: index + [entry])
+        self._first_ts = self._last_ts = None
+        self._records = 0
+        self._size = 0
+        if self.compression != "none":
+            thread = threading.Thread(target=self._compress, args=(segment,), daemon=True)
+            self._compressors = [t for t in self._compressors if t.is_alive()] + [thread]
+            thread.start()
+        else:
+            self._enforce_retention()
+
+    def rotate(self):
+        """Close the active segment now (no-op if it is empty)."""
+        with self._lock:
+            if self._records:
+                self._rotate_locked()
+                self._open()
+
+    # -- compression, index, retention -----------------------------------------------------------
+
+    def _compress(self, segment: str):
+        target = segment + _EXTENSIONS[self.compression]
+        try:
+            with open(segment, "rb") as src:
+                if self.compression == "zstd":
+                    with open(target, "wb") as dst:
+                        zstandard.ZstdCompressor(level=3).copy_stream(src, dst)
+                else:
+                    with gzip.open(target, "wb", compresslevel=6) as dst:
+                        while True:
+                            chunk = src.read(1 << 20)
+                            if not chunk:
+                                break
+                            dst.write(chunk)
+            os.remove(segment)
+        except OSError:
+            return
+
+        name, new_name, size = os.path.basename(segment), os.path.basename(target), os.path.getsize(target)
+
+        def rename(index):
+            for entry in index:
+                if entry["file"] == name:
+                    entry["file"], entry["bytes"] = new_name, size
+            return index
+        self._update_index(rename)
+        self._enforce_retention()
+
+    def _enforce_retention(self):
+        def prune(index):
+            total = sum(e["bytes"] for e in index)
+            while index and total > self.max_total_bytes:
+                oldest = index.pop(0)
+                total -= oldest["bytes"]
+                try:
+                    os.remove(os.path.join(self.directory, oldest["file"]))
+                except OSError:
+                    pass
+            return index
+        self._update_index(prune)
+
+    def read_index(self) -> List[dict]:
+        """Rotated segments, oldest first: [{"file", "start", "end", "records", "bytes"}]."""
+        return read_index(self.directory, self.prefix)
+
+    def _update_index(self, fn):
+        with self._index_lock:
+            index = fn(self.read_index())
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp, self.index_path)
+
+    @staticmethod
+    def _scan(path: str):
+        """
+        (first ts, last ts, line count) of an existing segment, parsing only its first and last line.
+        Lines without a readable "ts" fall back to the file's modification time.
+        """
+        count = 0
+        first_line = last_line = b""
+        with open(path, "rb") as f:
+            first_line = f.readline()
+            f.seek(0)
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                count += chunk.count(b"\n")
+            f.seek(max(0, f.tell() - 65536))
+            tail = f.read().rstrip(b"\n").rsplit(b"\n", 1)
+            last_line = tail[-1]
+
+        def ts(line):
+            try:
+                value = json.loads(line).get("ts")
+            except (ValueError, AttributeError):
+                return None
+            return value if isinstance(value, (int, float)) else None
+        first, last = ts(first_line), ts(last_line)
+        if first is None or last is None:
+            modified = os.path.getmtime(path)
+            first = first if first is not None else (last if last is not None else modified)
+            last = last if last is not None else modified
+        return first, last, count
+
+    # -- reading ---------------------------------------------------------------------------------
+
+    def query(self, since: float = None, until: float = None, contains: str = None, level: str = None) -> Iterator[dict]:
+        """Records of this sink in a time window; see query_logs()."""
+        return query_logs(self.directory, self.prefix, since, until, contains, level)
+
+    def flush(self):
+        """Wait for queued records and running compressions (tests, shutdown)."""
+        if self._queue is not None:
+            self._queue.join()
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+        for thread in list(self._compressors):
+            thread.join()
+
+    def close(self):
+        self.flush()
+        if self._queue is not None:
+            self._queue.put(None)
+            self._writer.join(timeout=5)
+        if self.dropped:
+            sys.stderr.write(f"JsonlSink: {self.dropped} records could not be written to {self.path}\n")
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class JsonlLogHandler(logging.Handler):
+    """logging.Handler writing records to a JsonlSink (ts, time, level, msg, thread, exc)."""
+
+    def __init__(self, sink: JsonlSink, level=logging.NOTSET):
+        super().__init__(level)
+        self.sink = sink
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            entry = {
+                "ts": record.created,
+                "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+                "level": record.levelname,
+                "msg": record.getMessage(),
+                "thread": record.threadName,
+            }
+            if record.exc_info and not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            if record.exc_text:
+                entry["exc"] = record.exc_text
+            self.sink.write(entry)
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.sink.close()
+        super().close()
+
+
+_sinks = {}
+_sinks_lock = threading.Lock()
+
+
+def get_sink(directory: str, prefix: str, **kwargs) -> JsonlSink:
+    """Return the shared sink for a directory/prefix, creating it on first use."""
+    key = (os.path.abspath(directory), prefix)
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None:
+            sink = _sinks[key] = JsonlSink(directory, prefix, **kwargs)
+        return sink
+
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds from "30m"/"2h"/"3d" (ago) or an ISO timestamp."""
+    if not value:
+        return None
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhd])", value.strip())
+    if match:
+        unit = {"s": 1, "m": 60, "h": 3600, "d": 86400}[match.group(2)]
+        return time.time() - float(match.group(1)) * unit
+    return datetime.fromisoformat(value).timestamp()
+
+
+if __name__ == "__main__":
+    from secretary.utilities.logging import logs_dir
+
+    parser = argparse.ArgumentParser(description="Query the rotating JSONL logs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    q = sub.add_parser("query", help="Print records in a time window")
+    q.add_argument("--dir", default=logs_dir)
+    q.add_argument("--prefix", default="agentai")
+    q.add_argument("--since", help="e.g. 2h, 30m, 2024-06-01T09:00")
+    q.add_argument("--until")
+    q.add_argument("--grep", help="Regex on the raw line")
+    q.add_argument("--level")
+    q.add_argument("--json", action="store_true", help="Print raw JSON lines")
+    idx = sub.add_parser("index", help="Show the segment index")
+    idx.add_argument("--dir", default=logs_dir)
+    idx.add_argument("--prefix", default="agentai")
+    args = parser.parse_args()
+
+    if args.command == "index":
+        for entry in read_index(args.dir, args.prefix):
+            start = datetime.fromtimestamp(entry["start"]) if entry["start"] else "?"
+            end = datetime.fromtimestamp(entry["end"]) if entry["end"] else "?"
+            print(f"{entry['file']}  {start} .. {end}  {entry['records']} records  {entry['bytes']} bytes")
+    else:
+        for record in query_logs(args.dir, args.prefix, parse_time(args.since), parse_time(args.until),
+                                 args.grep, args.level):
+            if args.json:
+                print(json.dumps(record, ensure_ascii=False))
+            else:
+                print(f"{record.get('time', record.get('ts'))} {record.get('level', '-'):<7} "
+                      f"{record.get('msg', record)}")
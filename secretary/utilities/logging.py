@@ -1,10 +1,30 @@
-"""This will log every message that is incoming or outgoing"""
+"""This will log every message that is incoming or outgoing
 
+The helpers are cheap when nothing will be written: the category switch and the logger level are
+checked before anything is formatted, and formatting is lazy - pass %-style arguments instead of
+building an f-string on the hot path:
+
+    log_system_message("[Scheduler] [%s] %d meetings found", node_id, len(meetings))
+
+Payloads (API requests/responses, network messages) are rendered with a bounded repr, so a whole
+calendar or email body costs at most LOG_MAX_PAYLOAD characters. API request/response records can be
+sampled with LOG_API_SAMPLE_RATE. Handlers run on a QueueListener thread; request threads render
+the message of a record that passed the checks, enqueue it and never block on the disk or the console. The file log is a rotating JSONL
+sink (see log_sink.py).
+"""
+
+import atexit
+import copy
 import logging
+import logging.handlers
 import os
+import queue
+import random
 from datetime import datetime
 import traceback
 
+from secretary.utilities.log_sink import JsonlSink, JsonlLogHandler
+
 # ===== Logging Configuration =====
 # Enable/disable specific logging categories
 LOG_USER_MESSAGES = True     # Messages from users
@@ -20,21 +40,34 @@ LOG_WARNINGS = True          # Warning messages
 FILE_LOG_LEVEL = logging.DEBUG    # Level for file logging
 CONSOLE_LOG_LEVEL = logging.INFO  # Level for console logging
 
+# Payload size limit (characters) and sampling of API request/response records
+MAX_PAYLOAD_CHARS = int(os.getenv("LOG_MAX_PAYLOAD", "2000"))
+API_SAMPLE_RATE = float(os.getenv("LOG_API_SAMPLE_RATE", "1.0"))
+
 # Create logs directory if it doesn't exist
 logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "logs")
 if not os.path.exists(logs_dir):
     os.makedirs(logs_dir)
 
-# Generate a filename based on current date and time
 current_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-log_file = os.path.join(logs_dir, f"log_{current_time}.txt")
+
+# Structured file log: logs/agentai.jsonl, rotated by size/age into compressed, indexed segments
+# (query with `python -m secretary.utilities.log_sink query --since 1h --grep ...`)
+file_sink = JsonlSink(
+    logs_dir,
+    prefix="agentai",
+    max_bytes=int(os.getenv("LOG_MAX_BYTES", str(50 * 1024 * 1024))),
+    max_age=float(os.getenv("LOG_ROTATE_SECONDS", "86400")),
+    compression=os.getenv("LOG_COMPRESSION", "gzip"),
+    max_total_bytes=int(os.getenv("LOG_MAX_TOTAL_BYTES", str(1024 * 1024 * 1024))),
+)
+log_file = file_sink.path
 
 # Configure logger
 logger = logging.getLogger("AgentAI")
-logger.setLevel(logging.DEBUG)
 
 # Create file handler
-file_handler = logging.FileHandler(log_file, encoding="utf-8")
+file_handler = JsonlLogHandler(file_sink)
 file_handler.setLevel(FILE_LOG_LEVEL)
 
 # Create console handler
@@ -43,54 +76,154 @@ console_handler.setLevel(CONSOLE_LOG_LEVEL)
 
 # Create formatter
 formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-file_handler.setFormatter(formatter)
 console_handler.setFormatter(formatter)
 
-# Add handlers to logger
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+class _FrozenQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that snapshots each record before it is queued.
+
+    The message is rendered and the traceback formatted on the emitting thread, so the listener
+    writes the arguments as they were at the call, not as the caller has changed them since. Unlike
+    the stock prepare(), the console formatter is not applied, so the file log keeps the bare message.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = formatter.formatException(record.exc_info)
+        record.exc_info = None  # the traceback's frames hold live objects too
+        return record
+
+
+# Request threads only enqueue; the listener thread formats and writes
+log_queue = queue.SimpleQueue()
+queue_handler = _FrozenQueueHandler(log_queue)
+listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+logger.addHandler(queue_handler)
+listener.start()
+atexit.register(listener.stop)
+
+
+def _sync_logger_level():
+    # The logger drops records no handler wants before any formatting happens
+    logger.setLevel(min(file_handler.level, console_handler.level))
+
+
+_sync_logger_level()
+
+
+def _bounded_repr(value, limit: int) -> str:
+    """repr()-like rendering that stops walking containers once `limit` characters are produced.
+
+    A top-level string is rendered as is, nested values with repr().
+    """
+    parts = []
+    state = {"left": limit, "truncated": False}
+
+    def emit(text):
+        if len(text) > state["left"]:
+            parts.append(text[:state["left"]])
+            state["left"] = 0
+            state["truncated"] = True
+            return False
+        parts.append(text)
+        state["left"] -= len(text)
+        return True
+
+    def walk(obj, top=False):
+        if isinstance(obj, dict):
+            if not emit("{"):
+                return False
+            for i, (k, v) in enumerate(obj.items()):
+                if (i and not emit(", ")) or not emit(f"{k!r}: ") or not walk(v):
+                    return False
+            return emit("}")
+        if isinstance(obj, (list, tuple)):
+            if not emit("["):
+                return False
+            for i, item in enumerate(obj):
+                if (i and not emit(", ")) or not walk(item):
+                    return False
+            return emit("]")
+        if isinstance(obj, str):
+            # Cut long strings before repr() so their cost is bounded too
+            text = obj[:state["left"] + 1]
+            return emit(text if top else repr(text)[:-1] + ("'" if len(text) == len(obj) else ""))
+        return emit(repr(obj))
+
+    walk(value, top=True)
+    text = "".join(parts)
+    return text + " …[truncated]" if state["truncated"] else text
+
+
+class Payload:
+    """
+    Size-bounded log argument, rendered only for records that pass the category and level checks.
+
+    Attributes:
+        value: The object to render.
+        limit (int): Maximum number of characters rendered.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit: int = None):
+        self.value = value
+        self.limit = MAX_PAYLOAD_CHARS if limit is None else limit
+
+    def __str__(self):
+        return _bounded_repr(self.value, self.limit)
+
+
+def _enabled(category_flag: bool, level: int) -> bool:
+    return category_flag and logger.isEnabledFor(level)
+
 
-def log_user_message(user_id, message):
+def log_user_message(user_id, message, *args):
     """Log a message from a user"""
-    if LOG_USER_MESSAGES:
-        logger.info(f"USER ({user_id}): {message}")
+    if _enabled(LOG_USER_MESSAGES, logging.INFO):
+        logger.info("USER (%s): %s", user_id, Payload(message % args if args else message))
 
-def log_agent_message(agent_id, message):
+def log_agent_message(agent_id, message, *args):
     """Log a message from an agent"""
-    if LOG_AGENT_MESSAGES:
-        logger.info(f"AGENT ({agent_id}): {message}")
+    if _enabled(LOG_AGENT_MESSAGES, logging.INFO):
+        logger.info("AGENT (%s): %s", agent_id, Payload(message % args if args else message))
 
-def log_system_message(message):
-    """Log a system message"""
-    if LOG_SYSTEM_MESSAGES:
-        logger.info(f"SYSTEM: {message}")
+def log_system_message(message, *args):
+    """Log a system message (%-style args are formatted only if the record is written)"""
+    if _enabled(LOG_SYSTEM_MESSAGES, logging.INFO):
+        logger.info("SYSTEM: " + str(message), *args)
 
 def log_api_request(api_name, request_data):
-    """Log an API request"""
-    if LOG_API_REQUESTS:
-        logger.debug(f"API REQUEST ({api_name}): {request_data}")
+    """Log an API request (payload truncated, sampled by LOG_API_SAMPLE_RATE)"""
+    if _enabled(LOG_API_REQUESTS, logging.DEBUG) and (API_SAMPLE_RATE >= 1 or random.random() < API_SAMPLE_RATE):
+        logger.debug("API REQUEST (%s): %s", api_name, Payload(request_data))
 
 def log_api_response(api_name, response_data):
-    """Log an API response"""
-    if LOG_API_RESPONSES:
-        logger.debug(f"API RESPONSE ({api_name}): {response_data}")
+    """Log an API response (payload truncated, sampled by LOG_API_SAMPLE_RATE)"""
+    if _enabled(LOG_API_RESPONSES, logging.DEBUG) and (API_SAMPLE_RATE >= 1 or random.random() < API_SAMPLE_RATE):
+        logger.debug("API RESPONSE (%s): %s", api_name, Payload(response_data))
 
 def log_network_message(sender_id, recipient_id, content):
     """Log a message sent through the network"""
-    if LOG_NETWORK_MESSAGES:
-        logger.info(f"NETWORK: From {sender_id} to {recipient_id}: {content}")
+    if _enabled(LOG_NETWORK_MESSAGES, logging.INFO):
+        logger.info("NETWORK: From %s to %s: %s", sender_id, recipient_id, Payload(content))
 
-def log_error(error_message, include_traceback=True):
+def log_error(error_message, *args, include_traceback=True):
     """Log an error message with optional traceback"""
-    if LOG_ERRORS:
+    if _enabled(LOG_ERRORS, logging.ERROR):
+        if args:
+            error_message = str(error_message) % args
         if include_traceback:
             error_message = f"{error_message}\n{traceback.format_exc()}"
-        logger.error(f"ERROR: {error_message}")
+        logger.error("ERROR: %s", error_message)
 
-def log_warning(warning_message):
+def log_warning(warning_message, *args):
     """Log a warning message"""
-    if LOG_WARNINGS:
-        logger.warning(f"WARNING: {warning_message}")
+    if _enabled(LOG_WARNINGS, logging.WARNING):
+        logger.warning("WARNING: " + str(warning_message), *args)
 
 def set_logging_category(category, enabled):
     """Enable or disable a specific logging category"""
@@ -120,7 +253,7 @@ def set_logging_category(category, enabled):
         print(f"Unknown logging category: {category}")
         return False
     
-    logger.info(f"Logging category '{category}' set to {'enabled' if enabled else 'disabled'}")
+    logger.info("Logging category '%s' set to %s", category, 'enabled' if enabled else 'disabled')
     return True
 
 def set_log_level(handler_type, level):
@@ -129,10 +262,12 @@ def set_log_level(handler_type, level):
     
     if handler_type.upper() == "FILE":
         file_handler.setLevel(level)
-        logger.info(f"File log level set to {logging.getLevelName(level)}")
+        _sync_logger_level()
+        logger.info("File log level set to %s", logging.getLevelName(level))
     elif handler_type.upper() == "CONSOLE":
         console_handler.setLevel(level)
-        logger.info(f"Console log level set to {logging.getLevelName(level)}")
+        _sync_logger_level()
+        logger.info("Console log level set to %s", logging.getLevelName(level))
     else:
         print(f"Unknown handler type: {handler_type}")
         return False
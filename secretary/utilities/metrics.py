@@ -0,0 +1,199 @@
+"""In-process metrics for the message pipeline, exported in Prometheus text format.
+
+Recording is a perf_counter() pair, a bisect and a few additions under a lock; all formatting
+happens in render(), i.e. only when /metrics is scraped.
+
+    with timed("route", node_id):
+        ...
+
+Histograms:
+  - secretary_stage_duration_seconds{node, stage}         stages of Communication.receive_message
+  - secretary_llm_request_duration_seconds{node, endpoint} every OpenAI call made through a NodeClient
+  - secretary_google_request_duration_seconds{node, api, method} every Google API request
+
+Set METRICS_ENABLED=0 to turn recording off entirely.
+"""
+
+import bisect
+import contextlib
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Upper bounds in seconds; pipeline stages range from microseconds (rules) to tens of seconds (planning)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+
+
+class Histogram:
+    """
+    Prometheus-style cumulative histogram with one series per label combination.
+
+    Attributes:
+        name (str): Metric name.
+        help (str): Description shown in the exposition.
+        label_names (tuple): Names of the labels, in order.
+        buckets (tuple): Bucket upper bounds in seconds.
+    """
+
+    def __init__(self, name: str, help: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+1 for +Inf), sum, count]
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        """
+        Record one observation.
+
+        Args:
+            value (float): Observed duration in seconds.
+            *label_values: One value per label name.
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self) -> Dict[tuple, dict]:
+        """Copy of every series: {labels: {"buckets": cumulative counts, "sum": s, "count": n}}."""
+        with self._lock:
+            items = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()]
+        result = {}
+        for labels, counts, total, count in items:
+            cumulative, running = [], 0
+            for c in counts:
+                running += c
+                cumulative.append(running)
+            result[labels] = {"buckets": cumulative, "sum": total, "count": count}
+        return result
+
+    def render(self) -> List[str]:
+        """Exposition lines for this histogram."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        bounds = [_format_float(b) for b in self.buckets] + ["+Inf"]
+        for labels, data in sorted(self.snapshot().items()):
+            base = _format_labels(self.label_names, labels)
+            for bound, count in zip(bounds, data["buckets"]):
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{{{base + ',' if base else ''}{le}}} {count}")
+            suffix = f"{{{base}}}" if base else ""
+            lines.append(f"{self.name}_sum{suffix} {data['sum']:.6f}")
+            lines.append(f"{self.name}_count{suffix} {data['count']}")
+        return lines
+
+
+def _format_float(value: float) -> str:
+    return f"{value:g}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: tuple) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+class MetricsRegistry:
+    """Holds the histograms and gauge callbacks rendered on /metrics."""
+
+    def __init__(self):
+        self._histograms: Dict[str, Histogram] = {}
+        self._gauges: Dict[str, Tuple[str, Tuple[str, ...], Callable[[], Dict[tuple, float]]]] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help: str, label_names: Tuple[str, ...], buckets=DEFAULT_BUCKETS) -> Histogram:
+        """Return the histogram with this name, creating it on first use."""
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram(name, help, label_names, buckets)
+            return hist
+
+    def register_gauge(self, name: str, help: str, label_names: Tuple[str, ...], fn: Callable[[], Dict[tuple, float]]):
+        """
+        Register a gauge whose values are computed at scrape time.
+
+        Args:
+            name (str): Metric name.
+            help (str): Description.
+            label_names (tuple): Label names.
+            fn (Callable): Returns {label values tuple: value}.
+        """
+        with self._lock:
+            self._gauges[name] = (help, label_names, fn)
+
+    def render(self) -> str:
+        """The full Prometheus text exposition."""
+        with self._lock:
+            histograms = list(self._histograms.values())
+            gauges = list(self._gauges.items())
+        lines = []
+        for hist in histograms:
+            lines.extend(hist.render())
+        for name, (help, label_names, fn) in gauges:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} gauge")
+            try:
+                values = fn()
+            except Exception:
+                continue
+            for labels, value in sorted(values.items()):
+                base = _format_labels(label_names, labels)
+                lines.append(f"{name}{{{base}}} {value}" if base else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_DURATION = registry.histogram(
+    "secretary_stage_duration_seconds", "Time spent in each stage of the message pipeline.", ("node", "stage"))
+LLM_DURATION = registry.histogram(
+    "secretary_llm_request_duration_seconds", "Duration of OpenAI API calls.", ("node", "endpoint"))
+GOOGLE_DURATION = registry.histogram(
+    "secretary_google_request_duration_seconds", "Duration of Google API requests.", ("node", "api", "method"))
+
+
+@contextlib.contextmanager
+def timed_into(histogram: Histogram, *label_values):
+    """
+    Time the enclosed block into a histogram.
+
+    Args:
+        histogram (Histogram): Target histogram.
+        *label_values: One value per label of the histogram.
+    """
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, *label_values)
+
+
+def timed(stage: str, node: Optional[str] = None):
+    """
+    Time a pipeline stage into secretary_stage_duration_seconds.
+
+    Args:
+        stage (str): Stage name.
+        node (str, optional): Node the stage ran for.
+    """
+    return timed_into(STAGE_DURATION, node or "", stage)
+
+
+def render() -> str:
+    """Prometheus exposition of the process-wide registry."""
+    return registry.render()
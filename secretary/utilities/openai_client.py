@@ -0,0 +1,315 @@
+"""Shared OpenAI client registry.
+
+All nodes talk to OpenAI through one pooled HTTP stack so keep-alive connections are reused
+instead of every component doing its own TLS handshake. Each node gets a thin wrapper that
+caps how many requests it can have in flight at once.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import openai
+
+from secretary.utilities.logging import log_system_message
+from secretary.utilities.llm_dispatcher import LLMDispatcher, get_dispatcher
+from secretary.utilities import metrics
+from secretary.utilities.usage import UsageLedger, find_call_site, get_ledger
+from secretary.utilities.tracing import span, current_span
+from secretary.utilities.session_recorder import intercept
+
+# Endpoints whose responses can be recorded and rebuilt for replay
+_REPLAYABLE = {"Completions.create": openai.types.chat.ChatCompletion.model_validate}
+
+
+class _ThrottledResource:
+    """
+    Proxy around an OpenAI client (or one of its sub-resources) that holds a semaphore
+    while any of its methods run.
+
+    Attribute access is forwarded, so `proxy.chat.completions.create(...)` works exactly like on
+    the real client; only the final call is wrapped. Return values are not proxied.
+    """
+
+    def __init__(self, target, semaphore: threading.BoundedSemaphore, owner: "NodeClient"):
+        self._target = target
+        self._semaphore = semaphore
+        self._owner = owner
+
+    def __getattr__(self, name):
+        if name in ("_target", "_semaphore", "_owner"):
+            raise AttributeError(name)
+        attr = getattr(self._target, name)
+        if callable(attr) and not isinstance(attr, type):
+            return self._owner._wrap_call(attr)
+        if name.startswith("_") or isinstance(attr, (str, int, float, bool, type(None))):
+            return attr
+        return _ThrottledResource(attr, self._semaphore, self._owner)
+
+
+class _HeldStream:
+    """
+    A streamed response that keeps its node's concurrency slot until it is read to the end or closed.
+
+    Iterating, closing and using it as a context manager work as on the openai Stream; other
+    attributes are forwarded. The dispatcher's limits are per request, so a stream is charged once,
+    when it starts, with its estimated tokens (streams report no usage to correct them with).
+    """
+
+    def __init__(self, stream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+        self._lock = threading.Lock()
+        self._held = True
+
+    def _done(self):
+        with self._lock:
+            held, self._held = self._held, False
+        if held:
+            self._release()
+
+    def __iter__(self):
+        try:
+            yield from self._stream
+        finally:
+            self._done()
+
+    def close(self):
+        try:
+            close = getattr(self._stream, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._done()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        # A stream dropped without being read must not leak the slot
+        self._done()
+
+    def __getattr__(self, name):
+        if name in ("_stream", "_release", "_lock", "_held"):
+            raise AttributeError(name)
+        return getattr(self._stream, name)
+
+
+class NodeClient(_ThrottledResource):
+    """
+    Per-node view of a shared OpenAI client.
+
+    Attributes:
+        node_id (str): The node this view belongs to.
+        max_concurrency (int): Maximum number of simultaneous requests for this node.
+        dispatcher (Optional[LLMDispatcher]): Shared rate limiter / priority queue, if any.
+        ledger (Optional[UsageLedger]): Where each request's tokens, latency and call site are recorded.
+    """
+
+    def __init__(self, node_id: str, client: openai.OpenAI, max_concurrency: int,
+                 dispatcher: Optional[LLMDispatcher] = None, ledger: Optional[UsageLedger] = None):
+        self.node_id = node_id
+        self.max_concurrency = max_concurrency
+        self.dispatcher = dispatcher
+        self.ledger = ledger
+        super().__init__(client, threading.BoundedSemaphore(max_concurrency), self)
+
+    @property
+    def raw(self) -> openai.OpenAI:
+        """The underlying shared client (no concurrency cap)."""
+        return self._target
+
+    def _wrap_call(self, fn):
+        endpoint = getattr(fn, "__qualname__", "call")  # e.g. Completions.create
+
+        def capped(site, *args, **kwargs):
+            self._semaphore.acquire()
+            try:
+                response = measured(site, *args, **kwargs)
+            except BaseException:
+                self._semaphore.release()
+                raise
+            if kwargs.get("stream"):
+                # The request runs until the stream is read to the end, so the slot is held until then
+                return _HeldStream(response, self._semaphore.release)
+            self._semaphore.release()
+            return response
+
+        def measured(site, *args, **kwargs):
+            with metrics.timed_into(metrics.LLM_DURATION, self.node_id, endpoint):
+                if self.ledger is None:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    response = fn(*args, **kwargs)
+                except Exception as e:
+                    self.ledger.record_response(self.node_id, site, kwargs, None, time.perf_counter() - start, error=e)
+                    raise
+                self.ledger.record_response(self.node_id, site, kwargs, response, time.perf_counter() - start)
+                usage = getattr(response, "usage", None)
+                if usage is not None:
+                    current_span().set_attribute("tokens", getattr(usage, "total_tokens", 0) or 0)
+                return response
+
+        def call(*args, **kwargs):
+            # Resolved here, in the caller's thread, before any queueing
+            site = find_call_site() if self.ledger is not None else None
+            # The span covers dispatcher queueing and retries as well as the request itself
+            with span(f"openai {endpoint}", kind="client", node=self.node_id, model=kwargs.get("model", ""),
+                      site=site or ""):
+                if endpoint not in _REPLAYABLE:
+                    return dispatch(site, *args, **kwargs)
+                return intercept("openai", self.node_id, endpoint, kwargs, lambda: dispatch(site, *args, **kwargs),
+                                 decode=_REPLAYABLE[endpoint])
+
+        def dispatch(site, *args, **kwargs):
+            if self.dispatcher is None:
+                return capped(site, *args, **kwargs)
+            # Rate limits and priority first, so a node's slots aren't held while queued
+            return self.dispatcher.submit(capped, site, *args, **kwargs)
+        return call
+
+
+class ClientRegistry:
+    """
+    Builds and hands out the OpenAI clients used by every component.
+
+    One httpx connection pool is shared by all clients, regardless of API key, because
+    authentication is a per-request header.
+
+    Attributes:
+        api_key (str): Default API key.
+        base_url (Optional[str]): Alternative OpenAI-compatible endpoint (None for api.openai.com).
+        per_node_concurrency (int): In-flight request cap for each node.
+        dispatcher (Optional[LLMDispatcher]): Rate limiter shared by all node clients. When set, it owns
+            retries and the SDK's own retries are turned off to avoid retry storms.
+        ledger (Optional[UsageLedger]): Usage ledger shared by all node clients.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+        timeout: float = 60.0,
+        connect_timeout: float = 5.0,
+        max_retries: int = 2,
+        per_node_concurrency: int = 4,
+        dispatcher: Optional[LLMDispatcher] = None,
+        ledger: Optional[UsageLedger] = None,
+    ):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL") or None
+        self.per_node_concurrency = per_node_concurrency
+        self.dispatcher = dispatcher
+        self.ledger = ledger
+        self.max_retries = 0 if dispatcher is not None else max_retries
+
+        # httpx.Limits / httpx.Timeout, taken from openai so we don't pin httpx ourselves
+        limits_cls = type(openai.DEFAULT_CONNECTION_LIMITS)
+        self._limits = limits_cls(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._timeout = openai.Timeout(timeout, connect=connect_timeout)
+        self._http_client = None
+
+        self._clients: Dict[str, openai.OpenAI] = {}       # api_key -> client
+        self._node_clients: Dict[tuple, NodeClient] = {}   # (node_id, api_key) -> view
+        self._lock = threading.Lock()
+
+    def _get_http_client(self):
+        if self._http_client is None:
+            self._http_client = openai.DefaultHttpxClient(limits=self._limits, timeout=self._timeout)
+        return self._http_client
+
+    def get_shared_client(self, api_key: Optional[str] = None) -> openai.OpenAI:
+        """
+        Return the shared (uncapped) client for an API key, creating it on first use.
+
+        Args:
+            api_key (Optional[str]): Key override; defaults to the registry key.
+
+        Returns:
+            openai.OpenAI: Client bound to the shared connection pool.
+        """
+        key = api_key or self.api_key
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = openai.OpenAI(
+                    api_key=key,
+                    base_url=self.base_url,
+                    timeout=self._timeout,
+                    max_retries=self.max_retries,
+                    http_client=self._get_http_client(),
+                )
+                self._clients[key] = client
+                log_system_message(f"[ClientRegistry] Created pooled OpenAI client (base_url={self.base_url or 'default'})")
+            return client
+
+    def get_client(self, node_id: str = "global", api_key: Optional[str] = None) -> NodeClient:
+        """
+        Return the per-node view of the shared client.
+
+        Args:
+            node_id (str): Node requesting the client; each node has its own concurrency cap.
+            api_key (Optional[str]): Key override for this node.
+
+        Returns:
+            NodeClient: Drop-in replacement for openai.OpenAI.
+        """
+        key = api_key or self.api_key
+        shared = self.get_shared_client(key)
+        with self._lock:
+            view = self._node_clients.get((node_id, key))
+            if view is None:
+                view = NodeClient(node_id, shared, self.per_node_concurrency,
+                                  dispatcher=self.dispatcher, ledger=self.ledger)
+                self._node_clients[(node_id, key)] = view
+            return view
+
+    def close(self):
+        """Close the shared connection pool."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+            self._clients.clear()
+            self._node_clients.clear()
+
+
+_registry: Optional[ClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry(api_key: Optional[str] = None) -> ClientRegistry:
+    """
+    Return the process-wide registry, configured from the environment on first use:
+      - OPENAI_API_KEY (unless api_key is given) / OPENAI_BASE_URL
+      - OPENAI_MAX_CONNECTIONS (default 50), OPENAI_KEEPALIVE_CONNECTIONS (default 20)
+      - OPENAI_TIMEOUT in seconds (default 60)
+      - OPENAI_NODE_CONCURRENCY (default 4)
+      - rate limits of the shared dispatcher, see llm_dispatcher.get_dispatcher()
+      - usage ledger size, see usage.get_ledger()
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ClientRegistry(
+                api_key=api_key,
+                max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "50")),
+                max_keepalive_connections=int(os.getenv("OPENAI_KEEPALIVE_CONNECTIONS", "20")),
+                timeout=float(os.getenv("OPENAI_TIMEOUT", "60")),
+                per_node_concurrency=int(os.getenv("OPENAI_NODE_CONCURRENCY", "4")),
+                dispatcher=get_dispatcher(),
+                ledger=get_ledger(),
+            )
+        return _registry
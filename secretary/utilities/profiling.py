@@ -0,0 +1,184 @@
+"""Opt-in sampling profiler for Flask requests.
+
+A profiled request gets a helper thread that samples the handler thread's stack every few
+milliseconds via sys._current_frames(); nothing is traced and unprofiled requests pay only the
+header/sample-rate check. Profiles are written as collapsed stacks ("frame;frame;frame count"),
+which flamegraph.pl, speedscope and inferno read directly, to logs/profiles/.
+
+A request is profiled when:
+  - it carries the header `X-Profile: 1` (or `X-Profile: <PROFILE_TOKEN>` when PROFILE_TOKEN is set), or
+  - it is picked by PROFILE_SAMPLE_RATE (0.0 - 1.0, default 0).
+"""
+
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+from flask import g, request
+
+from secretary.utilities.logging import logs_dir, log_system_message, log_warning
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples one thread's call stack at a fixed interval.
+
+    Attributes:
+        thread_id (int): Ident of the sampled thread.
+        interval (float): Seconds between samples.
+        samples (Counter): Collapsed stack (root first, ';'-joined) -> number of samples.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"profiler-{self.thread_id}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        """Stop sampling and return the collected stacks."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.samples
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+
+class RequestProfiler:
+    """
+    Flask extension profiling selected requests into collapsed-stack files.
+
+    Attributes:
+        directory (str): Where profiles are written.
+        header (str): Request header that asks for a profile.
+        token (Optional[str]): If set, the header value must equal it.
+        sample_rate (float): Fraction of requests profiled without the header.
+        max_profiles (int): Number of profile files kept; the oldest are deleted.
+        interval (float): Sampling interval in seconds.
+    """
+
+    def __init__(self, app=None, directory: str = None, header: str = "X-Profile", token: Optional[str] = None,
+                 sample_rate: float = 0.0, max_profiles: int = 50, interval: float = 0.005):
+        self.directory = directory or os.path.join(logs_dir, "profiles")
+        self.header = header
+        self.token = token
+        self.sample_rate = sample_rate
+        self.max_profiles = max_profiles
+        self.interval = interval
+        self._write_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Register the request hooks on a Flask app."""
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def wants_profile(self, headers) -> bool:
+        """Whether a request with these headers should be profiled."""
+        value = headers.get(self.header)
+        if value:
+            return value == self.token if self.token else value.lower() not in ("0", "false", "no")
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _before_request(self):
+        if not self.wants_profile(request.headers):
+            return
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        g._profile = (sampler, time.perf_counter())
+        sampler.start()
+
+    def _after_request(self, response):
+        profile = g.pop("_profile", None)
+        if profile is not None:
+            path = self._finish(profile, request.endpoint or "unknown", response.status_code)
+            if path:
+                response.headers["X-Profile-File"] = os.path.basename(path)
+        return response
+
+    def _teardown_request(self, exc):
+        # Handlers that raised skip after_request; still stop the sampler and keep the profile
+        profile = g.pop("_profile", None)
+        if profile is not None:
+            self._finish(profile, request.endpoint or "unknown", 500)
+
+    def _finish(self, profile, endpoint: str, status: int) -> Optional[str]:
+        sampler, start = profile
+        samples = sampler.stop()
+        elapsed_ms = int((time.perf_counter() - start) * 1000)
+        try:
+            return self.write(samples, endpoint, elapsed_ms, status)
+        except OSError as e:
+            log_warning(f"[Profiler] Could not write profile for {endpoint}: {e}")
+            return None
+
+    def write(self, samples: Counter, endpoint: str, elapsed_ms: int, status: int = 200) -> str:
+        """
+        Write collapsed stacks to the profile directory and enforce the retention cap.
+
+        Returns:
+            str: Path of the written file.
+        """
+        name = re.sub(r"[^\w.-]", "_", endpoint)
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+        path = os.path.join(self.directory, f"{stamp}_{name}_{status}_{elapsed_ms}ms.folded")
+        with self._write_lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in samples.most_common():
+                    f.write(f"{stack} {count}\n")
+            self._prune()
+        log_system_message(f"[Profiler] {endpoint} took {elapsed_ms} ms, {sum(samples.values())} samples -> {path}")
+        return path
+
+    def _prune(self):
+        # Names start with a timestamp, so they sort oldest first
+        files = sorted(f for f in os.listdir(self.directory) if f.endswith(".folded"))
+        for old in files[:max(0, len(files) - self.max_profiles)]:
+            try:
+                os.remove(os.path.join(self.directory, old))
+            except OSError:
+                pass
+
+
+def init_profiling(app) -> RequestProfiler:
+    """
+    Attach a RequestProfiler configured from the environment:
+      - PROFILE_SAMPLE_RATE (default 0), PROFILE_TOKEN (default: any header value)
+      - PROFILE_MAX_FILES (default 50), PROFILE_INTERVAL_MS (default 5)
+    """
+    return RequestProfiler(
+        app,
+        token=os.getenv("PROFILE_TOKEN") or None,
+        sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+        max_profiles=int(os.getenv("PROFILE_MAX_FILES", "50")),
+        interval=float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000,
+    )
@@ -0,0 +1,270 @@
+"""Session recording at the Communication.receive_message boundary, and the hooks replay uses.
+
+With SESSION_RECORD=1 every top-level receive_message call (an inbound message, not the node-to-node
+hops it triggers) is written as one "turn" to logs/sessions/sessions.jsonl, rotated and compressed
+like the main log. A turn holds the node, sender, message, timestamps, the reply, and every OpenAI
+and Google response observed while handling it, in call order.
+
+Outbound calls go through intercept(); benchmarks/replay_sessions.py runs recorded turns inside
+replaying(), where the same hook answers each call from the recording instead of the network.
+"""
+
+import contextlib
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Iterator, List, Optional
+
+from secretary.utilities.logging import logs_dir, log_warning
+from secretary.utilities.log_sink import JsonlSink, get_sink, query_logs
+
+# The handler of the turn being processed: a _Recording (live) or a ReplaySource (replay)
+_turn: contextvars.ContextVar = contextvars.ContextVar("session_turn", default=None)
+
+
+class ReplayedError(Exception):
+    """Raised in replay where the recorded call failed; the message is the original error."""
+
+
+def request_fingerprint(request: dict) -> str:
+    """Short stable hash of a call's arguments (objects that aren't JSON are hashed by their str())."""
+    raw = json.dumps(request, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _encode(value):
+    """JSON form of a response, or (False, None) when it can't be replayed (e.g. a stream)."""
+    if hasattr(value, "model_dump"):
+        return True, value.model_dump(mode="json")
+    if value is None or isinstance(value, (dict, list, str, int, float, bool)):
+        return True, value
+    return False, None
+
+
+class _Recording:
+    """Collects the calls made during one live turn (calls may come from several threads)."""
+
+    def __init__(self):
+        self.calls: List[dict] = []
+        self._lock = threading.Lock()
+
+    def handle(self, kind: str, node: str, name: str, request: dict, call: Callable, decode: Optional[Callable]):
+        entry = {"kind": kind, "node": node, "name": name, "key": request_fingerprint(request)}
+        if request.get("stream"):
+            entry["stream"] = True
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Exception as e:
+            entry["error"] = f"{type(e).__name__}: {e}"
+            raise
+        else:
+            replayable, response = _encode(result)
+            if replayable:
+                entry["response"] = response
+            return result
+        finally:
+            entry["seconds"] = round(time.perf_counter() - start, 6)
+            with self._lock:
+                self.calls.append(entry)
+
+
+class ReplaySource:
+    """
+    Answers a replayed turn's calls from its recording.
+
+    A call takes the first unused recorded call with the same kind, node, name and request fingerprint;
+    failing that (prompts embed the current date, generated ids differ) the first unused one with the
+    same kind, node, name and stream flag, so calls still line up by order. Calls with nothing left to match, or
+    recorded without a replayable response, go to the real client (the replay tool points it at fakes).
+
+    Attributes:
+        latency (bool): Wait for each call's recorded duration before answering.
+        hits (int): Calls answered from the recording.
+        misses (int): Calls passed through to the client.
+    """
+
+    def __init__(self, calls: List[dict], latency: bool = True):
+        self.latency = latency
+        self.hits = 0
+        self.misses = 0
+        self._pending = list(calls)
+        self._lock = threading.Lock()
+
+    def take(self, kind: str, node: str, name: str, key: str, stream: bool = False) -> Optional[dict]:
+        """Remove and return the recorded call that answers this one, or None."""
+        with self._lock:
+            same = [c for c in self._pending
+                    if (c["kind"], c["node"], c["name"], c.get("stream", False)) == (kind, node, name, stream)]
+            entry = next((c for c in same if c["key"] == key), same[0] if same else None)
+            if entry is not None:
+                self._pending.remove(entry)
+            if entry is None or ("response" not in entry and "error" not in entry):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry
+
+    def handle(self, kind: str, node: str, name: str, request: dict, call: Callable, decode: Optional[Callable]):
+        entry = self.take(kind, node, name, request_fingerprint(request), bool(request.get("stream")))
+        if entry is None:
+            return call()
+        if self.latency and entry.get("seconds"):
+            time.sleep(entry["seconds"])
+        if "error" in entry:
+            raise ReplayedError(entry["error"])
+        return decode(entry["response"]) if decode else entry["response"]
+
+
+def intercept(kind: str, node: str, name: str, request: dict, call: Callable, decode: Optional[Callable] = None):
+    """
+    Run an outbound call: recorded during a live turn, answered from the recording during a replayed
+    one, and simply run outside a turn.
+
+    Args:
+        kind (str): "openai" or "google".
+        node (str): Node making the call.
+        name (str): Endpoint, e.g. "Completions.create" or "calendar.events.list".
+        request (dict): The call's keyword arguments (fingerprinted to match recordings).
+        call (Callable): Zero-argument function performing the real call.
+        decode (Callable, optional): Rebuilds the response object from its recorded JSON.
+
+    Returns:
+        The call's (or the recording's) response.
+    """
+    handler = _turn.get()
+    if handler is None:
+        return call()
+    return handler.handle(kind, node or "", name, request, call, decode)
+
+
+@contextlib.contextmanager
+def replaying(calls: List[dict], latency: bool = True) -> Iterator[ReplaySource]:
+    """Answer the calls made in this context from a recorded turn's calls."""
+    source = ReplaySource(calls, latency)
+    token = _turn.set(source)
+    try:
+        yield source
+    finally:
+        _turn.reset(token)
+
+
+class SessionRecorder:
+    """
+    Writes one record per top-level receive_message call.
+
+    Attributes:
+        sink (Optional[JsonlSink]): Destination; None disables recording.
+        run_id (str): Identifies this process in the records.
+    """
+
+    def __init__(self, sink: Optional[JsonlSink] = None):
+        self.sink = sink
+        self.run_id = uuid.uuid4().hex[:12]
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.sink is not None
+
+    def record(self, node: str, sender: str, message: str, handler: Callable):
+        """
+        Run handler() as a recorded turn and return its result.
+
+        Args:
+            node (str): Receiving node.
+            sender (str): Sender id.
+            message (str): Inbound message.
+            handler (Callable): Zero-argument function processing the message.
+        """
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        recording = _Recording()
+        record = {"ts": time.time(), "run": self.run_id, "seq": seq, "node": node, "sender": sender,
+                  "message": message}
+        token = _turn.set(recording)
+        start = time.perf_counter()
+        try:
+            response = handler()
+            record["response"] = response if response is None or isinstance(response, str) else str(response)
+            return response
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _turn.reset(token)
+            record["duration"] = round(time.perf_counter() - start, 6)
+            record["calls"] = recording.calls
+            try:
+                self.sink.write(record)
+            except Exception as e:
+                log_warning("[SessionRecorder] Could not write turn %s from %s: %s", seq, node, e)
+
+
+def recorded(fn):
+    """Decorator for receive_message(self, message, sender_id) recording top-level calls when enabled."""
+    @functools.wraps(fn)
+    def wrapper(self, message, sender_id, *args, **kwargs):
+        recorder = get_recorder()
+        # Nested calls (node-to-node hops) belong to the turn already open
+        if not recorder.enabled or _turn.get() is not None:
+            return fn(self, message, sender_id, *args, **kwargs)
+        return recorder.record(getattr(self, "node_id", ""), sender_id, message,
+                               lambda: fn(self, message, sender_id, *args, **kwargs))
+    return wrapper
+
+
+def load_turns(path: str, since: float = None, until: float = None) -> List[dict]:
+    """
+    Read recorded turns, oldest first.
+
+    Args:
+        path (str): A sessions directory (rotated segments included) or a sessions .jsonl file.
+        since (float, optional): Epoch seconds lower bound.
+        until (float, optional): Epoch seconds upper bound.
+    """
+    if os.path.isdir(path):
+        directory, prefix = path, "sessions"
+    else:
+        directory, prefix = os.path.dirname(path) or ".", os.path.basename(path).split(".")[0]
+    turns = [t for t in query_logs(directory, prefix, since=since, until=until) if "message" in t]
+    return sorted(turns, key=lambda t: t["ts"])
+
+
+_recorder: Optional[SessionRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> SessionRecorder:
+    """
+    Return the process-wide recorder, configured from the environment on first use:
+      - SESSION_RECORD: "1" to record (default off)
+      - SESSION_DIR: where sessions are written (default logs/sessions)
+      - SESSION_MAX_BYTES, SESSION_MAX_TOTAL_BYTES: rotation size and disk budget
+    """
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            sink = None
+            if os.getenv("SESSION_RECORD", "0").lower() in ("1", "true", "yes"):
+                sink = get_sink(os.getenv("SESSION_DIR") or os.path.join(logs_dir, "sessions"), "sessions",
+                                max_bytes=int(os.getenv("SESSION_MAX_BYTES", str(50 * 1024 * 1024))),
+                                max_total_bytes=int(os.getenv("SESSION_MAX_TOTAL_BYTES", str(1024 * 1024 * 1024))),
+                                background=True)
+            _recorder = SessionRecorder(sink)
+        return _recorder
+
+
+def set_recorder(recorder: SessionRecorder) -> SessionRecorder:
+    """Replace the process-wide recorder (e.g. in tests); returns the previous one."""
+    global _recorder
+    with _recorder_lock:
+        previous, _recorder = _recorder, recorder
+        return previous
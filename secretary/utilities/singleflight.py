@@ -0,0 +1,101 @@
+"""Single-flight call coalescing.
+
+When several threads (Flask workers, nodes, UI tabs) ask for the same thing at the same time, only the
+first one actually runs the call; the others wait for it and share its result or its exception.
+Nothing is remembered once the call finishes - that is the result cache's job (see llm_cache).
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class _Call:
+    """One in-flight call and the outcome its waiters will share."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    Attributes:
+        executed (int): Calls that actually ran.
+        coalesced (int): Calls that were answered by another caller's in-flight call.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn() unless a call with the same key is already in flight, in which case wait for it.
+
+        Args:
+            key (str): Request fingerprint (e.g. from make_cache_key()).
+            fn (Callable): Zero-argument function producing the result.
+
+        Returns:
+            The result of fn(), possibly computed by another thread.
+
+        Raises:
+            Whatever fn() raised, in the leader and in every waiter.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed."""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict:
+        """Executed/coalesced counters."""
+        with self._lock:
+            return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+_default_singleflight: Optional[SingleFlight] = None
+_default_singleflight_lock = threading.Lock()
+
+
+def get_default_singleflight() -> SingleFlight:
+    """Return the process-wide SingleFlight shared by all LLMClient instances."""
+    global _default_singleflight
+    with _default_singleflight_lock:
+        if _default_singleflight is None:
+            _default_singleflight = SingleFlight()
+        return _default_singleflight
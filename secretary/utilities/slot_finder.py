@@ -0,0 +1,151 @@
+"""Deterministic free-slot search over participants' busy intervals.
+
+merge_busy() runs a sweep line over the start/end events of every participant's meetings (widened
+by the buffer) and returns the disjoint intervals during which at least one participant is busy.
+find_slots() walks those intervals and the working-hour windows of each day in the horizon together
+and returns the earliest slots of the requested duration, one per free gap, so a top-k list offers
+real alternatives rather than the same gap shifted by a few minutes. Everything is O(n log n) in the
+number of meetings considered and takes milliseconds; no LLM is involved.
+"""
+
+import os
+from datetime import datetime, time, timedelta
+from typing import Iterable, Iterator, List, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+
+class SlotPolicy:
+    """
+    Constraints for proposed meeting slots.
+
+    Attributes:
+        work_start (time): Start of the working day.
+        work_end (time): End of the working day.
+        workdays (frozenset): Weekdays slots may fall on (Monday = 0).
+        buffer (timedelta): Minimum gap kept before and after existing meetings.
+        horizon (timedelta): How far ahead of the requested time to search.
+        step (timedelta): Slot starts are aligned to this grid (e.g. quarter hours).
+        candidates (int): Number of slots proposed.
+        llm_tiebreak (bool): Let the LLM pick among the candidates (preferences, not availability).
+    """
+
+    def __init__(self, work_start: time = time(9), work_end: time = time(18), workdays: Iterable[int] = range(5),
+                 buffer: timedelta = timedelta(0), horizon: timedelta = timedelta(days=14),
+                 step: timedelta = timedelta(minutes=15), candidates: int = 3, llm_tiebreak: bool = False):
+        self.work_start = work_start
+        self.work_end = work_end
+        self.workdays = frozenset(workdays)
+        self.buffer = buffer
+        self.horizon = horizon
+        self.step = step
+        self.candidates = candidates
+        self.llm_tiebreak = llm_tiebreak
+
+    @classmethod
+    def from_env(cls) -> "SlotPolicy":
+        """
+        Build a policy from the environment:
+          - SCHEDULER_WORK_HOURS (default "09:00-18:00"), SCHEDULER_WORKDAYS (default "0,1,2,3,4")
+          - SCHEDULER_BUFFER_MINUTES (default 0), SCHEDULER_HORIZON_DAYS (default 14)
+          - SCHEDULER_SLOT_STEP_MINUTES (default 15), SCHEDULER_SLOT_CANDIDATES (default 3)
+          - SCHEDULER_LLM_TIEBREAK (default 0)
+        """
+        start, _, end = os.getenv("SCHEDULER_WORK_HOURS", "09:00-18:00").partition("-")
+        return cls(
+            work_start=time.fromisoformat(start.strip()),
+            work_end=time.fromisoformat(end.strip()),
+            workdays=[int(d) for d in os.getenv("SCHEDULER_WORKDAYS", "0,1,2,3,4").split(",") if d.strip()],
+            buffer=timedelta(minutes=float(os.getenv("SCHEDULER_BUFFER_MINUTES", "0"))),
+            horizon=timedelta(days=float(os.getenv("SCHEDULER_HORIZON_DAYS", "14"))),
+            step=timedelta(minutes=float(os.getenv("SCHEDULER_SLOT_STEP_MINUTES", "15"))),
+            candidates=int(os.getenv("SCHEDULER_SLOT_CANDIDATES", "3")),
+            llm_tiebreak=os.getenv("SCHEDULER_LLM_TIEBREAK", "0").lower() in ("1", "true", "yes"),
+        )
+
+    def windows(self, start: datetime, end: datetime) -> Iterator[Interval]:
+        """Working-hour windows of each workday, clipped to [start, end)."""
+        day = start.date()
+        while day <= end.date():
+            if day.weekday() in self.workdays:
+                lo = max(start, datetime.combine(day, self.work_start))
+                hi = min(end, datetime.combine(day, self.work_end))
+                if lo < hi:
+                    yield lo, hi
+            day += timedelta(days=1)
+
+    def align(self, moment: datetime) -> datetime:
+        """Round up to the next multiple of step since midnight."""
+        midnight = datetime.combine(moment.date(), time(0))
+        steps = -(-(moment - midnight) // self.step)
+        return midnight + steps * self.step
+
+
+def merge_busy(intervals: Iterable[Interval], buffer: timedelta = timedelta(0)) -> List[Interval]:
+    """
+    Sweep line over interval start/end events: the disjoint periods when anyone is busy.
+
+    Args:
+        intervals (Iterable): (start, end) pairs from all participants, in any order.
+        buffer (timedelta): Widen every interval by this much on both sides.
+
+    Returns:
+        list: Sorted, non-overlapping (start, end) intervals; touching intervals are merged.
+    """
+    events = []
+    for start, end in intervals:
+        events.append((start - buffer, 1))
+        events.append((end + buffer, -1))
+    # At equal times starts come first, so back-to-back meetings merge into one busy period
+    events.sort(key=lambda event: (event[0], -event[1]))
+    merged = []
+    depth = 0
+    opened = None
+    for moment, delta in events:
+        if depth == 0:
+            opened = moment
+        depth += delta
+        if depth == 0:
+            merged.append((opened, moment))
+    return merged
+
+
+def find_slots(busy: Iterable[Interval], duration: timedelta, start: datetime, policy: SlotPolicy,
+               limit: int = None) -> List[Interval]:
+    """
+    Earliest free slots for everyone, one per free gap.
+
+    Args:
+        busy (Iterable): Busy (start, end) intervals of all participants (unmerged, any order).
+        duration (timedelta): Meeting length.
+        start (datetime): Earliest acceptable start.
+        policy (SlotPolicy): Working hours, workdays, buffer, horizon and grid.
+        limit (int, optional): Number of slots (default policy.candidates).
+
+    Returns:
+        list: Up to `limit` (start, end) slots in chronological order.
+    """
+    limit = policy.candidates if limit is None else limit
+    merged = merge_busy(busy, policy.buffer)
+    slots = []
+    j = 0
+    for window_start, window_end in policy.windows(start, start + policy.horizon):
+        cursor = window_start
+        while True:
+            cursor = policy.align(cursor)
+            # Checked first: past the window, cursor may be beyond busy periods that later days still need
+            if cursor + duration > window_end:
+                break
+            while j < len(merged) and merged[j][1] <= cursor:
+                j += 1
+            if j < len(merged) and merged[j][0] < cursor + duration:
+                cursor = merged[j][1]
+                continue
+            slots.append((cursor, cursor + duration))
+            if len(slots) >= limit:
+                return slots
+            # The rest of this gap would only offer the same slot shifted; move to the next gap
+            if j >= len(merged) or merged[j][0] >= window_end:
+                break
+            cursor = merged[j][1]
+    return slots
@@ -0,0 +1,472 @@
+"""Lightweight tracing for a message's path through Communication, Brain, Scheduler and Intercom.
+
+The current span lives in a contextvar, so nesting follows the call stack - including the
+Intercom hop into another node's receive_message(), which runs in the same thread - and anything
+that copies the context (asyncio tasks, run_async's helper thread). Spans are exported when they end:
+
+  - TRACE_EXPORT=jsonl   one JSON object per span in logs/traces.jsonl (TRACE_FILE to override)
+  - TRACE_EXPORT=otlp    OTLP/HTTP JSON batches to OTEL_EXPORTER_OTLP_ENDPOINT (default http://127.0.0.1:4318)
+  - TRACE_EXPORT=jsonl,otlp  both
+
+Tracing is off when TRACE_EXPORT is unset; span() then returns a shared no-op span.
+
+    python -m secretary.utilities.tracing collect --port 4318   # OTLP collector stand-in -> JSONL
+    python -m secretary.utilities.tracing show logs/traces.jsonl  # span trees with durations
+"""
+
+import argparse
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+from secretary.utilities.logging import logs_dir, log_warning
+
+# OTLP SpanKind values
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3, "producer": 4, "consumer": 5}
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+class Span:
+    """
+    One timed operation within a trace.
+
+    Attributes:
+        name (str): Operation name, e.g. "openai Completions.create".
+        trace_id (str): 32 hex digits shared by every span of the trace.
+        span_id (str): 16 hex digits.
+        parent_id (Optional[str]): span_id of the parent, None for the root.
+        kind (str): One of SPAN_KINDS.
+        attributes (dict): Key/value annotations.
+    """
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "attributes", "start_ns", "end_ns",
+                 "status", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: str, attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = "ok"
+        self.error = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException):
+        self.status = "error"
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in yielded by span() when tracing is off."""
+
+    trace_id = span_id = parent_id = None
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_exception(self, exc):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current: contextvars.ContextVar = contextvars.ContextVar("trace_span", default=None)
+
+
+class JsonlSpanExporter:
+    """Appends finished spans to a JSONL file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        lines = "".join(json.dumps(s.to_dict(), default=str) + "\n" for s in spans)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+    def shutdown(self):
+        pass
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: List[Span], service_name: str = "secretary") -> dict:
+    """
+    Build an OTLP/JSON ExportTraceServiceRequest body.
+
+    Args:
+        spans (List[Span]): Finished spans.
+        service_name (str): Value of the service.name resource attribute.
+
+    Returns:
+        dict: The request body for POST /v1/traces.
+    """
+    otlp_spans = []
+    for s in spans:
+        item = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": SPAN_KINDS.get(s.kind, 1),
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+            "status": {"code": 2, "message": s.error or ""} if s.status == "error" else {"code": 1},
+        }
+        if s.parent_id:
+            item["parentSpanId"] = s.parent_id
+        otlp_spans.append(item)
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+        "scopeSpans": [{"scope": {"name": "secretary.tracing"}, "spans": otlp_spans}],
+    }]}
+
+
+class OtlpHttpExporter:
+    """
+    Batches spans and POSTs them as OTLP/JSON from a background thread.
+
+    Attributes:
+        endpoint (str): Full URL of the traces endpoint.
+        max_batch (int): Spans per request.
+        interval (float): Seconds between flushes.
+    """
+
+    def __init__(self, endpoint: str, service_name: str = "secretary", max_batch: int = 256,
+                 interval: float = 2.0, max_queue: int = 10000):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.max_batch = max_batch
+        self.interval = interval
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._queue: List[Span] = []
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, spans: List[Span]):
+        with self._cond:
+            room = self.max_queue - len(self._queue)
+            self._queue.extend(spans[:max(0, room)])
+            self.dropped += max(0, len(spans) - max(0, room))
+            if len(self._queue) >= self.max_batch:
+                self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if len(self._queue) < self.max_batch and not self._stopped:
+                    self._cond.wait(self.interval)
+                batch, self._queue = self._queue[:self.max_batch], self._queue[self.max_batch:]
+                stopped = self._stopped
+            if batch:
+                self._post(batch)
+            if stopped and not batch:
+                return
+
+    def _post(self, batch: List[Span]):
+        body = json.dumps(to_otlp(batch, self.service_name), default=str).encode("utf-8")
+        req = urllib.request.Request(self.endpoint, data=body, headers={"Content-Type": "application/json"})
+        try:
+            urllib.request.urlopen(req, timeout=5).close()
+        except Exception as e:
+            self.dropped += len(batch)
+            log_warning(f"[Tracing] OTLP export to {self.endpoint} failed, dropped {len(batch)} spans: {e}")
+
+    def shutdown(self):
+        """Flush what is queued and stop the background thread."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join(timeout=10)
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to the exporters.
+
+    Attributes:
+        exporters (list): Objects with export(spans) and shutdown().
+        enabled (bool): False when there is no exporter.
+    """
+
+    def __init__(self, exporters: list = None):
+        self.exporters = list(exporters or [])
+        self.enabled = bool(self.exporters)
+
+    @contextlib.contextmanager
+    def span(self, name: str, kind: str = "internal", parent: Optional[tuple] = None, **attributes):
+        """
+        Run the enclosed block inside a new span, child of the current one.
+
+        Args:
+            name (str): Span name.
+            kind (str): "internal", "server", "client", "producer" or "consumer".
+            parent (tuple, optional): (trace_id, span_id) of a remote parent (see extract()).
+            **attributes: Initial attributes.
+
+        Yields:
+            Span: The new span (NOOP_SPAN when tracing is off).
+        """
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+        current = _current.get()
+        if parent is not None and current is None:
+            trace_id, parent_id = parent
+        elif current is not None:
+            trace_id, parent_id = current.trace_id, current.span_id
+        else:
+            trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+        span = Span(name, trace_id, parent_id, kind, attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current.reset(token)
+            span.end_ns = time.time_ns()
+            for exporter in self.exporters:
+                try:
+                    exporter.export([span])
+                except Exception as e:
+                    log_warning(f"[Tracing] Exporter {type(exporter).__name__} failed: {e}")
+
+    def shutdown(self):
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """
+    Return the process-wide tracer, configured from the environment on first use:
+      - TRACE_EXPORT: comma-separated exporters, "jsonl" and/or "otlp" (default: tracing off)
+      - TRACE_FILE: JSONL path (default logs/traces.jsonl)
+      - OTEL_EXPORTER_OTLP_ENDPOINT: collector base URL (default http://127.0.0.1:4318)
+      - TRACE_SERVICE_NAME: service.name resource attribute (default "secretary")
+    """
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            exporters = []
+            kinds = {k.strip() for k in os.getenv("TRACE_EXPORT", "").split(",") if k.strip()}
+            if "jsonl" in kinds:
+                exporters.append(JsonlSpanExporter(os.getenv("TRACE_FILE") or os.path.join(logs_dir, "traces.jsonl")))
+            if "otlp" in kinds:
+                base = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://127.0.0.1:4318").rstrip("/")
+                exporters.append(OtlpHttpExporter(base + "/v1/traces", os.getenv("TRACE_SERVICE_NAME", "secretary")))
+            _tracer = Tracer(exporters)
+        return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """Replace the process-wide tracer (e.g. in tests or benchmarks); returns the previous one."""
+    global _tracer
+    with _tracer_lock:
+        previous, _tracer = _tracer, tracer
+        return previous
+
+
+def span(name: str, kind: str = "internal", parent: Optional[tuple] = None, **attributes):
+    """Open a span on the process-wide tracer; see Tracer.span()."""
+    return get_tracer().span(name, kind, parent, **attributes)
+
+
+def current_span():
+    """The active span, or NOOP_SPAN."""
+    return _current.get() or NOOP_SPAN
+
+
+def traced(name: str, kind: str = "internal"):
+    """
+    Decorator running a method inside a span; the instance's node_id, if any, becomes the "node" attribute.
+
+    Args:
+        name (str): Span name.
+        kind (str): Span kind.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = get_tracer()
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            node = getattr(args[0], "node_id", None) if args else None
+            with tracer.span(name, kind, **({"node": node} if node else {})):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def inject() -> Optional[str]:
+    """W3C traceparent header value for the current span, or None."""
+    current = _current.get()
+    if current is None:
+        return None
+    return f"00-{current.trace_id}-{current.span_id}-01"
+
+
+def extract(traceparent: Optional[str]) -> Optional[tuple]:
+    """Parse a W3C traceparent header into (trace_id, span_id), or None if absent or malformed."""
+    match = _TRACEPARENT_RE.match((traceparent or "").strip().lower())
+    return (match.group(1), match.group(2)) if match else None
+
+
+def load_spans(path: str) -> List[dict]:
+    """Read spans written by JsonlSpanExporter (or by the collect command)."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def format_trees(spans: List[dict]) -> str:
+    """
+    Render spans as one indented tree per trace, children in start order.
+
+    Args:
+        spans (List[dict]): Span dicts as produced by Span.to_dict().
+
+    Returns:
+        str: Text with one line per span: duration, name and node/recipient attributes.
+    """
+    by_trace: Dict[str, List[dict]] = {}
+    for s in spans:
+        by_trace.setdefault(s["trace_id"], []).append(s)
+    lines = []
+    for trace_id, items in sorted(by_trace.items(), key=lambda kv: min(s["start_ns"] for s in kv[1])):
+        ids = {s["span_id"] for s in items}
+        children: Dict[Optional[str], List[dict]] = {}
+        for s in items:
+            children.setdefault(s["parent_id"] if s["parent_id"] in ids else None, []).append(s)
+        lines.append(f"trace {trace_id}")
+
+        def walk(parent, depth):
+            for s in sorted(children.get(parent, []), key=lambda s: s["start_ns"]):
+                attrs = s.get("attributes", {})
+                where = " ".join(f"{k}={attrs[k]}" for k in ("node", "recipient", "method", "model") if k in attrs)
+                flag = " !" if s.get("status") == "error" else ""
+                lines.append(f"{'  ' * (depth + 1)}{s['duration_ms']:>10.1f} ms  {s['name']}  {where}{flag}".rstrip())
+                walk(s["span_id"], depth + 1)
+        walk(None, 0)
+    return "\n".join(lines)
+
+
+def _from_otlp_value(value: dict):
+    if "intValue" in value:
+        return int(value["intValue"])
+    return next(iter(value.values()), None)
+
+
+def _from_otlp(body: dict) -> List[dict]:
+    spans = []
+    for resource in body.get("resourceSpans", []):
+        for scope in resource.get("scopeSpans", []):
+            for s in scope.get("spans", []):
+                start, end = int(s["startTimeUnixNano"]), int(s["endTimeUnixNano"])
+                attributes = {a["key"]: _from_otlp_value(a["value"]) for a in s.get("attributes", [])}
+                spans.append({
+                    "trace_id": s["traceId"], "span_id": s["spanId"], "parent_id": s.get("parentSpanId"),
+                    "name": s["name"], "start_ns": start, "end_ns": end, "duration_ms": round((end - start) / 1e6, 3),
+                    "status": "error" if s.get("status", {}).get("code") == 2 else "ok",
+                    "attributes": attributes,
+                })
+    return spans
+
+
+def create_collector_app(path: str):
+    """
+    Flask app accepting OTLP/JSON on POST /v1/traces and appending the spans to a JSONL file.
+
+    Args:
+        path (str): Output JSONL file.
+    """
+    from flask import Flask, jsonify, request
+
+    app = Flask(__name__)
+    lock = threading.Lock()
+
+    @app.route("/v1/traces", methods=["POST"])
+    def traces():
+        spans = _from_otlp(request.get_json(force=True))
+        with lock:
+            with open(path, "a", encoding="utf-8") as f:
+                for s in spans:
+                    f.write(json.dumps(s) + "\n")
+        return jsonify({})
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trace tools: OTLP collector stand-in and span tree viewer.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    collect = sub.add_parser("collect", help="Receive OTLP/JSON spans and append them to a JSONL file")
+    collect.add_argument("--host", default="127.0.0.1")
+    collect.add_argument("--port", type=int, default=4318)
+    collect.add_argument("--out", default=os.path.join(logs_dir, "collected_traces.jsonl"))
+    show = sub.add_parser("show", help="Print span trees from a JSONL file")
+    show.add_argument("path")
+    show.add_argument("--last", type=int, default=0, help="Only the last N traces")
+    args = parser.parse_args()
+
+    if args.command == "collect":
+        print(f"OTLP collector stand-in on http://{args.host}:{args.port}/v1/traces -> {args.out}")
+        create_collector_app(args.out).run(host=args.host, port=args.port, threaded=True)
+    else:
+        spans = load_spans(args.path)
+        if args.last:
+            order = list(dict.fromkeys(s["trace_id"] for s in sorted(spans, key=lambda s: s["start_ns"])))
+            keep = set(order[-args.last:])
+            spans = [s for s in spans if s["trace_id"] in keep]
+        print(format_trees(spans))
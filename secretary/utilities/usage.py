@@ -0,0 +1,277 @@
+"""OpenAI usage ledger: tokens, latency and estimated cost per node, per call site and per hour.
+
+Every request made through a NodeClient is recorded with the function that issued it (found by
+walking the stack past the client, dispatcher and LLMClient layers), e.g.
+"Scheduler.find_perfect_meeting_time" or "Brain.route_message". Raw records live in a bounded ring
+buffer; aggregates are folded in periodically so they cover the whole process lifetime even after
+old records have been evicted.
+"""
+
+import contextlib
+import contextvars
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from secretary.utilities.llm_dispatcher import estimate_request_tokens
+
+# USD per 1M tokens (input, output). Looked up by longest model-name prefix, so dated snapshots
+# ("gpt-4o-mini-2024-07-18") match their family. Unknown models are costed at 0.
+PRICES = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4": (30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "o3-mini": (1.10, 4.40),
+}
+
+# Frames from these modules are plumbing, not call sites
+_SKIP_MODULE_PREFIXES = (
+    "secretary.utilities.openai_client", "secretary.utilities.llm_dispatcher",
+    "secretary.utilities.singleflight", "secretary.utilities.usage",
+    "openai", "httpx", "asyncio", "threading", "concurrent", "contextlib",
+)
+_SKIP_QUALNAME_PREFIXES = ("LLMClient.", "AsyncLLMClient.", "run_async")
+
+_call_site: contextvars.ContextVar = contextvars.ContextVar("llm_call_site", default=None)
+
+
+@contextlib.contextmanager
+def usage_site(name: str):
+    """
+    Attribute the LLM calls made in this block (and in threads/tasks that copy the context) to `name`.
+
+    Args:
+        name (str): Call site label.
+    """
+    token = _call_site.set(name)
+    try:
+        yield
+    finally:
+        _call_site.reset(token)
+
+
+def find_call_site(default: str = "unknown") -> str:
+    """
+    Name of the function that issued the current LLM call.
+
+    Returns the label set by usage_site() if any, otherwise the first stack frame outside the client
+    plumbing, as "Class.method" (or "module.function" for plain functions).
+    """
+    explicit = _call_site.get()
+    if explicit:
+        return explicit
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        code = frame.f_code
+        qualname = getattr(code, "co_qualname", code.co_name)
+        if not module.startswith(_SKIP_MODULE_PREFIXES) and not qualname.startswith(_SKIP_QUALNAME_PREFIXES):
+            if "." in qualname:
+                return qualname.split(".<locals>")[0]
+            return f"{module.rsplit('.', 1)[-1]}.{qualname}"
+        frame = frame.f_back
+    return default
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """
+    Estimated cost of a request in USD.
+
+    Args:
+        model (str): Model name as sent to the API.
+        prompt_tokens (int): Input tokens.
+        completion_tokens (int): Output tokens.
+
+    Returns:
+        float: Cost in USD, 0 for models missing from PRICES.
+    """
+    best = None
+    for name in PRICES:
+        if (model or "").startswith(name) and (best is None or len(name) > len(best)):
+            best = name
+    if best is None:
+        return 0.0
+    price_in, price_out = PRICES[best]
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+
+def _empty_bucket() -> dict:
+    return {"calls": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0,
+            "cost_usd": 0.0, "latency_total": 0.0, "latency_max": 0.0}
+
+
+def _add(bucket: dict, record: dict):
+    bucket["calls"] += 1
+    bucket["errors"] += 0 if record["ok"] else 1
+    bucket["prompt_tokens"] += record["prompt_tokens"]
+    bucket["completion_tokens"] += record["completion_tokens"]
+    bucket["cost_usd"] += record["cost_usd"]
+    bucket["latency_total"] += record["latency"]
+    bucket["latency_max"] = max(bucket["latency_max"], record["latency"])
+
+
+def _finish(bucket: dict) -> dict:
+    result = dict(bucket)
+    result["cost_usd"] = round(result["cost_usd"], 6)
+    result["latency_avg"] = round(bucket["latency_total"] / bucket["calls"], 4) if bucket["calls"] else 0.0
+    result["latency_max"] = round(bucket["latency_max"], 4)
+    del result["latency_total"]
+    return result
+
+
+class UsageLedger:
+    """
+    In-process record of OpenAI requests with rolled-up aggregates.
+
+    Attributes:
+        capacity (int): Number of raw records kept in the ring buffer.
+        rollup_interval (float): Seconds between folds of new records into the aggregates.
+    """
+
+    DIMENSIONS = ("node", "site", "model", "hour")
+
+    def __init__(self, capacity: int = 5000, rollup_interval: float = 30.0):
+        self.capacity = capacity
+        self.rollup_interval = rollup_interval
+        self._records: deque = deque(maxlen=capacity)
+        self._pending: List[dict] = []
+        self._totals = _empty_bucket()
+        self._rollups: Dict[str, Dict[str, dict]] = {dim: {} for dim in self.DIMENSIONS}
+        self._last_rollup = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, node_id: str, site: str, model: str, prompt_tokens: int, completion_tokens: int,
+               latency: float, ok: bool = True, estimated: bool = False):
+        """
+        Add one request to the ledger.
+
+        Args:
+            node_id (str): Node that made the request.
+            site (str): Calling function (see find_call_site()).
+            model (str): Model name.
+            prompt_tokens (int): Input tokens.
+            completion_tokens (int): Output tokens.
+            latency (float): Request duration in seconds.
+            ok (bool): False if the request raised.
+            estimated (bool): True when token counts are estimates (streams, failures).
+        """
+        now = time.time()
+        record = {
+            "ts": now,
+            "hour": datetime.fromtimestamp(now).strftime("%Y-%m-%dT%H:00"),
+            "node": node_id,
+            "site": site,
+            "model": model or "",
+            "prompt_tokens": int(prompt_tokens or 0),
+            "completion_tokens": int(completion_tokens or 0),
+            "cost_usd": estimate_cost(model, prompt_tokens or 0, completion_tokens or 0),
+            "latency": latency,
+            "ok": ok,
+            "estimated": estimated,
+        }
+        with self._lock:
+            self._records.append(record)
+            self._pending.append(record)
+            if time.monotonic() - self._last_rollup >= self.rollup_interval or len(self._pending) >= self.capacity:
+                self._rollup_locked()
+
+    def record_response(self, node_id: str, site: str, request: dict, response, latency: float,
+                        error: Optional[BaseException] = None):
+        """
+        Record an API call from its request kwargs and its response (or the error it raised).
+
+        Token counts come from response.usage; streamed responses and failures only carry an
+        estimate of the prompt size.
+        """
+        usage = getattr(response, "usage", None) if error is None else None
+        if usage is not None:
+            prompt = getattr(usage, "prompt_tokens", 0) or 0
+            completion = getattr(usage, "completion_tokens", 0) or 0
+            estimated = False
+        else:
+            prompt = estimate_request_tokens({"messages": request.get("messages")})
+            completion = 0
+            estimated = True
+        model = getattr(response, "model", None) or request.get("model", "")
+        self.record(node_id, site, model, prompt, completion, latency, ok=error is None, estimated=estimated)
+
+    def _rollup_locked(self):
+        for record in self._pending:
+            _add(self._totals, record)
+            for dim in self.DIMENSIONS:
+                bucket = self._rollups[dim].get(record[dim])
+                if bucket is None:
+                    bucket = self._rollups[dim][record[dim]] = _empty_bucket()
+                _add(bucket, record)
+        self._pending = []
+        self._last_rollup = time.monotonic()
+
+    def rollup(self):
+        """Fold the records added since the last rollup into the aggregates."""
+        with self._lock:
+            self._rollup_locked()
+
+    def recent(self, limit: int = 50) -> List[dict]:
+        """The newest raw records, oldest first."""
+        with self._lock:
+            return list(self._records)[-limit:] if limit > 0 else []
+
+    def summary(self, recent: int = 0) -> dict:
+        """
+        Aggregates since process start.
+
+        Args:
+            recent (int): Also include this many raw records.
+
+        Returns:
+            dict: {"totals", "by_node", "by_site", "by_model", "by_hour"} (+ "recent"); sites are sorted
+            by cost, then by tokens.
+        """
+        with self._lock:
+            self._rollup_locked()
+            totals = _finish(self._totals)
+            rollups = {dim: {key: _finish(b) for key, b in buckets.items()} for dim, buckets in self._rollups.items()}
+
+        def by_cost(items):
+            return dict(sorted(items.items(), key=lambda kv: (kv[1]["cost_usd"],
+                        kv[1]["prompt_tokens"] + kv[1]["completion_tokens"]), reverse=True))
+
+        result = {
+            "totals": totals,
+            "by_node": by_cost(rollups["node"]),
+            "by_site": by_cost(rollups["site"]),
+            "by_model": by_cost(rollups["model"]),
+            "by_hour": dict(sorted(rollups["hour"].items())),
+        }
+        if recent:
+            result["recent"] = self.recent(recent)
+        return result
+
+
+_ledger: Optional[UsageLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger() -> UsageLedger:
+    """
+    Return the process-wide ledger, configured from the environment on first use:
+      - USAGE_BUFFER_SIZE: raw records kept (default 5000)
+      - USAGE_ROLLUP_SECONDS: rollup period (default 30)
+    """
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = UsageLedger(
+                capacity=int(os.getenv("USAGE_BUFFER_SIZE", "5000")),
+                rollup_interval=float(os.getenv("USAGE_ROLLUP_SECONDS", "30")),
+            )
+        return _ledger
@@ -0,0 +1,81 @@
+import random
+from datetime import datetime, time, timedelta
+from types import SimpleNamespace
+
+from network.internal_communication import Intercom
+from secretary.scheduler import Scheduler
+from secretary.utilities.availability_bitmap import AvailabilityBitmaps, set_availability_bitmaps
+from secretary.utilities.calendar_index import IndexedCalendar
+from secretary.utilities.slot_finder import SlotPolicy, find_slots
+
+MONDAY = datetime(2030, 1, 7)
+
+
+def meeting(event_id, start, minutes, participants):
+    return {"event_id": event_id, "start_time": start.isoformat(),
+            "end_time": (start + timedelta(minutes=minutes)).isoformat(), "participants": participants}
+
+
+def source(calendar, participant):
+    return participant, calendar.version(participant), lambda s, e: calendar.busy(participant, s, e)
+
+
+def test_bitmap_search_matches_the_sweep_line_on_grid_aligned_calendars():
+    rng = random.Random(11)
+    people = [f"p{i}" for i in range(8)]
+    calendar = IndexedCalendar(
+        meeting(f"e{i}", MONDAY + timedelta(minutes=15 * rng.randrange(21 * 96)), rng.choice((15, 30, 60, 240)),
+                rng.sample(people, 3))
+        for i in range(400))
+    bitmaps = AvailabilityBitmaps()
+    for _ in range(40):
+        policy = SlotPolicy(work_start=time(8), work_end=time(17, 30), buffer=timedelta(minutes=rng.choice((0, 15))),
+                            horizon=timedelta(days=rng.choice((3, 10))), candidates=5)
+        group = rng.sample(people, rng.randint(1, 5))
+        start = MONDAY + timedelta(minutes=rng.randrange(7 * 24 * 60))
+        duration = timedelta(minutes=rng.choice((15, 45, 60, 120)))
+        busy = [interval for p in group for interval in calendar.busy(p)]
+        assert bitmaps.find_slots([source(calendar, p) for p in group], duration, start, policy) == \
+            find_slots(busy, duration, start, policy)
+
+
+def test_bitmaps_are_cached_until_the_participants_calendar_changes():
+    calendar = IndexedCalendar([meeting("a", MONDAY.replace(hour=9), 60, ["alice", "bob"])])
+    policy = SlotPolicy(work_start=time(9), work_end=time(17), candidates=1)
+    bitmaps = AvailabilityBitmaps()
+
+    def first_slot(start):
+        return bitmaps.find_slots([source(calendar, "alice"), source(calendar, "bob")], timedelta(hours=1),
+                                  start, policy)[0][0]
+
+    assert first_slot(MONDAY) == MONDAY.replace(hour=10)
+    assert first_slot(MONDAY.replace(hour=8)) == MONDAY.replace(hour=10)
+    assert (bitmaps.misses, bitmaps.hits) == (2, 2)
+
+    calendar.append(meeting("b", MONDAY.replace(hour=10), 30, ["bob"]))
+    assert first_slot(MONDAY) == MONDAY.replace(hour=10, minute=30)
+    assert (bitmaps.misses, bitmaps.hits) == (3, 3)  # only bob's bitmap was rebuilt
+
+    calendar.reschedule("a", MONDAY.replace(hour=12), MONDAY.replace(hour=13))
+    assert first_slot(MONDAY) == MONDAY.replace(hour=9)
+
+
+def test_scheduler_searches_with_bitmaps_when_enabled():
+    net = Intercom()
+    calendars = {"alice": [meeting("a", MONDAY.replace(hour=9), 60, ["alice"])],
+                 "bob": [meeting("b", MONDAY.replace(hour=10), 90, ["bob"])]}
+    for node_id, meetings in calendars.items():
+        brain = SimpleNamespace(calendar=IndexedCalendar(meetings), confirmation_context={}, meeting_context={})
+        net.register_node(node_id, SimpleNamespace(node_id=node_id, brain=brain))
+    scheduler = Scheduler("alice", calendar_service=None, network=net, brain=net.nodes["alice"].brain)
+    scheduler.slot_policy = SlotPolicy(work_start=time(9), work_end=time(17))
+
+    bitmaps = AvailabilityBitmaps()
+    previous = set_availability_bitmaps(bitmaps)
+    try:
+        result = scheduler.find_perfect_meeting_time(["alice", "bob"], MONDAY.replace(hour=9, minute=30),
+                                                     MONDAY.replace(hour=10))
+    finally:
+        set_availability_bitmaps(previous)
+    assert result == (True, MONDAY.replace(hour=11, minute=30), MONDAY.replace(hour=12))
+    assert bitmaps.misses == 2
@@ -0,0 +1,30 @@
+from benchmarks.bench_send_message import build_workload, percentile, summarize, DEFAULT_MIX
+
+
+def test_percentile_nearest_rank():
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    assert summarize(values)["p95_ms"] == 95.0
+    assert percentile([], 50) == 0.0
+
+
+def test_workload_is_seeded_and_covers_the_mix():
+    nodes = ["a", "b", "c"]
+    first = build_workload(200, nodes, DEFAULT_MIX, seed=1)
+    assert first == build_workload(200, nodes, DEFAULT_MIX, seed=1)
+    assert {category for category, _, _ in first} == set(DEFAULT_MIX)
+    assert all(node in nodes for _, node, _ in first)
+
+
+def test_scheduler_bench_calendar_and_curve_fit():
+    from benchmarks.bench_scheduler import generate_calendar, fit_exponent, run
+
+    calendar = generate_calendar(50, participants=10, seed=3)
+    assert calendar == generate_calendar(50, participants=10, seed=3)
+    assert all(m["start_time"] < m["end_time"] and 2 <= len(m["participants"]) <= 5 for m in calendar)
+
+    assert abs(fit_exponent([(10, 1.0), (100, 10.0), (1000, 100.0)]) - 1.0) < 1e-9
+    report = run(sizes=(20, 40), participants=10, min_time=0)
+    assert set(report["results"]) == {"conflict_check", "local_transform", "merge_sort", "date_filter"}
+    assert [p["n"] for p in report["results"]["date_filter"]["points"]] == [20, 40]
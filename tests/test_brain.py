@@ -4,7 +4,7 @@ from datetime import datetime, timedelta
 
 import openai
 
-from secretary.brain import LLMClient, Confirmation, Brain
+from secretary.brain import LLMClient, Confirmation, Brain, run_async
 from network.internal_communication import Intercom
 from network.tasks import Task
 
@@ -163,4 +163,173 @@ def test_detect_calendar_intent_falls_back_on_bad_json(monkeypatch, brain):
     # Simulate query_llm returning invalid JSON
     monkeypatch.setattr(brain, 'query_llm', lambda messages: "not a json")
     intent = brain._detect_calendar_intent("Hello, nothing here")
-    assert intent == {"is_calendar_command": False, "action": None, "missing_info": []}
\ No newline at end of file
+    assert intent == {"is_calendar_command": False, "action": None, "missing_info": []}
+
+def make_tool_call_response(title, assignee):
+    arguments = json.dumps({
+        "title": title, "description": "d", "assigned_to": assignee,
+        "due_date_offset": 1, "priority": "low"
+    })
+    function = type("F", (), {"name": "create_task", "arguments": arguments})
+    tool_call = type("T", (), {"function": function})
+    message = type("M", (), {"tool_calls": [tool_call]})
+    return type("R", (), {"choices": [type("C", (), {"message": message})]})
+
+
+def test_generate_tasks_from_plan_runs_steps_concurrently(brain):
+    import re
+    import time
+    from secretary.brain import AsyncLLMClient
+
+    class SlowCompletions:
+        def create(self, **kwargs):
+            time.sleep(0.2)
+            prompt = kwargs["messages"][0]["content"]
+            step = re.search(r'Step Name: "(.*?)"', prompt).group(1)
+            return make_tool_call_response(f"task for {step}", "brain")
+
+    fake_client = type("C", (), {"chat": type("Chat", (), {"completions": SlowCompletions()})()})()
+    brain.async_llm = AsyncLLMClient(fake_client, max_concurrency=5)
+    brain.projects["p"] = {"plan_steps": []}
+    steps = [{"name": f"s{i}", "description": "x", "responsible_participants": ["brain"]} for i in range(4)]
+
+    started = time.perf_counter()
+    result = brain.generate_tasks_from_plan("p", steps, ["brain"])
+    elapsed = time.perf_counter() - started
+
+    assert "Task generation process completed" in result
+    assert elapsed < 0.6  # sequential would take >= 0.8s
+    # Added one at a time, in step order
+    assert [t.title for t in brain.network.tasks] == [f"task for s{i}" for i in range(4)]
+
+
+def test_tasks_are_added_in_order_while_reminders_run_concurrently(brain):
+    import threading
+    import time
+
+    active, added = [], []
+    lock = threading.Lock()
+
+    def add_task(task):
+        with lock:
+            active.append(task)
+            assert len(active) == 1, "add_task ran concurrently"
+        time.sleep(0.01)
+        added.append(task.title)
+        with lock:
+            active.remove(task)
+
+    brain.network.add_task = add_task
+    brain.scheduler = type("S", (), {"create_calendar_reminder": lambda self, task: time.sleep(0.1)})()
+    tasks = [Task(title=f"t{i}", description="", due_date=datetime.now(), assigned_to="brain", priority=1,
+                  project_id="p")
+             for i in range(5)]
+
+    started = time.perf_counter()
+    run_async(brain._insert_tasks_async(tasks))
+    assert added == [f"t{i}" for i in range(5)]
+    assert time.perf_counter() - started < 0.4  # reminders overlap (sequential: >= 0.5s)
+
+
+def test_async_llm_client_gather_preserves_order_and_errors():
+    from secretary.brain import AsyncLLMClient, run_async
+
+    class Completions:
+        def create(self, **kwargs):
+            if kwargs["n"] == 1:
+                raise ValueError("boom")
+            return kwargs["n"]
+
+    fake_client = type("C", (), {"chat": type("Chat", (), {"completions": Completions()})()})()
+    results = run_async(AsyncLLMClient(fake_client, max_concurrency=2).gather([{"n": 0}, {"n": 1}, {"n": 2}]))
+    assert results[0] == 0 and results[2] == 2
+    assert isinstance(results[1], ValueError)
+
+
+def test_query_llm_streams_tokens_to_room(brain):
+    class StreamingCompletions:
+        def create(self, stream=False, **kwargs):
+            assert stream is True
+            for piece in ["Hel", "lo", None, " there"]:
+                delta = type('D', (), {'content': piece})
+                yield type('Chunk', (), {'choices': [type('C', (), {'delta': delta})]})
+
+    class FakeSocketIO:
+        def __init__(self):
+            self.emitted = []
+
+        def emit(self, event, data, room=None):
+            self.emitted.append((event, data, room))
+
+    brain.llm = LLMClient("key", brain.llm_params, cache=False,
+                          client=type('Client', (), {'chat': type('Chat', (), {'completions': StreamingCompletions()})}))
+    brain.socketio = FakeSocketIO()
+
+    resp = brain.query_llm([{"role": "user", "content": "hi"}], stream_room="alice")
+    assert resp == "Hello there"
+    tokens = [data['token'] for event, data, room in brain.socketio.emitted if event == 'llm_token']
+    assert tokens == ["Hel", "lo", " there"]
+    assert brain.socketio.emitted[-1] == ('llm_stream_end', {'node_id': 'brain', 'text': 'Hello there', 'error': False},
+                                          'alice')
+
+
+def test_failed_stream_is_answered_again_without_streaming(brain):
+    from openai.types.chat import ChatCompletion
+
+    class FlakyCompletions:
+        def create(self, stream=False, **kwargs):
+            if not stream:
+                return ChatCompletion.model_validate({
+                    "id": "c", "object": "chat.completion", "created": 0, "model": "m",
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": "Full answer"}}]})
+            return self.broken()
+
+        def broken(self):
+            yield type('Chunk', (), {'choices': [type('C', (), {'delta': type('D', (), {'content': "Par"})})]})
+            raise ConnectionError("reset")
+
+    class FakeSocketIO:
+        def __init__(self):
+            self.emitted = []
+
+        def emit(self, event, data, room=None):
+            self.emitted.append((event, data, room))
+
+    brain.llm = LLMClient("key", brain.llm_params, cache=False,
+                          client=type('Client', (), {'chat': type('Chat', (), {'completions': FlakyCompletions()})}))
+    brain.socketio = FakeSocketIO()
+
+    assert brain.query_llm([{"role": "user", "content": "hi"}], stream_room="alice") == "Full answer"
+    assert brain.socketio.emitted[-1] == ('llm_stream_end', {'node_id': 'brain', 'text': 'Full answer', 'error': True},
+                                          'alice')
+
+
+def test_route_message_single_call_and_cached(brain):
+    route = {
+        "calendar": {"is_calendar_command": False, "action": None, "missing_info": []},
+        "email": {"action": "search",
+                  "criteria": {"from": "bob", "to": None, "subject": None, "keywords": None, "has_attachment": None,
+                               "is_unread": True, "label": None, "after": None, "before": None, "max_results": None},
+                  "summary_type": "concise"},
+        "send_email": {"is_send_email": False, "recipient": "", "subject": "", "body": ""},
+    }
+
+    class RouterLLM:
+        def __init__(self):
+            self.calls = []
+
+        def complete(self, messages, **kwargs):
+            self.calls.append(kwargs)
+            return json.dumps(route)
+
+    brain.llm = RouterLLM()
+    first = brain.route_message("any unread mail from bob?")
+    second = brain.route_message("any unread mail from bob?")
+
+    assert len(brain.llm.calls) == 1
+    assert brain.llm.calls[0]["response_format"]["type"] == "json_schema"
+    assert first == second
+    assert first["email"] == {"action": "search", "criteria": {"from": "bob", "is_unread": True}, "summary_type": "concise"}
+    assert first["calendar"]["is_calendar_command"] is False
+    assert first["send_email"]["missing_info"] == ["recipient", "subject", "body"]
@@ -0,0 +1,63 @@
+import random
+from datetime import datetime, timedelta
+
+from secretary.scheduler import Scheduler
+from secretary.utilities.calendar_index import IndexedCalendar
+
+
+def meeting(event_id, start, minutes, participants):
+    return {"event_id": event_id, "start_time": start.isoformat(),
+            "end_time": (start + timedelta(minutes=minutes)).isoformat(), "participants": participants}
+
+
+def brute_force(calendar, participant, start, end):
+    return [m for m in calendar if participant in m["participants"]
+            and datetime.fromisoformat(m["start_time"]) < end and datetime.fromisoformat(m["end_time"]) > start]
+
+
+def test_index_matches_a_full_scan_through_mutations():
+    rng = random.Random(7)
+    people = ["alice", "bob", "carol", "dave"]
+    base = datetime(2030, 1, 7, 8)
+    calendar = IndexedCalendar()
+    for i in range(300):
+        calendar.append(meeting(f"e{i}", base + timedelta(minutes=15 * rng.randrange(400)), rng.choice((15, 30, 90)),
+                                rng.sample(people, 2)))
+    # Cancellations, slice edits and reschedules keep the index in step with the list
+    calendar.remove(calendar[10])
+    del calendar[20:40]
+    calendar[5] = meeting("replaced", base, 600, ["alice"])
+    calendar.pop()
+    calendar.reschedule("e100", base + timedelta(days=1), base + timedelta(days=1, hours=2))
+    calendar += [meeting("late", base + timedelta(days=3), 30, ["bob", "bob"])]
+
+    for _ in range(500):
+        start = base + timedelta(minutes=5 * rng.randrange(1300))
+        end = start + timedelta(minutes=rng.choice((5, 30, 120)))
+        for person in people:
+            expected = brute_force(calendar, person, start, end)
+            assert calendar.count_overlaps(person, start, end) == len(expected)
+            assert sorted(map(id, calendar.conflicts(person, start, end))) == sorted(map(id, expected))
+    assert calendar.count_overlaps("bob", base + timedelta(days=3), base + timedelta(days=3, minutes=5)) == 1
+
+
+def test_check_time_considers_every_meeting_of_the_participant():
+    class Brain:
+        calendar = []
+
+    brain = Brain()
+    day = datetime(2030, 3, 4)
+    brain.calendar = IndexedCalendar([
+        meeting("standup", day.replace(hour=9), 15, ["alice", "bob"]),
+        meeting("review", day.replace(hour=14), 60, ["alice"]),
+    ])
+    scheduler = Scheduler("alice", calendar_service=None, network=None, brain=brain)
+
+    # Used to return True after looking at the first meeting only
+    assert not scheduler._check_time_with_attendees("alice", day.replace(hour=14, minute=30), day.replace(hour=15))
+    assert scheduler._check_time_with_attendees("alice", day.replace(hour=15), day.replace(hour=16))
+    assert scheduler._check_time_with_attendees("bob", day.replace(hour=14), day.replace(hour=15))
+
+    # The plain-list fallback agrees
+    brain.calendar = list(brain.calendar)
+    assert not scheduler._check_time_with_attendees("alice", day.replace(hour=14, minute=30), day.replace(hour=15))
@@ -2,6 +2,12 @@ import pytest
 
 import secretary.communication as communication
 
+
+@pytest.fixture(autouse=True)
+def examples_in_tmp(tmp_path, monkeypatch):
+    # Routed messages are logged as training examples; keep them out of the repo's logs/
+    monkeypatch.setenv("INTENT_EXAMPLES_PATH", str(tmp_path / "intent_examples.jsonl"))
+
 # --- Mocks to stub out external dependencies ---
 class FakeScheduler:
     """Stubs calendar intent detection and handling."""
@@ -36,7 +42,14 @@ class FakeBrain:
     def process_advanced_email_command(self, analysis):
         return f"advanced_processed: {analysis}"
 
-    def query_llm(self, conversation_history):
+    def route_message(self, message):
+        return {
+            'calendar': {'is_calendar_command': False},
+            'email': self._analyze_email_command(message),
+            'send_email': self._detect_send_email_intent(message),
+        }
+
+    def query_llm(self, conversation_history, stream_room=None):
         return "llm_response"
 
     def list_tasks(self):
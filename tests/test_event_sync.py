@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from secretary.scheduler import Scheduler
+from secretary.utilities.event_sync import EventCache
+
+SOON = datetime.now().replace(microsecond=0) + timedelta(days=1)
+
+
+class Gone(Exception):
+    resp = SimpleNamespace(status=410)
+
+
+class Events:
+    """events().list with syncToken semantics over a change log; tokens before `expired_before` are 410."""
+
+    def __init__(self, page_size=2):
+        self.log = []  # event versions in change order
+        self.page_size = page_size
+        self.expired_before = 0
+        self.calls = []
+
+    def put(self, event_id, hours, status="confirmed"):
+        start = SOON + timedelta(hours=hours)
+        self.log.append({"id": event_id, "status": status, "summary": event_id,
+                         "start": {"dateTime": start.isoformat()}, "end": {"dateTime": (start + timedelta(hours=1)).isoformat()}})
+
+    def events(self):
+        return self
+
+    def list(self, **params):
+        self.calls.append(params)
+        offset = int(params.get("pageToken", 0))
+        if "syncToken" in params:
+            since = int(params["syncToken"])
+            if since < self.expired_before:
+                raise Gone()
+            changes = list({e["id"]: e for e in self.log[since:]}.values())
+        else:
+            changes = [e for e in {e["id"]: e for e in self.log}.values() if e["status"] != "cancelled"]
+        page = changes[offset:offset + self.page_size]
+        response = {"items": page}
+        if offset + self.page_size < len(changes):
+            response["nextPageToken"] = str(offset + self.page_size)
+        else:
+            response["nextSyncToken"] = str(len(self.log))
+        return SimpleNamespace(execute=lambda: response)
+
+
+def test_incremental_sync_applies_changes_and_recovers_from_expired_tokens():
+    google = Events()
+    for i, hours in enumerate((5, 1, 3)):
+        google.put(f"e{i}", hours)
+    cache = EventCache(google)
+    assert cache.sync() == 3 and cache.full_syncs == 1 and len(google.calls) == 2  # two pages
+    assert [e["id"] for e in cache.upcoming()] == ["e1", "e2", "e0"]
+
+    calls = len(google.calls)
+    assert cache.sync() == 0 and len(google.calls) == calls + 1
+    assert google.calls[-1]["syncToken"] == "3" and "timeMin" not in google.calls[-1]
+
+    google.put("e1", 8)
+    google.put("e2", 0, status="cancelled")
+    google.put("e3", 2)
+    assert cache.sync() == 3
+    assert [e["id"] for e in cache.upcoming()] == ["e3", "e0", "e1"]
+
+    google.put("e4", 4)
+    google.expired_before = len(google.log)
+    cache.sync()
+    assert cache.full_syncs == 2 and [e["id"] for e in cache.upcoming(2)] == ["e3", "e4"]
+
+    # Reads are copies, and this node's own writes show up before the next sync
+    cache.upcoming()[0]["summary"] = "changed"
+    assert cache.upcoming()[0]["summary"] == "e3"
+    cache.discard("e3")
+    assert cache.upcoming(1)[0]["id"] == "e4"
+
+
+def test_scheduler_reads_upcoming_meetings_from_the_synced_cache():
+    google = Events()
+    google.put("standup", 1)
+    brain = SimpleNamespace(calendar=[])
+    scheduler = Scheduler("alice", calendar_service=google, network=None, brain=brain)
+    scheduler.event_cache = EventCache(google)
+
+    # Not synced yet: listed from Google as before
+    assert [e["id"] for e in scheduler.get_upcoming_meetings()] == ["standup"]
+    assert google.calls[-1]["orderBy"] == "startTime"
+
+    scheduler.event_cache.sync()
+    calls = len(google.calls)
+    assert [e["id"] for e in scheduler.get_upcoming_meetings()] == ["standup"]
+    assert [e["id"] for e in scheduler._upcoming_events(10)] == ["standup"]
+    assert len(google.calls) == calls
+
+    moved = dict(google.log[0], start={"dateTime": (SOON + timedelta(hours=6)).isoformat()})
+    scheduler._event_changed(moved)
+    assert scheduler._upcoming_events(10)[0]["start"] == moved["start"]
@@ -0,0 +1,61 @@
+import json
+import threading
+
+import openai
+import pytest
+from werkzeug.serving import make_server
+
+from benchmarks.fake_openai import FakeOpenAI, LatencyModel, create_app
+
+
+@pytest.fixture(scope="module")
+def fake_client():
+    server = make_server("127.0.0.1", 0, create_app(FakeOpenAI()), threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = openai.OpenAI(api_key="fake", base_url=f"http://127.0.0.1:{server.server_port}/v1", max_retries=0)
+    yield client
+    server.shutdown()
+
+
+def test_tool_call_and_json_schema_roundtrip(fake_client):
+    tool = {"type": "function", "function": {"name": "create_task", "parameters": {
+        "type": "object",
+        "properties": {"title": {"type": "string"}, "priority": {"type": "integer"},
+                       "assigned_to": {"type": "string", "enum": ["alice", "bob"]}},
+        "required": ["title", "priority", "assigned_to"]}}}
+    resp = fake_client.chat.completions.create(
+        model="gpt-4o-mini", messages=[{"role": "user", "content": "plan step 1"}],
+        tools=[tool], tool_choice={"type": "function", "function": {"name": "create_task"}})
+    args = json.loads(resp.choices[0].message.tool_calls[0].function.arguments)
+    assert set(args) == {"title", "priority", "assigned_to"}
+    assert args["assigned_to"] in ("alice", "bob")
+
+    schema = {"name": "r", "schema": {"type": "object", "properties": {
+        "action": {"type": "string", "enum": ["search", "none"]}, "ok": {"type": "boolean"}},
+        "required": ["action", "ok"]}}
+    resp = fake_client.chat.completions.create(
+        model="m", messages=[{"role": "user", "content": "hi"}],
+        response_format={"type": "json_schema", "json_schema": schema})
+    assert json.loads(resp.choices[0].message.content) == {"action": "none", "ok": False}
+
+
+def test_streaming_and_audio(fake_client):
+    stream = fake_client.chat.completions.create(
+        model="m", messages=[{"role": "user", "content": "tell me something"}], stream=True)
+    text = "".join(chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices)
+    assert text == "Fake answer to: tell me something"
+
+    transcript = fake_client.audio.transcriptions.create(
+        model="whisper-1", file=("a.mp3", b"1234"), response_format="text")
+    assert "4 bytes" in str(transcript)
+    speech = fake_client.audio.speech.create(model="tts-1", voice="alloy", input="hello")
+    assert speech.read().startswith(b"ID3")
+
+
+def test_latency_model_is_deterministic():
+    a = LatencyModel("lognormal:0.5,0.3", seed=1)
+    b = LatencyModel("lognormal:0.5,0.3", seed=1)
+    assert [a.sample() for _ in range(5)] == [b.sample() for _ in range(5)]
+    with pytest.raises(ValueError):
+        LatencyModel("pareto:1")
@@ -0,0 +1,105 @@
+from datetime import datetime, time, timedelta
+from types import SimpleNamespace
+
+from secretary.scheduler import Scheduler
+from secretary.utilities.calendar_index import IndexedCalendar
+from secretary.utilities.freebusy import FreeBusyCache, set_freebusy_cache
+from secretary.utilities.slot_finder import SlotPolicy
+
+DAY = datetime(2030, 1, 7)
+
+
+def rfc(value):
+    return value.astimezone().isoformat()
+
+
+class Calendar:
+    """freebusy().query(body=...).execute() over canned busy times and errors; records every request body."""
+
+    def __init__(self, busy, errors=None):
+        self.busy = busy
+        self.errors = errors or {}
+        self.bodies = []
+
+    def freebusy(self):
+        return self
+
+    def query(self, body):
+        self.bodies.append(body)
+        calendars = {}
+        for item in body["items"]:
+            if item["id"] in self.errors:
+                calendars[item["id"]] = {"busy": [], "errors": [{"domain": "global", "reason": self.errors[item["id"]]}]}
+            elif item["id"] in self.busy:
+                calendars[item["id"]] = {"busy": [{"start": rfc(s), "end": rfc(e)} for s, e in self.busy[item["id"]]]}
+            else:
+                calendars[item["id"]] = {"errors": [{"domain": "global", "reason": "notFound"}]}
+        return SimpleNamespace(execute=lambda: {"calendars": calendars})
+
+
+def test_one_request_for_all_calendars_then_cached_until_the_ttl():
+    now = [0.0]
+    cache = FreeBusyCache(ttl=60, clock=lambda: now[0])
+    service = Calendar({"a@x": [(DAY.replace(hour=9), DAY.replace(hour=10))], "b@x": []})
+    calendars = {"alice": "a@x", "bob": "b@x", "ghost": "g@x"}
+
+    result = cache.query(service, calendars, DAY, DAY + timedelta(days=2))
+    assert len(service.bodies) == 1 and [i["id"] for i in service.bodies[0]["items"]] == ["a@x", "b@x", "g@x"]
+    assert result["alice"].intervals == [(DAY.replace(hour=9), DAY.replace(hour=10))]
+    assert result["bob"].intervals == [] and result["ghost"].intervals == []
+
+    # A narrower window within the TTL is answered from the cache; a wider one or a new calendar is fetched
+    assert cache.query(service, {"alice": "a@x"}, DAY.replace(hour=8), DAY.replace(hour=12))["alice"].overlapping(
+        DAY.replace(hour=8), DAY.replace(hour=12)) == [(DAY.replace(hour=9), DAY.replace(hour=10))]
+    assert len(service.bodies) == 1
+    cache.query(service, {"alice": "a@x", "carol": "c@x"}, DAY, DAY + timedelta(days=1))
+    assert [i["id"] for i in service.bodies[-1]["items"]] == ["c@x"]
+    cache.query(service, {"bob": "b@x"}, DAY, DAY + timedelta(days=3))
+    assert len(service.bodies) == 3
+
+    now[0] = 61
+    cache.query(service, {"alice": "a@x"}, DAY, DAY + timedelta(days=1))
+    assert len(service.bodies) == 4
+
+
+def test_scheduler_counts_google_events_as_conflicts():
+    service = Calendar({"bob@example.com": [(DAY.replace(hour=10), DAY.replace(hour=11))], "primary": []})
+    brain = SimpleNamespace(calendar=IndexedCalendar(), confirmation_context={}, meeting_context={})
+    scheduler = Scheduler("alice", calendar_service=service, network=None, brain=brain)
+    scheduler.slot_policy = SlotPolicy(work_start=time(9), work_end=time(17))
+    previous = set_freebusy_cache(FreeBusyCache())
+    try:
+        # As in the scheduling flow: one query up front, then every check and the slot search hit the cache
+        start = DAY.replace(hour=10)
+        scheduler._google_busy(["alice", "bob"], *scheduler._busy_window(start))
+        assert not scheduler._check_time_with_attendees("bob", start.replace(minute=30), start.replace(hour=11))
+        assert scheduler._check_time_with_attendees("alice", start.replace(minute=30), start.replace(hour=11))
+        assert scheduler.find_perfect_meeting_time(["alice", "bob"], start, start.replace(hour=11)) == (
+            True, DAY.replace(hour=11), DAY.replace(hour=12))
+    finally:
+        set_freebusy_cache(previous)
+    assert len(service.bodies) == 1 and len(service.bodies[0]["items"]) == 2
+
+
+def test_temporary_errors_are_not_cached_and_count_as_busy():
+    service = Calendar({"primary": [], "bob@example.com": []}, errors={"bob@example.com": "backendError"})
+    cache = FreeBusyCache()
+    assert list(cache.query(service, {"alice": "primary", "bob": "bob@example.com"}, DAY, DAY + timedelta(days=1))) == [
+        "alice"]
+    cache.query(service, {"bob": "bob@example.com"}, DAY, DAY + timedelta(days=1))
+    assert [i["id"] for i in service.bodies[-1]["items"]] == ["bob@example.com"]
+
+    brain = SimpleNamespace(calendar=IndexedCalendar(), confirmation_context={}, meeting_context={})
+    scheduler = Scheduler("alice", calendar_service=service, network=None, brain=brain)
+    scheduler.slot_policy = SlotPolicy(work_start=time(9), work_end=time(17))
+    previous = set_freebusy_cache(cache)
+    try:
+        start = DAY.replace(hour=10)
+        assert not scheduler._check_time_with_attendees("bob", start, start.replace(hour=11))
+        assert scheduler._check_time_with_attendees("alice", start, start.replace(hour=11))
+        assert scheduler.find_perfect_meeting_time(["alice", "bob"], start, start.replace(hour=11)) == (True, None, None)
+
+        del service.errors["bob@example.com"]  # Google recovers: the next lookup is answered
+        assert scheduler._check_time_with_attendees("bob", start, start.replace(hour=11))
+    finally:
+        set_freebusy_cache(previous)
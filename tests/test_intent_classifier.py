@@ -0,0 +1,61 @@
+import json
+import time
+
+from secretary.utilities.intent_classifier import IntentClassifier, log_example, route_label, train_from_log
+from secretary.utilities.log_sink import get_sink
+
+
+def test_rules_short_circuit_chit_chat_and_commands():
+    clf = IntentClassifier()
+    assert clf.classify("Thanks!") == ("chat", 1.0, "rule")
+    assert clf.classify("Schedule a meeting with Bob")[0] == "calendar"
+    assert clf.classify("any unread email from Alice?")[0] == "email"
+    # Untrained model never skips the router on its own
+    skip, predicted, _ = clf.should_skip_router("what do you think about the roadmap")
+    assert skip is False
+    assert predicted == "uncertain"
+
+
+def test_trained_model_routes_chat_locally_and_fast(tmp_path):
+    path = tmp_path / "examples.jsonl"
+    examples = [("tell me a joke", "chat"), ("what is the capital of france", "chat"),
+                ("how do I write a good plan", "chat"), ("explain recursion to me", "chat"),
+                ("book time with alice tomorrow at 3", "calendar"), ("move my 1:1 with bob to friday", "calendar"),
+                ("find messages from carol about the budget", "email"), ("show what bob sent me last week", "email")]
+    with open(path, "w") as f:
+        for text, label in examples * 5:
+            f.write(json.dumps({"text": text, "label": label}) + "\n")
+
+    clf = train_from_log(str(path), threshold=0.6, shadow_rate=0.0)
+    assert clf.classify("tell me a joke about cats")[0] == "chat"
+    assert clf.classify("book time with dave tomorrow")[0] == "calendar"
+
+    start = time.perf_counter()
+    for _ in range(100):
+        clf.should_skip_router("what is the capital of italy")
+    assert (time.perf_counter() - start) / 100 < 0.001
+
+    clf.save(str(tmp_path / "model.json"))
+    loaded = IntentClassifier.load(str(tmp_path / "model.json"))
+    assert loaded.predict_proba("tell me a joke") == clf.predict_proba("tell me a joke")
+
+
+def test_precision_counters():
+    clf = IntentClassifier()
+    clf.record("chat", "chat")
+    clf.record("chat", "calendar")
+    clf.record("uncertain", "chat")
+    routes = clf.stats()["routes"]
+    assert routes == {"chat": {"checked": 2, "correct": 1, "precision": 0.5}}
+    assert route_label({"calendar": {"is_calendar_command": True}}) == "calendar"
+    assert route_label({"calendar": {}, "email": {"action": "none"}, "send_email": {"is_send_email": True}}) == "email"
+
+
+def test_logged_examples_train_a_classifier(tmp_path, monkeypatch):
+    monkeypatch.setenv("INTENT_EXAMPLES_PATH", str(tmp_path / "examples.jsonl"))
+    for text, label in [("tell me a joke", "chat"), ("book time with alice", "calendar")] * 5:
+        log_example(text, label)
+    get_sink(str(tmp_path), "examples").flush()
+
+    clf = train_from_log(str(tmp_path / "examples.jsonl"), threshold=0.6, shadow_rate=0.0)
+    assert clf.classify("book time with bob")[0] == "calendar"
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+from network.internal_communication import Intercom
+from secretary.memory import ConversationMemory
+from secretary.utilities.introspection import MemorySampler, TracemallocDiff, deep_sizeof, footprint
+
+
+def make_node(node_id, network):
+    node = SimpleNamespace(node_id=node_id)
+    # A back-reference from the data to the node must not pull the whole graph into the size
+    node.brain = SimpleNamespace(calendar=[], projects={}, tasks=[], context=[], owner=node, network=network)
+    node.communication = SimpleNamespace(conversation_history=ConversationMemory(background=False))
+    return node
+
+
+def test_footprint_reports_counts_and_growth():
+    net = Intercom()
+    net.register_node("alice", make_node("alice", net))
+    net.register_node("bob", make_node("bob", net))
+
+    before = footprint(net, include_buffers=False)
+    alice = net.nodes["alice"]
+    alice.brain.calendar.extend({"title": f"Sync {i}", "participants": ["alice", "bob"], "node": alice}
+                                for i in range(200))
+    alice.communication.conversation_history.append({"role": "user", "content": "hello " * 50})
+    after = footprint(net, include_buffers=False)
+
+    cal_before = before["nodes"]["alice"]["brain.calendar"]
+    cal_after = after["nodes"]["alice"]["brain.calendar"]
+    assert (cal_before["count"], cal_after["count"]) == (0, 200)
+    assert 200 * 100 < cal_after["bytes"] < 200 * 2000
+    assert after["nodes"]["alice"]["communication.conversation_history"]["count"] == 1
+    assert after["nodes"]["bob"] == before["nodes"]["bob"]
+    assert after["network"]["intercom.tasks"] == {"count": 0, "bytes": deep_sizeof([])[0]}
+
+
+def test_tracemalloc_diff_reports_new_allocations():
+    differ = TracemallocDiff()
+    try:
+        assert differ.diff()["started"]
+        hoard = [bytearray(1024) for _ in range(2000)]
+        report = differ.diff(top=5)
+        assert report["top"][0]["size_diff"] >= 1024 * 2000
+        assert "test_introspection.py" in report["top"][0]["where"]
+    finally:
+        differ.stop()
+    assert len(hoard) == 2000
+
+
+def test_sampler_flags_sustained_growth():
+    def sampler_over(values):
+        reports = iter([{"ts": i * 360.0, "rss_bytes": None, "network": {}, "buffers": {},
+                         "nodes": {"alice": {"brain.calendar": {"count": v, "bytes": v * 100}}}}
+                        for i, v in enumerate(values)])
+        return MemorySampler(lambda: next(reports), window=3)
+
+    growing = sampler_over([1, 2, 3, 4])
+    assert [growing.sample() for _ in range(3)] == [[], [], []]
+    assert growing.sample() == [("alice/brain.calendar", 100, 400, 1000.0)]
+
+    flat = sampler_over([1, 2, 2, 3])
+    assert [flat.sample() for _ in range(4)][-1] == []
@@ -0,0 +1,95 @@
+import time
+import pytest
+
+from secretary.utilities.llm_cache import LLMCache, make_cache_key
+from secretary.brain import LLMClient
+
+
+class CountingCompletions:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def create(self, model, messages, temperature, max_tokens, **kwargs):
+        self.calls += 1
+        class Choice:
+            def __init__(self, text):
+                self.message = type('M', (), {'content': text})
+        return type('R', (), {'choices': [Choice(self.text)]})
+
+
+def make_client(cache, text="cached reply", temperature=0.1):
+    client = LLMClient("key", {"model": "m", "temperature": temperature, "max_tokens": 10}, cache=cache)
+    completions = CountingCompletions(text)
+    client.client = type('C', (), {'chat': type('Chat', (), {'completions': completions})})
+    return client, completions
+
+
+def test_cache_key_ignores_surrounding_whitespace_but_not_params():
+    a = make_cache_key([{"role": "user", "content": "  hello world\n "}], "m", 0.1, 10)
+    b = make_cache_key([{"role": "user", "content": "hello world"}], "m", 0.1, 10)
+    c = make_cache_key([{"role": "user", "content": "hello world"}], "m", 0.1, 20)
+    assert a == b
+    assert a != c
+    # Line breaks and indentation inside the content are part of the prompt
+    assert make_cache_key([{"role": "user", "content": "1. a\n2. b"}], "m", 0.1, 10) != make_cache_key(
+        [{"role": "user", "content": "1. a 2. b"}], "m", 0.1, 10)
+    assert make_cache_key([{"role": "user", "content": "if x:\n    y"}], "m", 0.1, 10) != make_cache_key(
+        [{"role": "user", "content": "if x:\ny"}], "m", 0.1, 10)
+
+
+def test_cache_key_includes_tool_calls_and_results():
+    call = {"role": "assistant", "content": None,
+            "tool_calls": [{"id": "call_1", "type": "function", "function": {"name": "f", "arguments": "{}"}}]}
+    other_call = dict(call, tool_calls=[dict(call["tool_calls"][0], id="call_2")])
+    result = {"role": "tool", "tool_call_id": "call_1", "content": "42"}
+    key = make_cache_key([call, result], "m", 0.1, 10)
+    assert key != make_cache_key([other_call, result], "m", 0.1, 10)
+    assert key != make_cache_key([call, dict(result, tool_call_id="call_2")], "m", 0.1, 10)
+    assert make_cache_key([{"role": "user", "name": "alice", "content": "hi"}], "m", 0.1, 10) != make_cache_key(
+        [{"role": "user", "name": "bob", "content": "hi"}], "m", 0.1, 10)
+
+
+def test_lru_eviction_and_counters():
+    cache = LLMCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"   # a is now most recently used
+    cache.set("c", "3")            # evicts b
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+
+
+def test_ttl_expiry():
+    cache = LLMCache(ttl_seconds=0.01)
+    cache.set("k", "v")
+    time.sleep(0.02)
+    assert cache.get("k") is None
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    LLMCache(db_path=path).set("k", "v")
+    fresh = LLMCache(db_path=path)
+    assert fresh.get("k") == "v"
+    assert fresh.stats()["disk_hits"] == 1
+
+
+def test_llmclient_serves_repeated_prompt_from_cache():
+    client, completions = make_client(LLMCache())
+    messages = [{"role": "user", "content": "is this a calendar command?"}]
+    assert client.chat(messages) == "cached reply"
+    assert client.chat(messages) == "cached reply"
+    assert completions.calls == 1
+
+
+def test_llmclient_skips_cache_for_high_temperature():
+    client, completions = make_client(LLMCache(), temperature=0.9)
+    messages = [{"role": "user", "content": "tell me a story"}]
+    client.chat(messages)
+    client.chat(messages)
+    assert completions.calls == 2
@@ -0,0 +1,52 @@
+import threading
+import time
+
+import openai
+
+from secretary.utilities.llm_dispatcher import LLMDispatcher, llm_priority, BACKGROUND, INTERACTIVE
+
+
+def rate_limit_error():
+    response = type('Response', (), {'status_code': 429, 'headers': {}, 'request': None})()
+    return openai.RateLimitError("slow down", response=response, body=None)
+
+
+def test_retries_rate_limit_with_backoff():
+    dispatcher = LLMDispatcher(base_delay=0.001, max_delay=0.01, max_retries=3)
+    attempts = []
+
+    def flaky(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) < 3:
+            raise rate_limit_error()
+        return "ok"
+
+    assert dispatcher.submit(flaky, model="m", messages=[{"role": "user", "content": "hi"}]) == "ok"
+    stats = dispatcher.stats()
+    assert len(attempts) == 3
+    assert stats["retries"] == 2
+    assert stats["rate_limited"] == 2
+
+
+def test_interactive_lane_goes_first_when_rate_limited():
+    # One request per second and no burst: the first call drains the bucket, the rest queue up
+    dispatcher = LLMDispatcher(requests_per_minute=60, burst_seconds=1)
+    order = []
+    dispatcher.submit(lambda: order.append("warmup"))
+
+    def run(lane, name):
+        with llm_priority(lane):
+            dispatcher.submit(lambda: order.append(name))
+
+    background = threading.Thread(target=run, args=(BACKGROUND, "background"))
+    background.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=run, args=(INTERACTIVE, "interactive"))
+    interactive.start()
+    time.sleep(0.05)
+    assert dispatcher.stats()["lanes"]["background"]["queue_depth"] == 1
+
+    interactive.join(5)
+    background.join(5)
+    assert order == ["warmup", "interactive", "background"]
+    assert dispatcher.stats()["lanes"]["background"]["wait_max"] > 0.5
@@ -0,0 +1,73 @@
+import logging
+import os
+import time
+
+from secretary.utilities.log_sink import JsonlLogHandler, JsonlSink, query_logs
+
+
+def test_rotation_compression_index_and_query(tmp_path):
+    sink = JsonlSink(str(tmp_path), prefix="app", max_bytes=400, compression="gzip")
+    base = time.time() - 1000
+    for i in range(30):
+        sink.write({"ts": base + i * 10, "level": "INFO", "msg": f"message {i}"})
+    sink.flush()
+
+    index = sink.read_index()
+    assert len(index) >= 3
+    assert all(entry["file"].endswith(".jsonl.gz") for entry in index)
+    assert [e["start"] for e in index] == sorted(e["start"] for e in index)
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".jsonl") and f != "app.jsonl"]
+
+    window = list(sink.query(since=base + 100, until=base + 150))
+    assert [r["msg"] for r in window] == [f"message {i}" for i in range(10, 16)]
+    assert [r["msg"] for r in query_logs(str(tmp_path), "app", contains=r"message 2[89]")] == ["message 28", "message 29"]
+    sink.close()
+
+
+def test_retention_and_log_handler(tmp_path):
+    sink = JsonlSink(str(tmp_path), prefix="app", max_bytes=200, compression="none", max_total_bytes=600,
+                     background=True)
+    logger = logging.getLogger("test_log_sink")
+    logger.propagate = False
+    handler = JsonlLogHandler(sink)
+    logger.addHandler(handler)
+    try:
+        for i in range(100):
+            logger.warning("record %d %s", i, "x" * 40)
+        sink.flush()
+    finally:
+        logger.removeHandler(handler)
+
+    assert sum(e["bytes"] for e in sink.read_index()) <= 600
+    records = list(sink.query(level="WARNING"))
+    assert records[-1]["msg"].startswith("record 99 ")
+    assert records[0]["msg"] != "record 0 " + "x" * 40  # oldest segments were dropped
+    handler.close()
+
+
+def test_resumed_segment_without_timestamps_ages_from_its_mtime(tmp_path):
+    path = tmp_path / "app.jsonl"
+    path.write_text("not json\n[1, 2]\n")
+    old = time.time() - 7200
+    os.utime(path, (old, old))
+
+    sink = JsonlSink(str(tmp_path), prefix="app", max_age=3600, compression="none")
+    sink.write({"msg": "after restart"})
+    assert [e["records"] for e in sink.read_index()] == [2]
+    assert sink.read_index()[0]["start"] == old
+    assert [r["msg"] for r in query_logs(str(tmp_path), "app")] == ["after restart"]
+    sink.close()
+
+
+def test_background_write_failures_are_counted_and_reported(tmp_path, capsys):
+    sink = JsonlSink(str(tmp_path), prefix="app", compression="none", background=True)
+    sink.write({"msg": "kept"})
+    sink.write({"msg": object()})  # default=str makes this serializable
+    sink.write({"ts": "not a number", "msg": "lost"})
+    sink.write({"ts": "not a number", "msg": "lost too"})
+    sink.flush()
+    assert sink.dropped == 2
+    assert [r["msg"] for r in sink.query()][:1] == ["kept"]
+    assert capsys.readouterr().err.count("JsonlSink error") == 1
+    sink.close()
+    assert "2 records could not be written" in capsys.readouterr().err
@@ -0,0 +1,58 @@
+import logging
+import sys
+
+from secretary.utilities import logging as log_mod
+
+
+class Exploding:
+    """Fails the test if anything tries to format it."""
+
+    def __str__(self):
+        raise AssertionError("formatted although the category is off")
+
+    __repr__ = __str__
+
+
+def test_disabled_category_skips_formatting(monkeypatch):
+    monkeypatch.setattr(log_mod, "LOG_SYSTEM_MESSAGES", False)
+    monkeypatch.setattr(log_mod, "LOG_API_REQUESTS", False)
+    log_mod.log_system_message("[Test] %s", Exploding())
+    log_mod.log_api_request("openai_chat", {"messages": [Exploding()]})
+
+
+def test_payloads_are_truncated_and_records_are_queued(monkeypatch):
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    monkeypatch.setattr(log_mod, "MAX_PAYLOAD_CHARS", 50)
+    log_mod.logger.addHandler(handler)
+    try:
+        log_mod.log_api_response("gmail_get", {"body": "x" * 10_000})
+        log_mod.log_system_message("[Test] %d meetings", 3)
+    finally:
+        log_mod.logger.removeHandler(handler)
+
+    messages = [r.getMessage() for r in records]
+    assert "SYSTEM: [Test] 3 meetings" in messages
+    payload = next(m for m in messages if m.startswith("API RESPONSE"))
+    assert payload.endswith("…[truncated]") and len(payload) < 120
+    assert log_mod.queue_handler in log_mod.logger.handlers
+    assert log_mod.file_handler not in log_mod.logger.handlers
+
+
+def test_queued_records_are_frozen_at_the_call():
+    request = {"messages": ["hi"]}
+    record = log_mod.logger.makeRecord("AgentAI", logging.DEBUG, __file__, 1, "API REQUEST (%s): %s",
+                                       ("x", log_mod.Payload(request)), None)
+    queued = log_mod.queue_handler.prepare(record)
+    request["messages"].append("MUTATED")
+    assert queued.args is None and queued.getMessage() == "API REQUEST (x): {'messages': ['hi']}"
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        failed = log_mod.logger.makeRecord("AgentAI", logging.ERROR, __file__, 1, "ERROR: %s", ("x",), sys.exc_info())
+    entries = []
+    sink = type("Sink", (), {"write": lambda self, entry: entries.append(entry)})()
+    log_mod.JsonlLogHandler(sink).handle(log_mod.queue_handler.prepare(failed))
+    assert entries[0]["msg"] == "ERROR: x" and "ValueError: boom" in entries[0]["exc"]
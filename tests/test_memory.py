@@ -0,0 +1,43 @@
+from secretary.memory import ConversationMemory, estimate_tokens
+
+
+def make_turns(memory, n, size=40):
+    for i in range(n):
+        memory.append({"role": "user" if i % 2 == 0 else "assistant", "content": f"turn {i} " + "x" * size})
+
+
+def test_get_messages_respects_budget_without_summarizer():
+    memory = ConversationMemory(max_tokens=100)
+    make_turns(memory, 20)
+    messages = memory.get_messages()
+    assert len(memory) == 20
+    assert messages[-1]["content"].startswith("turn 19")
+    assert sum(estimate_tokens(m["content"]) + 4 for m in messages) <= 100
+
+
+def test_old_turns_are_folded_into_summary():
+    calls = []
+
+    def summarizer(previous, messages):
+        calls.append(len(messages))
+        return (previous + " " if previous else "") + f"{len(messages)} turns"
+
+    memory = ConversationMemory(summarizer=summarizer, max_tokens=200, recent_turns=4, background=False)
+    make_turns(memory, 12)
+    assert calls
+    assert len(memory) <= 12 - calls[0]
+    messages = memory.get_messages()
+    assert messages[0]["role"] == "system"
+    assert "turns" in messages[0]["content"]
+    assert messages[-1]["content"].startswith("turn 11")
+
+
+def test_background_summarization_keeps_history_on_failure():
+    def summarizer(previous, messages):
+        raise RuntimeError("llm down")
+
+    memory = ConversationMemory(summarizer=summarizer, max_tokens=100, recent_turns=2)
+    make_turns(memory, 10)
+    memory.wait(1)
+    assert len(memory) == 10
+    assert memory.summary == ""
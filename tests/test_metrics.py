@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+from secretary.utilities import metrics
+from secretary.utilities.google import instrument_service
+
+
+def test_histogram_render_is_cumulative():
+    hist = metrics.Histogram("test_seconds", "Test histogram.", ("node", "stage"), buckets=(0.1, 1.0))
+    hist.observe(0.05, "n1", "route")
+    hist.observe(0.5, "n1", "route")
+    hist.observe(5.0, "n1", "route")
+
+    lines = hist.render()
+    assert '# TYPE test_seconds histogram' in lines
+    assert 'test_seconds_bucket{node="n1",stage="route",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{node="n1",stage="route",le="1"} 2' in lines
+    assert 'test_seconds_bucket{node="n1",stage="route",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{node="n1",stage="route"} 3' in lines
+
+
+def test_timed_records_stage_even_on_error():
+    before = metrics.STAGE_DURATION.snapshot().get(("metrics_test", "boom"), {"count": 0})["count"]
+    try:
+        with metrics.timed("boom", "metrics_test"):
+            raise ValueError("stage failed")
+    except ValueError:
+        pass
+    after = metrics.STAGE_DURATION.snapshot()[("metrics_test", "boom")]["count"]
+    assert after == before + 1
+    assert 'stage="boom"' in metrics.render()
+
+
+def test_instrument_service_times_execute():
+    request = SimpleNamespace(execute=lambda **kwargs: {"items": []}, uri="https://example/events")
+    events = SimpleNamespace(list=lambda **kwargs: request)
+    service = instrument_service(SimpleNamespace(events=lambda: events), "calendar", "metrics_node")
+
+    wrapped = service.events().list(calendarId="primary")
+    assert wrapped.uri == "https://example/events"
+    assert wrapped.execute() == {"items": []}
+    series = metrics.GOOGLE_DURATION.snapshot()[("metrics_node", "calendar", "events.list")]
+    assert series["count"] == 1
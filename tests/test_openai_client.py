@@ -0,0 +1,73 @@
+import threading
+import time
+
+from secretary.utilities.openai_client import ClientRegistry, NodeClient
+from secretary.scheduler import Scheduler
+from network.internal_communication import Intercom
+
+
+def test_registry_shares_pool_between_nodes():
+    registry = ClientRegistry(api_key="key")
+    a = registry.get_client("alice")
+    b = registry.get_client("bob")
+    assert isinstance(a, NodeClient)
+    # Same node -> same view, different nodes -> same underlying client
+    assert registry.get_client("alice") is a
+    assert a.raw is b.raw
+    # Different key still uses the same HTTP pool
+    other = registry.get_shared_client("other-key")
+    assert other is not a.raw
+    assert other._client is a.raw._client
+    registry.close()
+
+
+def test_node_client_caps_concurrency():
+    class Completions:
+        def __init__(self):
+            self.active = 0
+            self.peak = 0
+            self.lock = threading.Lock()
+
+        def create(self, **kwargs):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(0.02)
+            with self.lock:
+                self.active -= 1
+            return "ok"
+
+    completions = Completions()
+    fake = type('Client', (), {'chat': type('Chat', (), {'completions': completions})()})()
+    view = NodeClient("alice", fake, max_concurrency=2)
+
+    threads = [threading.Thread(target=lambda: view.chat.completions.create(model="m")) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert completions.peak == 2
+
+
+def test_streams_hold_the_node_slot_until_read():
+    class Completions:
+        def create(self, stream=False, **kwargs):
+            return iter(["a", "b"]) if stream else "ok"
+
+    fake = type('Client', (), {'chat': type('Chat', (), {'completions': Completions()})()})()
+    view = NodeClient("alice", fake, max_concurrency=1)
+
+    stream = view.chat.completions.create(model="m", stream=True)
+    assert not view._semaphore.acquire(blocking=False)
+    assert list(stream) == ["a", "b"]
+    assert view.chat.completions.create(model="m") == "ok"
+
+    # Closing an unread stream gives the slot back too
+    view.chat.completions.create(model="m", stream=True).close()
+    assert view._semaphore.acquire(blocking=False)
+
+
+def test_scheduler_uses_injected_client():
+    marker = object()
+    sched = Scheduler("alice", calendar_service=None, network=Intercom(), client=marker)
+    assert sched.client is marker
@@ -0,0 +1,49 @@
+import os
+import time
+
+from flask import Flask
+
+from secretary.utilities.profiling import RequestProfiler
+
+
+def slow_handler_work():
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        pass
+
+
+def make_app(tmp_path, **kwargs):
+    app = Flask(__name__)
+    profiler = RequestProfiler(app, directory=str(tmp_path), interval=0.001, **kwargs)
+
+    @app.route('/meetings')
+    def meetings():
+        slow_handler_work()
+        return "ok"
+    return app, profiler
+
+
+def test_header_triggers_collapsed_stack_profile(tmp_path):
+    app, _ = make_app(tmp_path)
+    client = app.test_client()
+
+    assert client.get('/meetings').headers.get("X-Profile-File") is None
+    response = client.get('/meetings', headers={"X-Profile": "1"})
+    name = response.headers["X-Profile-File"]
+    assert name.endswith(".folded") and "_meetings_200_" in name
+
+    lines = (tmp_path / name).read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("slow_handler_work" in line for line in lines)
+
+
+def test_retention_cap_and_token(tmp_path):
+    app, profiler = make_app(tmp_path, token="secret", max_profiles=2)
+    client = app.test_client()
+
+    assert "X-Profile-File" not in client.get('/meetings', headers={"X-Profile": "1"}).headers
+    for _ in range(4):
+        client.get('/meetings', headers={"X-Profile": "secret"})
+    assert len(os.listdir(tmp_path)) == 2
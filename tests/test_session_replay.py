@@ -0,0 +1,114 @@
+import pytest
+from openai.types.chat import ChatCompletion
+
+from benchmarks.replay_sessions import build_report, replay
+from secretary.utilities.google import instrument_service
+from secretary.utilities.log_sink import JsonlSink
+from secretary.utilities.openai_client import NodeClient
+from secretary.utilities.session_recorder import (ReplayedError, SessionRecorder, intercept, load_turns,
+                                                  recorded, replaying, set_recorder)
+
+
+def completion(text):
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "m",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": text}}],
+    })
+
+
+class Completions:
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return completion(f"{self.answer}: {kwargs['messages'][-1]['content']}")
+
+
+class Request:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+
+class Calendar:
+    def __init__(self, items):
+        self.items = items
+
+    def events(self):
+        return self
+
+    def list(self, **kwargs):
+        return Request({"items": list(self.items)})
+
+
+class Node:
+    def __init__(self, node_id, answer, events):
+        self.node_id = node_id
+        self.completions = Completions(answer)
+        client = type('Client', (), {'chat': type('Chat', (), {'completions': self.completions})()})()
+        self.client = NodeClient(node_id, client, max_concurrency=2)
+        self.calendar = instrument_service(Calendar(events), "calendar", node_id)
+
+    @recorded
+    def receive_message(self, message, sender_id):
+        events = self.calendar.events().list(calendarId="primary", q=message).execute()["items"]
+        reply = self.client.chat.completions.create(
+            model="m", messages=[{"role": "user", "content": f"{message} ({len(events)} events)"}])
+        return reply.choices[0].message.content
+
+
+def test_record_then_replay_substitutes_responses(tmp_path):
+    sink = JsonlSink(str(tmp_path), "sessions", compression="none")
+    previous = set_recorder(SessionRecorder(sink))
+    try:
+        live = Node("alice", "live", events=[{"id": "e1"}, {"id": "e2"}])
+        assert live.receive_message("am I free at 3?", "user") == "live: am I free at 3? (2 events)"
+        live.receive_message("book it", "user")
+    finally:
+        set_recorder(previous)
+        sink.close()
+
+    turns = load_turns(str(tmp_path))
+    assert [t["message"] for t in turns] == ["am I free at 3?", "book it"]
+    assert [c["name"] for c in turns[0]["calls"]] == ["calendar.events.list", "Completions.create"]
+
+    # A build with a different model answer and an empty calendar still replays the recorded answers
+    build = Node("alice", "changed", events=[])
+    result = replay({"alice": build}, turns, speed=100, latency=False)
+    assert build.completions.calls == 0
+    report = build_report(result, {})
+    assert report["overall"]["count"] == 2
+    assert report["overall"]["changed_replies"] == 0
+    assert report["overall"]["substituted_calls"] == 4 and report["overall"]["missed_calls"] == 0
+
+
+def test_replay_matches_by_order_and_passes_misses_through():
+    calls = [
+        {"kind": "google", "node": "bob", "name": "gmail.users.messages.list", "key": "stale", "seconds": 0.0,
+         "response": {"messages": [{"id": "m1"}]}},
+        {"kind": "google", "node": "bob", "name": "gmail.users.messages.send", "key": "x", "seconds": 0.0,
+         "error": "HttpError: 500"},
+    ]
+    with replaying(calls, latency=False) as source:
+        # Different arguments than recorded: matched by order within the same endpoint
+        assert intercept("google", "bob", "gmail.users.messages.list", {"q": "today"}, lambda: {}) == {
+            "messages": [{"id": "m1"}]}
+        with pytest.raises(ReplayedError):
+            intercept("google", "bob", "gmail.users.messages.send", {}, lambda: {})
+        assert intercept("google", "bob", "gmail.users.messages.list", {}, lambda: "live") == "live"
+    assert (source.hits, source.misses) == (2, 1)
+
+
+def test_stream_calls_never_get_a_recorded_completion():
+    recorded_call = {"kind": "openai", "node": "alice", "name": "Completions.create", "key": "stale", "seconds": 0.0,
+                     "response": completion("recorded").model_dump(mode="json")}
+    with replaying([recorded_call], latency=False) as source:
+        stream = intercept("openai", "alice", "Completions.create", {"stream": True}, lambda: iter(["live"]))
+        assert list(stream) == ["live"]
+        reply = intercept("openai", "alice", "Completions.create", {}, lambda: None, decode=ChatCompletion.model_validate)
+        assert reply.choices[0].message.content == "recorded"
+    assert (source.hits, source.misses) == (1, 1)
@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+
+from secretary.utilities.singleflight import SingleFlight
+from secretary.brain import LLMClient
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return "answer"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["answer"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"executed": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_errors_reach_every_waiter_and_are_not_remembered():
+    flight = SingleFlight()
+    with pytest.raises(RuntimeError):
+        flight.do("k", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+    assert flight.do("k", lambda: "retry") == "retry"
+
+
+def test_llmclient_coalesces_identical_requests_without_cache():
+    class SlowCompletions:
+        def __init__(self):
+            self.calls = 0
+
+        def create(self, **kwargs):
+            self.calls += 1
+            time.sleep(0.05)
+            message = type('M', (), {'content': "shared"})
+            return type('R', (), {'choices': [type('C', (), {'message': message})]})
+
+    completions = SlowCompletions()
+    client = LLMClient("key", {"model": "m", "temperature": 0, "max_tokens": 5}, cache=False,
+                       client=type('Client', (), {'chat': type('Chat', (), {'completions': completions})}),
+                       singleflight=SingleFlight())
+    messages = [{"role": "user", "content": "best candidates for project X"}]
+
+    threads = [threading.Thread(target=client.complete, args=(messages,)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert completions.calls == 1
@@ -0,0 +1,91 @@
+import json
+from datetime import datetime, time, timedelta
+from types import SimpleNamespace
+
+from network.internal_communication import Intercom
+from secretary.scheduler import Scheduler
+from secretary.utilities.calendar_index import IndexedCalendar
+from secretary.utilities.slot_finder import SlotPolicy, find_slots, merge_busy
+
+MONDAY = datetime(2030, 1, 7)
+
+
+def at(day, hour, minute=0):
+    return MONDAY + timedelta(days=day, hours=hour, minutes=minute)
+
+
+def test_sweep_merges_overlapping_and_touching_intervals():
+    busy = [(at(0, 10), at(0, 11)), (at(0, 9), at(0, 9, 30)), (at(0, 10, 30), at(0, 12)), (at(0, 12), at(0, 13)),
+            (at(0, 15), at(0, 16))]
+    assert merge_busy(busy) == [(at(0, 9), at(0, 9, 30)), (at(0, 10), at(0, 13)), (at(0, 15), at(0, 16))]
+    assert merge_busy(busy, buffer=timedelta(minutes=10))[0] == (at(0, 8, 50), at(0, 9, 40))
+
+
+def test_find_slots_respects_hours_buffers_and_gaps():
+    policy = SlotPolicy(work_start=time(9), work_end=time(17), buffer=timedelta(minutes=10), candidates=4)
+    busy = [(at(0, 9), at(0, 12)), (at(0, 12, 30), at(0, 16, 30)),  # Monday: no hour left with buffers
+            (at(1, 10), at(1, 11))]
+    slots = find_slots(busy, timedelta(hours=1), at(0, 8, 7), policy)
+    # Tuesday 9:00 would run into the buffer before 10:00; 11:10 is aligned to 11:15; then one slot per free gap
+    assert slots == [(at(1, 11, 15), at(1, 12, 15)), (at(2, 9), at(2, 10)), (at(3, 9), at(3, 10)),
+                     (at(4, 9), at(4, 10))]
+    # Friday evening: the weekend is skipped
+    assert find_slots([], timedelta(minutes=30), at(4, 16, 45), policy, limit=1) == [(at(7, 9), at(7, 9, 30))]
+    assert find_slots([(at(0, 0), at(30, 0))], timedelta(minutes=30), at(0, 9), policy) == []
+
+
+class Completions:
+    def __init__(self, choice):
+        self.choice = choice
+        self.prompts = []
+
+    def create(self, **kwargs):
+        self.prompts.append(kwargs["messages"][0]["content"])
+        content = json.dumps({"choice": self.choice})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def make_scheduler(client=None):
+    net = Intercom()
+    calendars = {
+        "alice": [{"event_id": "a", "start_time": at(0, 9).isoformat(), "end_time": at(0, 10).isoformat(),
+                   "participants": ["alice"]}],
+        "bob": [{"event_id": "b", "start_time": at(0, 10).isoformat(), "end_time": at(0, 11, 30).isoformat(),
+                 "participants": ["bob"]}],
+    }
+    for node_id, meetings in calendars.items():
+        brain = SimpleNamespace(calendar=IndexedCalendar(meetings), confirmation_context={}, meeting_context={})
+        net.register_node(node_id, SimpleNamespace(node_id=node_id, brain=brain))
+    scheduler = Scheduler("alice", calendar_service=None, network=net, brain=net.nodes["alice"].brain, client=client)
+    scheduler.slot_policy = SlotPolicy(work_start=time(9), work_end=time(17))
+    return scheduler
+
+
+def test_find_perfect_meeting_time_uses_every_participants_calendar():
+    scheduler = make_scheduler()
+    # 9:30 clashes with alice, and bob is busy until 11:30
+    assert scheduler.find_perfect_meeting_time(["alice", "bob"], at(0, 9, 30), at(0, 10)) == (
+        True, at(0, 11, 30), at(0, 12))
+    context = scheduler.brain.confirmation_context
+    assert context["active"] and (context["start_datetime"], context["end_datetime"]) == (at(0, 11, 30), at(0, 12))
+    assert scheduler.find_perfect_meeting_time(["alice", "bob"], at(0, 14), at(0, 15)) == (False, at(0, 14), at(0, 15))
+
+
+def test_conflict_check_reads_the_same_calendars_as_the_search():
+    scheduler = make_scheduler()
+    # Bob's meeting is only in his own brain's calendar, not in alice's
+    assert not scheduler._check_time_with_attendees("bob", at(0, 10, 30), at(0, 11))
+    assert scheduler._check_time_with_attendees("bob", at(0, 11, 30), at(0, 12))
+    assert not scheduler._check_time_with_attendees("alice", at(0, 9, 30), at(0, 10))
+
+
+def test_llm_only_breaks_ties_between_free_slots():
+    completions = Completions(choice=1)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    scheduler = make_scheduler(client)
+    scheduler.slot_policy.llm_tiebreak = True
+    assert scheduler.find_perfect_meeting_time(["alice", "bob"], at(0, 9, 30), at(0, 10))[1] == at(1, 9)
+    assert len(completions.prompts) == 1 and "0: Monday 2030-01-07 11:30 - 12:00" in completions.prompts[0]
+
+    completions.choice = 99  # out of range: the earliest slot wins
+    assert scheduler.find_perfect_meeting_time(["alice", "bob"], at(0, 9, 30), at(0, 10))[1] == at(0, 11, 30)
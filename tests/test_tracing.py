@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+from network.internal_communication import Intercom
+from secretary.utilities import tracing
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+    def shutdown(self):
+        pass
+
+
+class TracedNode:
+    def __init__(self, node_id, network, forward_to=None):
+        self.node_id = node_id
+        self.network = network
+        self.forward_to = forward_to
+
+    @tracing.traced("node.receive_message", kind="consumer")
+    def receive_message(self, content, sender_id):
+        if self.forward_to:
+            self.network.send_message(self.node_id, self.forward_to, content)
+
+
+@pytest.fixture
+def exporter():
+    exporter = ListExporter()
+    previous = tracing.set_tracer(tracing.Tracer([exporter]))
+    yield exporter
+    tracing.set_tracer(previous)
+
+
+def test_intercom_hop_nests_under_sender(exporter):
+    net = Intercom()
+    net.register_node("bob", TracedNode("bob", net))
+    net.register_node("alice", TracedNode("alice", net, forward_to="bob"))
+
+    with tracing.span("POST /send_message", kind="server", parent=tracing.extract("00-" + "a" * 32 + "-" + "b" * 16 + "-01")):
+        net.nodes["alice"].receive_message("meet tomorrow", "user")
+
+    by_name = {(s.name, s.attributes.get("node")): s for s in exporter.spans}
+    root = by_name[("POST /send_message", None)]
+    alice = by_name[("node.receive_message", "alice")]
+    hop = by_name[("intercom.send_message", None)]
+    bob = by_name[("node.receive_message", "bob")]
+    assert {s.trace_id for s in exporter.spans} == {"a" * 32}
+    assert root.parent_id == "b" * 16
+    assert alice.parent_id == root.span_id
+    assert hop.parent_id == alice.span_id and hop.attributes["recipient"] == "bob"
+    assert bob.parent_id == hop.span_id
+    assert "node.receive_message  node=bob" in tracing.format_trees([s.to_dict() for s in exporter.spans])
+
+
+def test_disabled_tracer_is_noop():
+    previous = tracing.set_tracer(tracing.Tracer())
+    try:
+        with tracing.span("anything") as span:
+            assert span is tracing.NOOP_SPAN
+            assert tracing.inject() is None
+    finally:
+        tracing.set_tracer(previous)
+
+
+def test_otlp_export_to_collector(tmp_path):
+    out = tmp_path / "collected.jsonl"
+    server = make_server("127.0.0.1", 0, tracing.create_collector_app(str(out)), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    otlp = tracing.OtlpHttpExporter(f"http://127.0.0.1:{server.server_port}/v1/traces", interval=0.05)
+    previous = tracing.set_tracer(tracing.Tracer([otlp]))
+    try:
+        with tracing.span("outer", node="alice"):
+            with pytest.raises(ValueError):
+                with tracing.span("google calendar.events.list", kind="client", tokens=3):
+                    raise ValueError("boom")
+    finally:
+        tracing.set_tracer(previous)
+        otlp.shutdown()
+        server.shutdown()
+
+    spans = tracing.load_spans(str(out))
+    assert {s["name"] for s in spans} == {"outer", "google calendar.events.list"}
+    inner = next(s for s in spans if s["name"] != "outer")
+    assert inner["status"] == "error" and inner["attributes"]["tokens"] == 3
+    assert otlp.dropped == 0
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pytest
+
+from secretary.utilities.openai_client import NodeClient
+from secretary.utilities.usage import UsageLedger, estimate_cost, usage_site
+
+
+def make_client(completions):
+    return type('Client', (), {'chat': type('Chat', (), {'completions': completions})()})()
+
+
+class Completions:
+    def create(self, **kwargs):
+        if kwargs.get("model") == "broken":
+            raise RuntimeError("boom")
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=20)
+        return SimpleNamespace(model=kwargs["model"], usage=usage)
+
+
+def plan_meeting(client):
+    return client.chat.completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}])
+
+
+def test_node_client_records_call_site_and_tokens():
+    ledger = UsageLedger(rollup_interval=3600)
+    view = NodeClient("alice", make_client(Completions()), max_concurrency=2, ledger=ledger)
+
+    plan_meeting(view)
+    plan_meeting(view)
+    with pytest.raises(RuntimeError):
+        view.chat.completions.create(model="broken", messages=[{"role": "user", "content": "x" * 40}])
+
+    summary = ledger.summary(recent=10)
+    site = summary["by_site"]["test_usage.plan_meeting"]
+    assert site["calls"] == 2
+    assert site["prompt_tokens"] == 200 and site["completion_tokens"] == 40
+    assert site["cost_usd"] == pytest.approx(estimate_cost("gpt-4o-mini", 200, 40))
+    assert summary["by_node"]["alice"]["calls"] == 3
+    assert summary["by_node"]["alice"]["errors"] == 1
+    assert summary["recent"][-1]["estimated"] is True
+
+
+def test_usage_site_overrides_stack_and_aggregates_survive_eviction():
+    ledger = UsageLedger(capacity=2, rollup_interval=0)
+    view = NodeClient("bob", make_client(Completions()), max_concurrency=1, ledger=ledger)
+    with usage_site("CVParser.parse_cv"):
+        for _ in range(5):
+            plan_meeting(view)
+
+    summary = ledger.summary(recent=10)
+    assert summary["by_site"]["CVParser.parse_cv"]["calls"] == 5
+    assert summary["totals"]["calls"] == 5
+    assert len(summary["recent"]) == 2
+    assert estimate_cost("gpt-4o-mini-2024-07-18", 1_000_000, 0) == pytest.approx(0.15)